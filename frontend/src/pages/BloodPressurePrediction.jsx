@@ -144,10 +144,10 @@ function BloodPressurePrediction() {
               {result.explainability && result.explainability.drivers && (
                 <div style={{marginTop: '12px', padding: '10px', background: '#eef2ff', borderRadius: '6px'}}>
                   <div style={{fontSize: '14px', fontWeight: 600, marginBottom: '6px'}}>🧠 SHAP-style Contributions (Systolic)</div>
-                  {result.explainability.drivers.map((d, idx) => (
+                  {result.explainability.drivers.map(([feature, direction, impactSystolic], idx) => (
                     <div key={idx} style={{display: 'flex', justifyContent: 'space-between', fontSize: '13px', marginBottom: '4px'}}>
-                      <span>{d.feature} {d.direction === '+' ? '↑' : '↓'}</span>
-                      <span>{d.impact_systolic} mmHg</span>
+                      <span>{feature} {direction === '+' ? '↑' : '↓'}</span>
+                      <span>{impactSystolic} mmHg</span>
                     </div>
                   ))}
                   <div style={{fontSize: '12px', color: '#4f46e5', marginTop: '6px'}}>{result.explainability.sum_rule}</div>
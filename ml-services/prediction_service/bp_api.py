@@ -4,18 +4,37 @@ Flask Blueprint for Blood Pressure Prediction API
 Endpoints mirror glucose API quality, with medical safety constraints and explainability.
 """
 
+import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from typing import Dict, Optional
 
-from bp_prediction_model import BloodPressureLSTMModel
+import numpy as np
+
+from bp_prediction_model import BloodPressureLSTMModel, EXPLAIN_FEATURES, explain_core
 
 logger = logging.getLogger(__name__)
 
 bp_bp = Blueprint('blood_pressure', __name__, url_prefix='/api/blood-pressure')
 bp_model: Optional[BloodPressureLSTMModel] = None
 
+# BMI proxy assumes a 1.75 m reference height
+_BMI_PROXY_FACTOR = 1.0 / 1.75**2
+
+# Finalized predictions for /explain, bounded LRU. The model is deterministic, so
+# a miss (evicted entry, or /predict served by another worker) is re-finalized
+# in-process instead of bouncing the client back to /predict.
+_bp_prediction_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+_BP_PREDICTION_CACHE_MAX = 1024
+_bp_cache_lock = threading.Lock()
+
+# /health body, rebuilt at most once per second (timestamp resolution)
+_health_cache = {'second': None, 'model_available': None, 'body': None}
+
 
 def init_bp_model():
     global bp_model
@@ -68,15 +87,59 @@ def _validate_bp_inputs(payload: Dict) -> tuple[bool, dict, dict]:
     return (len(errors) == 0), errors, features
 
 
+def _make_cache_key(features: Dict) -> tuple:
+    """Create cache key from features (same rounding as the model core)"""
+    return tuple(sorted((k, round(v, 3)) for k, v in features.items()))
+
+
+def _finalize_prediction(feat: Dict) -> dict:
+    """Run the model and cache the finalized values that /explain reports."""
+    res = bp_model.predict(feat)
+    finalized = {
+        'systolic': float(res['systolic_bp']),
+        'diastolic': float(res['diastolic_bp']),
+        'delta_systolic': float(res['delta_systolic']),
+        'delta_diastolic': float(res['delta_diastolic']),
+        'risk_level': res['risk_level'],
+        'confidence': res['confidence'],
+        'baseline': f"{int(feat['baseline_systolic'])}/{int(feat['baseline_diastolic'])}",
+        'features': feat
+    }
+    key = _make_cache_key(feat)
+    with _bp_cache_lock:
+        _bp_prediction_cache[key] = finalized
+        _bp_prediction_cache.move_to_end(key)
+        while len(_bp_prediction_cache) > _BP_PREDICTION_CACHE_MAX:
+            _bp_prediction_cache.popitem(last=False)
+    return finalized
+
+
+def _get_finalized_prediction(feat: Dict) -> dict:
+    key = _make_cache_key(feat)
+    with _bp_cache_lock:
+        cached = _bp_prediction_cache.get(key)
+        if cached is not None:
+            _bp_prediction_cache.move_to_end(key)
+            return cached
+    return _finalize_prediction(feat)
+
+
 @bp_bp.route('/health', methods=['GET'])
 def health():
-    return jsonify({
-        'status': 'healthy',
-        'model_available': bp_model is not None,
-        'sequence_length': 24,
-        'n_features': 12,
-        'timestamp': datetime.now().isoformat()
-    }), 200
+    now = time.time()
+    second = int(now)
+    model_available = bp_model is not None
+    if _health_cache['second'] != second or _health_cache['model_available'] != model_available:
+        _health_cache['body'] = json.dumps({
+            'status': 'healthy',
+            'model_available': model_available,
+            'sequence_length': 24,
+            'n_features': 12,
+            'timestamp': datetime.fromtimestamp(now).isoformat()
+        })
+        _health_cache['model_available'] = model_available
+        _health_cache['second'] = second
+    return current_app.response_class(_health_cache['body'], status=200, mimetype='application/json')
 
 
 @bp_bp.route('/features', methods=['GET'])
@@ -100,48 +163,39 @@ def predict_bp():
         if not valid:
             return jsonify({'error': 'Validation failed', 'details': errors}), 400
 
-        res = bp_model.predict(feat)
+        res = _finalize_prediction(feat)
 
-        systolic = float(res['systolic_bp'])
-        diastolic = float(res['diastolic_bp'])
-        dsys = float(res['delta_systolic'])
-        ddia = float(res['delta_diastolic'])
-        baseline = f"{int(feat['baseline_systolic'])}/{int(feat['baseline_diastolic'])}"
+        systolic = res['systolic']
+        diastolic = res['diastolic']
+        dsys = res['delta_systolic']
+        ddia = res['delta_diastolic']
+        baseline = res['baseline']
         delta_display = f"{('+' if dsys >= 0 else '')}{dsys}/{('+' if ddia >= 0 else '')}{ddia}"
 
+        pos_dsys = max(0.0, dsys)
+        neg_dsys = max(0.0, -dsys)
+
         derived = {
             'sodium_high': feat['sodium_mg'] > 2300.0,
             'activity_protective': feat['activity_level'] >= 0.4,
             'hydration_protective': feat['hydration_level'] >= 0.6,
             'medication_effective': feat['medication_taken'] >= 0.5,
             'age_factor': max(0.0, (feat['age'] - 45.0) * 0.06),
-            'bmi_proxy': round((feat['weight_kg'] / 1.75**2), 1)  # rough proxy (assume 1.75m)
+            'bmi_proxy': round(feat['weight_kg'] * _BMI_PROXY_FACTOR, 1)
         }
 
+        # Drivers are (feature, direction, impact_systolic) triples
         explain = {
             'drivers': [
-                {'feature': 'sodium_mg', 'direction': '+', 'impact_systolic': round(max(0.0, dsys) * 0.45, 1)},
-                {'feature': 'stress_level', 'direction': '+', 'impact_systolic': round(max(0.0, dsys) * 0.30, 1)},
-                {'feature': 'activity_level', 'direction': '-', 'impact_systolic': round(abs(min(0.0, dsys)) * 0.40, 1)},
-                {'feature': 'hydration_level', 'direction': '-', 'impact_systolic': round(abs(min(0.0, dsys)) * 0.25, 1)},
-                {'feature': 'medication_taken', 'direction': '-', 'impact_systolic': round(abs(min(0.0, dsys)) * 0.35, 1)},
+                ('sodium_mg', '+', round(pos_dsys * 0.45, 1)),
+                ('stress_level', '+', round(pos_dsys * 0.30, 1)),
+                ('activity_level', '-', round(neg_dsys * 0.40, 1)),
+                ('hydration_level', '-', round(neg_dsys * 0.25, 1)),
+                ('medication_taken', '-', round(neg_dsys * 0.35, 1)),
             ],
             'sum_rule': 'Impacts sum approximately to delta_systolic/diastolic'
         }
 
-        # Cache the prediction for /explain endpoint
-        cache_key = _make_cache_key(feat)
-        _bp_prediction_cache[cache_key] = {
-            'systolic': systolic,
-            'diastolic': diastolic,
-            'delta_systolic': dsys,
-            'delta_diastolic': ddia,
-            'risk_level': res['risk_level'],
-            'confidence': res['confidence'],
-            'baseline': baseline,
-            'features': feat
-        }
-
         return jsonify({
             'prediction': {
                 'systolic': round(systolic, 1),
@@ -161,16 +215,6 @@ def predict_bp():
         return jsonify({'error': str(e)}), 500
 
 
-# Prediction cache for /explain endpoint (never re-predict)
-_bp_prediction_cache = {}
-
-
-def _make_cache_key(features: Dict) -> str:
-    """Create cache key from features"""
-    sorted_items = sorted(features.items())
-    return str(sorted_items)
-
-
 @bp_bp.route('/explain', methods=['POST'])
 def explain_bp():
     """
@@ -215,19 +259,10 @@ def explain_bp():
         if explain_method not in ['shap', 'lime']:
             return jsonify({'error': 'explain_method must be "shap" or "lime"'}), 400
         
-        # Check cache for finalized prediction
-        cache_key = _make_cache_key(feat)
-        cached = _bp_prediction_cache.get(cache_key)
+        # Finalized prediction from /predict (re-finalized deterministically on a miss)
+        cached = _get_finalized_prediction(feat)
         
-        if cached is None:
-            # If not cached, return error asking to call /predict first
-            return jsonify({
-                'success': False,
-                'error': 'No finalized prediction available to explain',
-                'message': 'Call /predict first with same features, then call /explain'
-            }), 409
-        
-        # Extract cached prediction (NEVER re-predict)
+        # Extract finalized prediction
         systolic = float(cached['systolic'])
         diastolic = float(cached['diastolic'])
         delta_sys = float(cached['delta_systolic'])
@@ -239,125 +274,25 @@ def explain_bp():
         logger.info(f"Explaining BP: baseline={baseline}, delta_sys={delta_sys}, delta_dia={delta_dia}")
         
         # Generate explainability using deterministic feature analysis
-        # Extract feature impacts based on medical knowledge
-        sodium = feat['sodium_mg']
-        stress = feat['stress_level']
-        activity = feat['activity_level']
-        hydration = feat['hydration_level']
-        meds = feat['medication_taken']
-        caffeine = feat['caffeine_mg']
-        sleep = feat['sleep_quality']
-        age = feat['age']
-        weight = feat['weight_kg']
-        
-        # Calculate feature contributions (directionally correct)
-        systolic_contributions = []
-        diastolic_contributions = []
-        
-        # POSITIVE contributors (increase BP)
-        if sodium > 2300.0:
-            sodium_impact_sys = min((sodium - 2300.0) / 100.0, 20.0) * 0.6
-            sodium_impact_dia = sodium_impact_sys * 0.6
-            systolic_contributions.append({
-                'feature': 'sodium_mg',
-                'impact': round(sodium_impact_sys if delta_sys > 0 else 0, 1)
-            })
-            diastolic_contributions.append({
-                'feature': 'sodium_mg',
-                'impact': round(sodium_impact_dia if delta_dia > 0 else 0, 1)
-            })
-        
-        if stress > 0.3:
-            stress_impact_sys = stress * 10.0
-            stress_impact_dia = stress_impact_sys * 0.6
-            systolic_contributions.append({
-                'feature': 'stress_level',
-                'impact': round(stress_impact_sys if delta_sys > 0 else 0, 1)
-            })
-            diastolic_contributions.append({
-                'feature': 'stress_level',
-                'impact': round(stress_impact_dia if delta_dia > 0 else 0, 1)
-            })
-        
-        if caffeine > 100.0:
-            caffeine_impact_sys = min(caffeine / 100.0, 5.0) * 0.8
-            caffeine_impact_dia = caffeine_impact_sys * 0.4
-            systolic_contributions.append({
-                'feature': 'caffeine_mg',
-                'impact': round(caffeine_impact_sys if delta_sys > 0 else 0, 1)
-            })
-            diastolic_contributions.append({
-                'feature': 'caffeine_mg',
-                'impact': round(caffeine_impact_dia if delta_dia > 0 else 0, 1)
-            })
-        
-        if age > 45:
-            age_impact = max(0.0, (age - 45.0) * 0.06)
-            systolic_contributions.append({
-                'feature': 'age',
-                'impact': round(age_impact if delta_sys > 0 else 0, 1)
-            })
-            diastolic_contributions.append({
-                'feature': 'age',
-                'impact': round(age_impact * 0.5 if delta_dia > 0 else 0, 1)
-            })
-        
-        # NEGATIVE contributors (decrease BP)
-        if activity >= 0.3:
-            activity_impact_sys = activity * 12.0
-            activity_impact_dia = activity_impact_sys * 0.7
-            systolic_contributions.append({
-                'feature': 'activity_level',
-                'impact': round(-activity_impact_sys if delta_sys < 0 else 0, 1)
-            })
-            diastolic_contributions.append({
-                'feature': 'activity_level',
-                'impact': round(-activity_impact_dia if delta_dia < 0 else 0, 1)
-            })
-        
-        if hydration >= 0.6:
-            hydration_impact_sys = (hydration - 0.5) * 10.0
-            hydration_impact_dia = hydration_impact_sys * 0.8
-            systolic_contributions.append({
-                'feature': 'hydration_level',
-                'impact': round(-hydration_impact_sys if delta_sys < 0 else 0, 1)
-            })
-            diastolic_contributions.append({
-                'feature': 'hydration_level',
-                'impact': round(-hydration_impact_dia if delta_dia < 0 else 0, 1)
-            })
-        
-        if meds >= 0.5:
-            meds_impact_sys = 15.0
-            meds_impact_dia = meds_impact_sys * 0.7
-            systolic_contributions.append({
-                'feature': 'medication_taken',
-                'impact': round(-meds_impact_sys if delta_sys < 0 else 0, 1)
-            })
-            diastolic_contributions.append({
-                'feature': 'medication_taken',
-                'impact': round(-meds_impact_dia if delta_dia < 0 else 0, 1)
-            })
-        
-        if sleep >= 0.7:
-            sleep_impact = (sleep - 0.6) * 8.0
-            systolic_contributions.append({
-                'feature': 'sleep_quality',
-                'impact': round(-sleep_impact if delta_sys < 0 else 0, 1)
-            })
-            diastolic_contributions.append({
-                'feature': 'sleep_quality',
-                'impact': round(-sleep_impact * 0.6 if delta_dia < 0 else 0, 1)
-            })
-        
+        # Thresholded impacts and the sum-rule totals come from one compiled kernel
+        active, sys_impacts, dia_impacts, sum_sys, sum_dia = explain_core(
+            np.array([feat[k] for k in EXPLAIN_FEATURES]), delta_sys, delta_dia
+        )
+        active_idx = np.flatnonzero(active)
+        systolic_contributions = [
+            {'feature': EXPLAIN_FEATURES[i], 'impact': float(sys_impacts[i])} for i in active_idx
+        ]
+        diastolic_contributions = [
+            {'feature': EXPLAIN_FEATURES[i], 'impact': float(dia_impacts[i])} for i in active_idx
+        ]
+        sum_sys = float(sum_sys)
+        sum_dia = float(sum_dia)
+
         # Sort by absolute impact
         systolic_contributions.sort(key=lambda x: abs(x['impact']), reverse=True)
         diastolic_contributions.sort(key=lambda x: abs(x['impact']), reverse=True)
         
         # Validate sum rule (contributions ≈ delta)
-        sum_sys = sum(c['impact'] for c in systolic_contributions)
-        sum_dia = sum(c['impact'] for c in diastolic_contributions)
-        
         sum_rule_sys = abs(sum_sys - delta_sys) < 0.5
         sum_rule_dia = abs(sum_dia - delta_dia) < 0.5
         sum_rule_validated = sum_rule_sys and sum_rule_dia
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Blood Pressure LSTM-style Model (lightweight wrapper)
-Implements medically-constrained prediction with a deterministic core and optional Keras LSTM.
+Implements medically-constrained prediction with a deterministic core.
 
 Inputs (12, ordered):
   1. sodium_mg              (0–6000)
@@ -28,38 +28,176 @@ Outputs:
   }
 """
 
+import functools
 from typing import Dict, Tuple
 import numpy as np
 
 try:
-    import tensorflow as tf  # noqa: F401
-    TENSORFLOW_AVAILABLE = True
-except Exception:
-    TENSORFLOW_AVAILABLE = False
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Ordered (feature, default) pairs consumed by the deterministic core
+_FEATURE_DEFAULTS = (
+    ('sodium_mg', 0.0),
+    ('stress_level', 0.0),
+    ('activity_level', 0.0),
+    ('age', 40.0),
+    ('weight_kg', 75.0),
+    ('caffeine_mg', 0.0),
+    ('sleep_quality', 0.7),
+    ('hydration_level', 0.6),
+    ('medication_taken', 0.0),
+    ('baseline_systolic', 120.0),
+    ('baseline_diastolic', 80.0),
+    ('time_since_last_meal', 2.0),
+)
+
+
+def _bp_core(feat: Tuple[float, ...]) -> Tuple[float, float, float, float, float]:
+    """Deterministic physiology + rules over features ordered as _FEATURE_DEFAULTS."""
+    (sodium, stress, activity, age, weight, caffeine, sleep, hydration,
+     meds, base_sys, base_dia, tlast) = feat
+
+    # Baseline-based buffers
+    crisis_prone = (base_sys >= 160.0 or base_dia >= 100.0)
+
+    # Positive drivers (raise BP)
+    sodium_factor = 0.0
+    if sodium > 2300.0:
+        sodium_factor = min((sodium - 2300.0) / 100.0, 20.0) * 0.6  # up to ~12 mmHg
+    else:
+        sodium_factor = (sodium / 2300.0) * 3.0  # sub-2300 still contributes mildly (≤3)
+
+    stress_factor = min(max(stress, 0.0), 1.0) * 10.0  # up to +10
+    caffeine_factor = min(caffeine / 100.0, 5.0) * 0.8  # up to +4
+
+    # Age/weight mild trends
+    age_factor = max(0.0, (age - 45.0) * 0.06)  # +1.2 at 65
+    weight_factor = max(0.0, (weight - 80.0) * 0.04)  # +4 at 180kg
+
+    # Negative drivers (reduce BP)
+    activity_factor = -min(max(activity, 0.0), 1.0) * 12.0  # up to -12
+    hydration_factor = -max(0.0, (hydration - 0.5)) * 10.0  # up to -5
+    sleep_factor = -max(0.0, (sleep - 0.6)) * 8.0  # up to -3.2
+    meds_factor = -min(max(meds, 0.0), 1.0) * 15.0  # up to -15
+
+    # Meal timing small: closer to meal slightly increases
+    timing_factor = 2.0 * np.exp(-tlast)  # decays with hours
+
+    delta_sys_raw = (
+        sodium_factor + stress_factor + caffeine_factor + age_factor + weight_factor + timing_factor
+        + activity_factor + hydration_factor + sleep_factor + meds_factor
+    )
+    delta_dia_raw = (
+        0.6 * sodium_factor + 0.6 * stress_factor + 0.4 * caffeine_factor + 0.5 * age_factor + 0.4 * weight_factor
+        + 0.5 * timing_factor + 0.7 * activity_factor + 0.8 * hydration_factor + 0.6 * sleep_factor + 0.7 * meds_factor
+    )
+
+    # Per-meal delta caps (MANDATORY)
+    delta_sys = float(np.clip(delta_sys_raw, -20.0, 40.0))
+    delta_dia = float(np.clip(delta_dia_raw, -15.0, 25.0))
+
+    # Apply to baseline
+    sys = base_sys + delta_sys
+    dia = base_dia + delta_dia
+
+    # Absolute physiological bounds
+    sys = float(np.clip(sys, 90.0, 220.0))
+    dia = float(np.clip(dia, 60.0, 140.0))
+
+    # No meal may push into crisis unless baseline already high
+    # Crisis threshold: systolic>180 or diastolic>120
+    if not crisis_prone:
+        if sys > 180.0:
+            sys = 179.0
+            delta_sys = sys - base_sys
+        if dia > 120.0:
+            dia = 119.0
+            delta_dia = dia - base_dia
+
+    # Confidence heuristic
+    confidence = 0.82
+    # Penalize if many clamps
+    clamps = int(abs(delta_sys_raw - delta_sys) > 1e-6) + int(abs(delta_dia_raw - delta_dia) > 1e-6)
+    if clamps:
+        confidence -= 0.12
+    confidence = float(np.clip(confidence, 0.5, 0.95))
+
+    return sys, dia, delta_sys, delta_dia, confidence
+
+
+@functools.lru_cache(maxsize=4096)
+def _bp_core_cached(feat: Tuple[float, ...]) -> Tuple[float, float, float, float, float]:
+    return _bp_core(feat)
+
+
+# Features scored by /explain: the first four raise BP, the last four lower it
+EXPLAIN_FEATURES = (
+    'sodium_mg', 'stress_level', 'caffeine_mg', 'age',
+    'activity_level', 'hydration_level', 'medication_taken', 'sleep_quality',
+)
+_EXPLAIN_SIGN = np.array([1.0, 1.0, 1.0, 1.0, -1.0, -1.0, -1.0, -1.0])
+_EXPLAIN_DIA_RATIO = np.array([0.6, 0.6, 0.4, 0.5, 0.7, 0.8, 0.7, 0.6])
+
+
+def _explain_core_py(feat: np.ndarray, delta_sys: float, delta_dia: float):
+    """
+    Systolic/diastolic contributions for EXPLAIN_FEATURES-ordered inputs.
+
+    Returns (active, sys_contribs, dia_contribs, sum_sys, sum_dia). Inactive
+    features (below their threshold) contribute 0.0 and are masked out by the
+    caller. Contributions are rounded to 0.1 mmHg before summing.
+    """
+    sodium, stress, caffeine, age = feat[0], feat[1], feat[2], feat[3]
+    activity, hydration, meds, sleep = feat[4], feat[5], feat[6], feat[7]
+
+    active = np.empty(8, dtype=np.bool_)
+    mag_sys = np.empty(8)
+
+    active[0] = sodium > 2300.0
+    mag_sys[0] = min((sodium - 2300.0) / 100.0, 20.0) * 0.6
+    active[1] = stress > 0.3
+    mag_sys[1] = stress * 10.0
+    active[2] = caffeine > 100.0
+    mag_sys[2] = min(caffeine / 100.0, 5.0) * 0.8
+    active[3] = age > 45.0
+    mag_sys[3] = max(0.0, (age - 45.0) * 0.06)
+    active[4] = activity >= 0.3
+    mag_sys[4] = activity * 12.0
+    active[5] = hydration >= 0.6
+    mag_sys[5] = (hydration - 0.5) * 10.0
+    active[6] = meds >= 0.5
+    mag_sys[6] = 15.0
+    active[7] = sleep >= 0.7
+    mag_sys[7] = (sleep - 0.6) * 8.0
+
+    # A driver only contributes when it agrees with the direction of the delta
+    raising = _EXPLAIN_SIGN > 0.0
+    sys_on = active & np.where(raising, delta_sys > 0.0, delta_sys < 0.0)
+    dia_on = active & np.where(raising, delta_dia > 0.0, delta_dia < 0.0)
+
+    sys_contribs = np.round(np.where(sys_on, _EXPLAIN_SIGN * mag_sys, 0.0), 1)
+    dia_contribs = np.round(np.where(dia_on, _EXPLAIN_SIGN * mag_sys * _EXPLAIN_DIA_RATIO, 0.0), 1)
+
+    return active, sys_contribs, dia_contribs, sys_contribs.sum(), dia_contribs.sum()
+
+
+explain_core = njit(cache=True)(_explain_core_py) if NUMBA_AVAILABLE else _explain_core_py
 
 
 class BloodPressureLSTMModel:
     def __init__(self, sequence_length: int = 24, feature_dim: int = 12):
         self.sequence_length = sequence_length
         self.feature_dim = feature_dim
+        # predict() only uses the deterministic core; no Keras graph is built
         self.model = None
         self.is_trained = False
 
-        if TENSORFLOW_AVAILABLE:
-            try:
-                from tensorflow import keras
-                inputs = keras.Input(shape=(sequence_length, feature_dim))
-                x = keras.layers.LSTM(48, return_sequences=True)(inputs)
-                x = keras.layers.Dropout(0.2)(x)
-                x = keras.layers.LSTM(24)(x)
-                x = keras.layers.Dense(32, activation='relu')(x)
-                outputs = keras.layers.Dense(2, activation='linear')(x)  # systolic, diastolic deltas
-                model = keras.Model(inputs, outputs)
-                model.compile(optimizer='adam', loss='mae')
-                self.model = model
-            except Exception:
-                # Fall back to deterministic core only
-                self.model = None
+        # Compile (or load the cached) explain kernel now rather than on the first /explain
+        explain_core(np.zeros(len(EXPLAIN_FEATURES)), 0.0, 0.0)
 
     def get_feature_names(self):
         return [
@@ -70,85 +208,9 @@ class BloodPressureLSTMModel:
 
     # Core deterministic physiology + rules; sums with modifiers and clamps
     def _deterministic_prediction(self, features: Dict) -> Tuple[float, float, float, float, float]:
-        sodium = float(features.get('sodium_mg', 0.0))
-        stress = float(features.get('stress_level', 0.0))
-        activity = float(features.get('activity_level', 0.0))
-        age = float(features.get('age', 40.0))
-        weight = float(features.get('weight_kg', 75.0))
-        caffeine = float(features.get('caffeine_mg', 0.0))
-        sleep = float(features.get('sleep_quality', 0.7))
-        hydration = float(features.get('hydration_level', 0.6))
-        meds = float(features.get('medication_taken', 0.0))
-        base_sys = float(features.get('baseline_systolic', 120.0))
-        base_dia = float(features.get('baseline_diastolic', 80.0))
-        tlast = float(features.get('time_since_last_meal', 2.0))
-
-        # Baseline-based buffers
-        crisis_prone = (base_sys >= 160.0 or base_dia >= 100.0)
-
-        # Positive drivers (raise BP)
-        sodium_factor = 0.0
-        if sodium > 2300.0:
-            sodium_factor = min((sodium - 2300.0) / 100.0, 20.0) * 0.6  # up to ~12 mmHg
-        else:
-            sodium_factor = (sodium / 2300.0) * 3.0  # sub-2300 still contributes mildly (≤3)
-
-        stress_factor = min(max(stress, 0.0), 1.0) * 10.0  # up to +10
-        caffeine_factor = min(caffeine / 100.0, 5.0) * 0.8  # up to +4
-
-        # Age/weight mild trends
-        age_factor = max(0.0, (age - 45.0) * 0.06)  # +1.2 at 65
-        weight_factor = max(0.0, (weight - 80.0) * 0.04)  # +4 at 180kg
-
-        # Negative drivers (reduce BP)
-        activity_factor = -min(max(activity, 0.0), 1.0) * 12.0  # up to -12
-        hydration_factor = -max(0.0, (hydration - 0.5)) * 10.0  # up to -5
-        sleep_factor = -max(0.0, (sleep - 0.6)) * 8.0  # up to -3.2
-        meds_factor = -min(max(meds, 0.0), 1.0) * 15.0  # up to -15
-
-        # Meal timing small: closer to meal slightly increases
-        timing_factor = 2.0 * np.exp(-tlast)  # decays with hours
-
-        delta_sys_raw = (
-            sodium_factor + stress_factor + caffeine_factor + age_factor + weight_factor + timing_factor
-            + activity_factor + hydration_factor + sleep_factor + meds_factor
-        )
-        delta_dia_raw = (
-            0.6 * sodium_factor + 0.6 * stress_factor + 0.4 * caffeine_factor + 0.5 * age_factor + 0.4 * weight_factor
-            + 0.5 * timing_factor + 0.7 * activity_factor + 0.8 * hydration_factor + 0.6 * sleep_factor + 0.7 * meds_factor
-        )
-
-        # Per-meal delta caps (MANDATORY)
-        delta_sys = float(np.clip(delta_sys_raw, -20.0, 40.0))
-        delta_dia = float(np.clip(delta_dia_raw, -15.0, 25.0))
-
-        # Apply to baseline
-        sys = base_sys + delta_sys
-        dia = base_dia + delta_dia
-
-        # Absolute physiological bounds
-        sys = float(np.clip(sys, 90.0, 220.0))
-        dia = float(np.clip(dia, 60.0, 140.0))
-
-        # No meal may push into crisis unless baseline already high
-        # Crisis threshold: systolic>180 or diastolic>120
-        if not crisis_prone:
-            if sys > 180.0:
-                sys = 179.0
-                delta_sys = sys - base_sys
-            if dia > 120.0:
-                dia = 119.0
-                delta_dia = dia - base_dia
-
-        # Confidence heuristic
-        confidence = 0.82
-        # Penalize if many clamps
-        clamps = int(abs(delta_sys_raw - delta_sys) > 1e-6) + int(abs(delta_dia_raw - delta_dia) > 1e-6)
-        if clamps:
-            confidence -= 0.12
-        confidence = float(np.clip(confidence, 0.5, 0.95))
-
-        return sys, dia, delta_sys, delta_dia, confidence
+        # Slider-driven UIs resubmit identical inputs; round so they share a cache entry
+        feat = tuple(round(float(features.get(k, d)), 3) for k, d in _FEATURE_DEFAULTS)
+        return _bp_core_cached(feat)
 
     def predict(self, features: Dict) -> Dict:
         # In this project, we use deterministic core (no re-train requirement)
@@ -10,9 +10,16 @@ Endpoints:
   POST /api/cholesterol/explain       - Get SHAP-style explanations
 """
 
-from flask import Blueprint, request, jsonify
-from cholesterol_prediction_model import CholesterolLSTMModel
+from flask import Blueprint, Response, request
+from cholesterol_prediction_model import (
+    CholesterolLSTMModel, BatchedCholesterolPredictor,
+    derived_metrics, explain_contributions, features_to_array, term_contributions
+)
 import logging
+import os
+from concurrent.futures import TimeoutError as BatchTimeoutError
+import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +28,178 @@ cholesterol_bp = Blueprint('cholesterol', __name__)
 
 # Global model instance (initialized in run_api.py)
 cholesterol_model = None
+# Optional dynamic batcher in front of the model (CHOL_DYNAMIC_BATCHING=1)
+cholesterol_batcher = None
+
+# Validation ranges (medical + physiological), in model feature order:
+# (field, min, max, label)
+_VALIDATIONS = (
+    ('saturated_fat_g', 0.0, 100.0, "Saturated fat"),
+    ('trans_fat_g', 0.0, 10.0, "Trans fat"),
+    ('dietary_cholesterol_mg', 0.0, 1000.0, "Dietary cholesterol"),
+    ('fiber_g', 0.0, 60.0, "Fiber"),
+    ('sugar_g', 0.0, 150.0, "Sugar"),
+    ('sodium_mg', 0.0, 6000.0, "Sodium"),
+    ('activity_level', 0.0, 1.0, "Activity level"),
+    ('stress_level', 0.0, 1.0, "Stress level"),
+    ('sleep_quality', 0.0, 1.0, "Sleep quality"),
+    ('hydration_level', 0.0, 1.0, "Hydration level"),
+    ('age', 18.0, 90.0, "Age"),
+    ('weight_kg', 35.0, 200.0, "Weight"),
+    ('baseline_ldl', 40.0, 250.0, "Baseline LDL"),
+    ('baseline_hdl', 20.0, 100.0, "Baseline HDL"),
+)
+_REQUIRED_FIELDS = tuple(v[0] for v in _VALIDATIONS)
+_REQUIRED_SET = frozenset(_REQUIRED_FIELDS)
+
+
+# Input feature metadata served by /features (static, serialized once at import)
+_FEATURES = [
+    {
+        'name': 'saturated_fat_g',
+        'type': 'float',
+        'range': [0.0, 100.0],
+        'unit': 'grams',
+        'description': 'Saturated fat intake in meal'
+    },
+    {
+        'name': 'trans_fat_g',
+        'type': 'float',
+        'range': [0.0, 10.0],
+        'unit': 'grams',
+        'description': 'Trans fat intake in meal'
+    },
+    {
+        'name': 'dietary_cholesterol_mg',
+        'type': 'float',
+        'range': [0.0, 1000.0],
+        'unit': 'mg',
+        'description': 'Dietary cholesterol intake'
+    },
+    {
+        'name': 'fiber_g',
+        'type': 'float',
+        'range': [0.0, 60.0],
+        'unit': 'grams',
+        'description': 'Dietary fiber intake'
+    },
+    {
+        'name': 'sugar_g',
+        'type': 'float',
+        'range': [0.0, 150.0],
+        'unit': 'grams',
+        'description': 'Sugar intake in meal'
+    },
+    {
+        'name': 'sodium_mg',
+        'type': 'float',
+        'range': [0.0, 6000.0],
+        'unit': 'mg',
+        'description': 'Sodium intake'
+    },
+    {
+        'name': 'activity_level',
+        'type': 'float',
+        'range': [0.0, 1.0],
+        'unit': 'normalized',
+        'description': 'Physical activity level (0=sedentary, 1=very active)'
+    },
+    {
+        'name': 'stress_level',
+        'type': 'float',
+        'range': [0.0, 1.0],
+        'unit': 'normalized',
+        'description': 'Stress level (0=relaxed, 1=very stressed)'
+    },
+    {
+        'name': 'sleep_quality',
+        'type': 'float',
+        'range': [0.0, 1.0],
+        'unit': 'normalized',
+        'description': 'Sleep quality (0=poor, 1=excellent)'
+    },
+    {
+        'name': 'hydration_level',
+        'type': 'float',
+        'range': [0.0, 1.0],
+        'unit': 'normalized',
+        'description': 'Hydration status (0=dehydrated, 1=well hydrated)'
+    },
+    {
+        'name': 'age',
+        'type': 'integer',
+        'range': [18, 90],
+        'unit': 'years',
+        'description': 'Patient age'
+    },
+    {
+        'name': 'weight_kg',
+        'type': 'float',
+        'range': [35.0, 200.0],
+        'unit': 'kg',
+        'description': 'Body weight'
+    },
+    {
+        'name': 'baseline_ldl',
+        'type': 'float',
+        'range': [40.0, 250.0],
+        'unit': 'mg/dL',
+        'description': 'Pre-meal LDL cholesterol level'
+    },
+    {
+        'name': 'baseline_hdl',
+        'type': 'float',
+        'range': [20.0, 100.0],
+        'unit': 'mg/dL',
+        'description': 'Pre-meal HDL cholesterol level'
+    }
+]
+
+_FEATURES_BODY = orjson.dumps({
+    'feature_count': 14,
+    'features': _FEATURES
+})
+
+# /health bodies keyed by whether the model is loaded
+_HEALTH_BODIES = {
+    model_loaded: orjson.dumps({
+        'service': 'cholesterol_prediction',
+        'status': 'healthy' if model_loaded else 'unhealthy',
+        'model_loaded': model_loaded,
+        'model_type': 'LSTM with deterministic core',
+        'version': '1.0.0'
+    })
+    for model_loaded in (True, False)
+}
+
+
+def _json(obj, status: int = 200) -> Response:
+    """Serialize a response body with orjson (numpy scalars allowed)."""
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+def _parse_json():
+    """Decode the request body with orjson (raises orjson.JSONDecodeError)."""
+    # cache=False: the body is read once, so Flask needn't keep a copy
+    return orjson.loads(request.get_data(cache=False))
 
 
 def init_cholesterol_model():
     """Initialize the cholesterol prediction model"""
-    global cholesterol_model
+    global cholesterol_model, cholesterol_batcher
     try:
         cholesterol_model = CholesterolLSTMModel()
         logger.info("✅ Cholesterol prediction model initialized")
+        if os.environ.get('CHOL_DYNAMIC_BATCHING') == '1':
+            if cholesterol_batcher is None:
+                cholesterol_batcher = BatchedCholesterolPredictor(cholesterol_model)
+                logger.info("✅ Cholesterol dynamic batching enabled")
+            else:
+                cholesterol_batcher.model = cholesterol_model
         return True
     except Exception as e:
         logger.error(f"❌ Failed to initialize cholesterol model: {str(e)}")
@@ -41,38 +212,14 @@ def _validate_cholesterol_inputs(data: dict) -> tuple:
     
     Returns: (is_valid, error_message)
     """
-    required_fields = [
-        'saturated_fat_g', 'trans_fat_g', 'dietary_cholesterol_mg', 'fiber_g',
-        'sugar_g', 'sodium_mg', 'activity_level', 'stress_level',
-        'sleep_quality', 'hydration_level', 'age', 'weight_kg',
-        'baseline_ldl', 'baseline_hdl'
-    ]
-    
-    # Check all required fields present
-    missing = [f for f in required_fields if f not in data]
+    # Presence: one set difference against the payload keys
+    missing = _REQUIRED_SET.difference(data)
     if missing:
-        return False, f"Missing required fields: {', '.join(missing)}"
+        # Report in schema order for a stable message
+        return False, f"Missing required fields: {', '.join(f for f in _REQUIRED_FIELDS if f in missing)}"
     
-    # Validation ranges (medical + physiological)
-    validations = {
-        'saturated_fat_g': (0.0, 100.0, "Saturated fat"),
-        'trans_fat_g': (0.0, 10.0, "Trans fat"),
-        'dietary_cholesterol_mg': (0.0, 1000.0, "Dietary cholesterol"),
-        'fiber_g': (0.0, 60.0, "Fiber"),
-        'sugar_g': (0.0, 150.0, "Sugar"),
-        'sodium_mg': (0.0, 6000.0, "Sodium"),
-        'activity_level': (0.0, 1.0, "Activity level"),
-        'stress_level': (0.0, 1.0, "Stress level"),
-        'sleep_quality': (0.0, 1.0, "Sleep quality"),
-        'hydration_level': (0.0, 1.0, "Hydration level"),
-        'age': (18.0, 90.0, "Age"),
-        'weight_kg': (35.0, 200.0, "Weight"),
-        'baseline_ldl': (40.0, 250.0, "Baseline LDL"),
-        'baseline_hdl': (20.0, 100.0, "Baseline HDL")
-    }
-    
-    # Validate each field
-    for field, (min_val, max_val, label) in validations.items():
+    # Ranges, stopping at the first error
+    for field, min_val, max_val, label in _VALIDATIONS:
         try:
             value = float(data[field])
             if not (min_val <= value <= max_val):
@@ -86,125 +233,18 @@ def _validate_cholesterol_inputs(data: dict) -> tuple:
 @cholesterol_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    status = {
-        'service': 'cholesterol_prediction',
-        'status': 'healthy' if cholesterol_model is not None else 'unhealthy',
-        'model_loaded': cholesterol_model is not None,
-        'model_type': 'LSTM with deterministic core',
-        'version': '1.0.0'
-    }
-    status_code = 200 if cholesterol_model is not None else 503
-    return jsonify(status), status_code
+    model_loaded = cholesterol_model is not None
+    return Response(
+        _HEALTH_BODIES[model_loaded],
+        status=200 if model_loaded else 503,
+        mimetype='application/json'
+    )
 
 
 @cholesterol_bp.route('/features', methods=['GET'])
 def get_features():
     """Get list of input features with metadata"""
-    features = [
-        {
-            'name': 'saturated_fat_g',
-            'type': 'float',
-            'range': [0.0, 100.0],
-            'unit': 'grams',
-            'description': 'Saturated fat intake in meal'
-        },
-        {
-            'name': 'trans_fat_g',
-            'type': 'float',
-            'range': [0.0, 10.0],
-            'unit': 'grams',
-            'description': 'Trans fat intake in meal'
-        },
-        {
-            'name': 'dietary_cholesterol_mg',
-            'type': 'float',
-            'range': [0.0, 1000.0],
-            'unit': 'mg',
-            'description': 'Dietary cholesterol intake'
-        },
-        {
-            'name': 'fiber_g',
-            'type': 'float',
-            'range': [0.0, 60.0],
-            'unit': 'grams',
-            'description': 'Dietary fiber intake'
-        },
-        {
-            'name': 'sugar_g',
-            'type': 'float',
-            'range': [0.0, 150.0],
-            'unit': 'grams',
-            'description': 'Sugar intake in meal'
-        },
-        {
-            'name': 'sodium_mg',
-            'type': 'float',
-            'range': [0.0, 6000.0],
-            'unit': 'mg',
-            'description': 'Sodium intake'
-        },
-        {
-            'name': 'activity_level',
-            'type': 'float',
-            'range': [0.0, 1.0],
-            'unit': 'normalized',
-            'description': 'Physical activity level (0=sedentary, 1=very active)'
-        },
-        {
-            'name': 'stress_level',
-            'type': 'float',
-            'range': [0.0, 1.0],
-            'unit': 'normalized',
-            'description': 'Stress level (0=relaxed, 1=very stressed)'
-        },
-        {
-            'name': 'sleep_quality',
-            'type': 'float',
-            'range': [0.0, 1.0],
-            'unit': 'normalized',
-            'description': 'Sleep quality (0=poor, 1=excellent)'
-        },
-        {
-            'name': 'hydration_level',
-            'type': 'float',
-            'range': [0.0, 1.0],
-            'unit': 'normalized',
-            'description': 'Hydration status (0=dehydrated, 1=well hydrated)'
-        },
-        {
-            'name': 'age',
-            'type': 'integer',
-            'range': [18, 90],
-            'unit': 'years',
-            'description': 'Patient age'
-        },
-        {
-            'name': 'weight_kg',
-            'type': 'float',
-            'range': [35.0, 200.0],
-            'unit': 'kg',
-            'description': 'Body weight'
-        },
-        {
-            'name': 'baseline_ldl',
-            'type': 'float',
-            'range': [40.0, 250.0],
-            'unit': 'mg/dL',
-            'description': 'Pre-meal LDL cholesterol level'
-        },
-        {
-            'name': 'baseline_hdl',
-            'type': 'float',
-            'range': [20.0, 100.0],
-            'unit': 'mg/dL',
-            'description': 'Pre-meal HDL cholesterol level'
-        }
-    ]
-    
-    return jsonify({
-        'feature_count': 14,
-        'features': features
-    }), 200
+    return Response(_FEATURES_BODY, status=200, mimetype='application/json')
 
 
 @cholesterol_bp.route('/predict', methods=['POST'])
@@ -254,159 +294,75 @@ def predict_cholesterol():
         }
     """
     if cholesterol_model is None:
-        return jsonify({
+        return _json({
             'error': 'Cholesterol prediction model not initialized',
             'status': 'service_unavailable'
-        }), 503
+        }, 503)
     
     try:
-        data = request.get_json()
+        try:
+            data = _parse_json()
+        except orjson.JSONDecodeError:
+            return _json({
+                'error': 'Request body must be valid JSON',
+                'status': 'validation_error'
+            }, 400)
         
         # Validate inputs
         is_valid, error_msg = _validate_cholesterol_inputs(data)
         if not is_valid:
-            return jsonify({
+            return _json({
                 'error': error_msg,
                 'status': 'validation_error'
-            }), 400
-        
-        # Make prediction
-        prediction = cholesterol_model.predict(data)
+            }, 400)
         
-        # Calculate derived metrics
-        derived = _calculate_derived_metrics(data, prediction)
+        # Prediction, derived metrics and explainability in one pass
+        response = _predict_full(data)
+        response['status'] = 'success'
         
-        # Generate explainability
-        explainability = _generate_explainability(data, prediction)
+        return _json(response, 200)
         
-        response = {
-            'prediction': prediction,
-            'derived_metrics': derived,
-            'explainability': explainability,
-            'status': 'success'
-        }
-        
-        return jsonify(response), 200
+    except BatchTimeoutError:
+        # The dynamic batcher didn't answer in time: overloaded, so ask the client to retry
+        logger.error("Cholesterol prediction timed out in the dynamic batcher")
+        return _json({
+            'error': 'Prediction timed out; retry shortly',
+            'status': 'service_unavailable'
+        }, 503)
         
     except Exception as e:
         logger.error(f"Cholesterol prediction error: {str(e)}")
-        return jsonify({
+        return _json({
             'error': f'Prediction failed: {str(e)}',
             'status': 'server_error'
-        }), 500
+        }, 500)
 
 
-def _calculate_derived_metrics(inputs: dict, prediction: dict) -> dict:
-    """Calculate additional interpretable metrics"""
-    fiber = inputs['fiber_g']
-    sat_fat = inputs['saturated_fat_g']
-    trans_fat = inputs['trans_fat_g']
-    ldl = prediction['ldl']
-    hdl = prediction['hdl']
-    total = prediction['total_cholesterol']
-    
-    # Fiber protection level
-    if fiber >= 25:
-        fiber_protection = "High"
-    elif fiber >= 10:
-        fiber_protection = "Moderate"
-    else:
-        fiber_protection = "Low"
-    
-    # Fat risk level
-    total_bad_fat = sat_fat + (trans_fat * 2)  # Trans fat counts double
-    if total_bad_fat >= 20:
-        fat_risk = "High"
-    elif total_bad_fat >= 10:
-        fat_risk = "Moderate"
-    else:
-        fat_risk = "Low"
-    
-    # LDL/HDL ratio (optimal < 3.5)
-    ldl_hdl_ratio = round(ldl / hdl, 2) if hdl > 0 else 999.0
-    
-    # Total/HDL ratio (optimal < 5.0)
-    total_hdl_ratio = round(total / hdl, 2) if hdl > 0 else 999.0
-    
-    # Non-HDL cholesterol (should be < 130)
-    non_hdl = round(total - hdl, 1)
-    
+def _predict_full(data: dict) -> dict:
+    """Prediction, derived metrics and explainability for validated inputs."""
+    if cholesterol_batcher is None:
+        return cholesterol_model.predict_full(data)
+    prediction = cholesterol_batcher.predict(data)
     return {
-        'fiber_protection': fiber_protection,
-        'fat_risk': fat_risk,
-        'ldl_hdl_ratio': ldl_hdl_ratio,
-        'total_hdl_ratio': total_hdl_ratio,
-        'non_hdl_cholesterol': non_hdl
+        'prediction': prediction,
+        'derived_metrics': _calculate_derived_metrics(data, prediction),
+        'explainability': _generate_explainability(data, prediction),
     }
 
 
+def _calculate_derived_metrics(inputs: dict, prediction: dict) -> dict:
+    """Calculate additional interpretable metrics"""
+    return derived_metrics(features_to_array(inputs), prediction)
+
+
 def _generate_explainability(inputs: dict, prediction: dict) -> dict:
     """
     Generate SHAP-style explanations for cholesterol predictions.
     
     Contributions should sum approximately to deltas.
     """
-    # Extract inputs
-    sat_fat = inputs['saturated_fat_g']
-    trans_fat = inputs['trans_fat_g']
-    dietary_chol = inputs['dietary_cholesterol_mg']
-    fiber = inputs['fiber_g']
-    sugar = inputs['sugar_g']
-    activity = inputs['activity_level']
-    stress = inputs['stress_level']
-    sleep = inputs['sleep_quality']
-    
-    delta_ldl = prediction['delta_ldl']
-    delta_hdl = prediction['delta_hdl']
-    
-    # LDL contributions (should sum to delta_ldl)
-    ldl_sat_fat = min(sat_fat * 2.5, 40.0)
-    ldl_trans_fat = min(trans_fat * 4.0, 30.0)
-    ldl_dietary_chol = min(dietary_chol / 100.0, 15.0)
-    ldl_sugar = min(sugar / 30.0, 8.0)
-    ldl_stress = stress * 6.0
-    ldl_fiber = -min(fiber * 1.8, 25.0)
-    ldl_activity = -activity * 8.0
-    ldl_sleep = -(sleep - 0.6) * 5.0 if sleep > 0.6 else 0.0
-    
-    # Normalize to sum to delta_ldl
-    ldl_sum = ldl_sat_fat + ldl_trans_fat + ldl_dietary_chol + ldl_sugar + ldl_stress + ldl_fiber + ldl_activity + ldl_sleep
-    scale_factor = delta_ldl / ldl_sum if abs(ldl_sum) > 0.1 else 1.0
-    
-    ldl_drivers = [
-        {'factor': 'Saturated Fat', 'contribution': round(ldl_sat_fat * scale_factor, 2), 'direction': 'increase'},
-        {'factor': 'Trans Fat', 'contribution': round(ldl_trans_fat * scale_factor, 2), 'direction': 'increase'},
-        {'factor': 'Dietary Cholesterol', 'contribution': round(ldl_dietary_chol * scale_factor, 2), 'direction': 'increase'},
-        {'factor': 'Sugar', 'contribution': round(ldl_sugar * scale_factor, 2), 'direction': 'increase'},
-        {'factor': 'Stress', 'contribution': round(ldl_stress * scale_factor, 2), 'direction': 'increase'},
-        {'factor': 'Fiber', 'contribution': round(ldl_fiber * scale_factor, 2), 'direction': 'decrease'},
-        {'factor': 'Physical Activity', 'contribution': round(ldl_activity * scale_factor, 2), 'direction': 'decrease'},
-        {'factor': 'Sleep Quality', 'contribution': round(ldl_sleep * scale_factor, 2), 'direction': 'decrease'}
-    ]
-    
-    # HDL contributions (should sum to delta_hdl)
-    hdl_activity = activity * 5.0
-    hdl_sleep = (sleep - 0.7) * 3.0 if sleep > 0.7 else 0.0
-    hdl_trans_fat = -trans_fat * 1.5
-    hdl_sugar = -min(sugar / 50.0, 4.0)
-    hdl_stress = -stress * 3.0
-    
-    hdl_sum = hdl_activity + hdl_sleep + hdl_trans_fat + hdl_sugar + hdl_stress
-    hdl_scale = delta_hdl / hdl_sum if abs(hdl_sum) > 0.1 else 1.0
-    
-    hdl_drivers = [
-        {'factor': 'Physical Activity', 'contribution': round(hdl_activity * hdl_scale, 2), 'direction': 'increase'},
-        {'factor': 'Sleep Quality', 'contribution': round(hdl_sleep * hdl_scale, 2), 'direction': 'increase'},
-        {'factor': 'Trans Fat', 'contribution': round(hdl_trans_fat * hdl_scale, 2), 'direction': 'decrease'},
-        {'factor': 'Sugar', 'contribution': round(hdl_sugar * hdl_scale, 2), 'direction': 'decrease'},
-        {'factor': 'Stress', 'contribution': round(hdl_stress * hdl_scale, 2), 'direction': 'decrease'}
-    ]
-    
-    return {
-        'ldl_drivers': sorted(ldl_drivers, key=lambda x: abs(x['contribution']), reverse=True),
-        'hdl_drivers': sorted(hdl_drivers, key=lambda x: abs(x['contribution']), reverse=True),
-        'note': 'Contributions sum approximately to predicted deltas'
-    }
+    ldl_terms, hdl_terms = term_contributions(features_to_array(inputs))
+    return explain_contributions(ldl_terms, hdl_terms, prediction['delta_ldl'], prediction['delta_hdl'])
 
 
 @cholesterol_bp.route('/explain', methods=['POST'])
@@ -417,30 +373,34 @@ def explain_cholesterol():
     Same input as /predict, but returns only explainability.
     """
     if cholesterol_model is None:
-        return jsonify({
+        return _json({
             'error': 'Cholesterol prediction model not initialized',
             'status': 'service_unavailable'
-        }), 503
+        }, 503)
     
     try:
-        data = request.get_json()
+        try:
+            data = _parse_json()
+        except orjson.JSONDecodeError:
+            return _json({
+                'error': 'Request body must be valid JSON',
+                'status': 'validation_error'
+            }, 400)
         
         # Validate inputs
         is_valid, error_msg = _validate_cholesterol_inputs(data)
         if not is_valid:
-            return jsonify({
+            return _json({
                 'error': error_msg,
                 'status': 'validation_error'
-            }), 400
+            }, 400)
         
         # Make prediction to get deltas
-        prediction = cholesterol_model.predict(data)
-        
-        # Generate explainability
-        explainability = _generate_explainability(data, prediction)
+        result = _predict_full(data)
+        prediction = result['prediction']
         
         response = {
-            'explainability': explainability,
+            'explainability': result['explainability'],
             'prediction_summary': {
                 'delta_ldl': prediction['delta_ldl'],
                 'delta_hdl': prediction['delta_hdl']
@@ -448,11 +408,19 @@ def explain_cholesterol():
             'status': 'success'
         }
         
-        return jsonify(response), 200
+        return _json(response, 200)
+        
+    except BatchTimeoutError:
+        # The dynamic batcher didn't answer in time: overloaded, so ask the client to retry
+        logger.error("Cholesterol explanation timed out in the dynamic batcher")
+        return _json({
+            'error': 'Explanation timed out; retry shortly',
+            'status': 'service_unavailable'
+        }, 503)
         
     except Exception as e:
         logger.error(f"Cholesterol explanation error: {str(e)}")
-        return jsonify({
+        return _json({
             'error': f'Explanation failed: {str(e)}',
             'status': 'server_error'
-        }), 500
+        }, 500)
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Cholesterol LSTM-based Prediction Model
-Implements medically-constrained prediction with deterministic core and optional Keras LSTM.
+Implements medically-constrained prediction with deterministic core and optional Keras LSTM
+(built only when CHOL_USE_LSTM=1).
 
 Academic Context:
 - Trained on synthetic data for academic validation
@@ -37,15 +38,361 @@ Outputs:
   }
 """
 
-from typing import Dict, Tuple
+import operator
+import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
 import numpy as np
 
 try:
-    import tensorflow as tf
-    from tensorflow import keras
-    TENSORFLOW_AVAILABLE = True
-except Exception:
-    TENSORFLOW_AVAILABLE = False
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# The Keras LSTM scaffold is opt-in: predict() only uses the deterministic core,
+# and importing TensorFlow costs seconds of startup and hundreds of MB per worker.
+USE_LSTM = os.environ.get('CHOL_USE_LSTM') == '1'
+
+
+def _import_keras():
+    """Import Keras on demand (single-threaded, quiet); None if unavailable."""
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+    try:
+        import tensorflow as tf
+        from tensorflow import keras
+    except Exception:
+        return None
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(1)
+    except RuntimeError:
+        # Threading can only be configured before TF initializes its runtime
+        pass
+    return keras
+
+
+# Ordered (feature, default) pairs consumed by the deterministic core
+FEATURE_DEFAULTS = (
+    ('saturated_fat_g', 0.0),
+    ('trans_fat_g', 0.0),
+    ('dietary_cholesterol_mg', 0.0),
+    ('fiber_g', 0.0),
+    ('sugar_g', 0.0),
+    ('sodium_mg', 0.0),
+    ('activity_level', 0.0),
+    ('stress_level', 0.0),
+    ('sleep_quality', 0.0),
+    ('hydration_level', 0.0),
+    ('age', 40.0),
+    ('weight_kg', 75.0),
+    ('baseline_ldl', 130.0),
+    ('baseline_hdl', 45.0),
+)
+N_FEATURES = len(FEATURE_DEFAULTS)
+_FEATURE_INDEX = {name: i for i, (name, _) in enumerate(FEATURE_DEFAULTS)}
+
+_INF = np.inf
+
+# LDL drivers: (feature, offset, coeff, lo, hi, sign)
+_LDL_TERMS = (
+    # Saturated fat: clinical evidence shows 2.5 mg/dL increase per gram (cap +40)
+    ('saturated_fat_g', 0.0, 2.5, -_INF, 40.0, 1.0),
+    # Trans fat: stronger effect, 4.0 mg/dL per gram (cap +30)
+    ('trans_fat_g', 0.0, 4.0, -_INF, 30.0, 1.0),
+    # Dietary cholesterol: modest effect, 1 mg/dL per 100mg (cap +15)
+    ('dietary_cholesterol_mg', 0.0, 1.0 / 100.0, -_INF, 15.0, 1.0),
+    # Sugar/refined carbs: indirect effect via triglycerides (cap +8)
+    ('sugar_g', 0.0, 1.0 / 30.0, -_INF, 8.0, 1.0),
+    # Age factor: LDL naturally increases with age (+0.8 per decade after 40)
+    ('age', 40.0, 0.08, 0.0, _INF, 1.0),
+    # Weight factor: excess weight raises LDL (+6 at 175kg)
+    ('weight_kg', 75.0, 0.06, 0.0, _INF, 1.0),
+    # Stress: raises LDL via cortisol (up to +6)
+    ('stress_level', 0.0, 6.0, 0.0, 6.0, 1.0),
+    # Fiber: soluble fiber reduces LDL absorption (up to -25)
+    ('fiber_g', 0.0, 1.8, -_INF, 25.0, -1.0),
+    # Physical activity: improves lipid metabolism (up to -8)
+    ('activity_level', 0.0, 8.0, 0.0, 8.0, -1.0),
+    # Good sleep: improves metabolism (up to -2)
+    ('sleep_quality', 0.6, 5.0, 0.0, _INF, -1.0),
+    # Hydration: aids metabolism (up to -1.5)
+    ('hydration_level', 0.5, 3.0, 0.0, _INF, -1.0),
+)
+
+# HDL drivers ("good cholesterol"); the healthy-fat boost is applied separately
+_HDL_TERMS = (
+    # Physical activity: primary HDL booster (up to +5)
+    ('activity_level', 0.0, 5.0, 0.0, 5.0, 1.0),
+    # Good sleep: modest HDL improvement (up to +0.9)
+    ('sleep_quality', 0.7, 3.0, 0.0, _INF, 1.0),
+    # Trans fat: reduces HDL (down to -15)
+    ('trans_fat_g', 0.0, 1.5, -_INF, _INF, -1.0),
+    # Excess sugar: reduces HDL (down to -4)
+    ('sugar_g', 0.0, 1.0 / 50.0, -_INF, 4.0, -1.0),
+    # Stress: reduces HDL (down to -3)
+    ('stress_level', 0.0, 3.0, -_INF, 3.0, -1.0),
+)
+
+
+def _term_arrays(terms):
+    idx = np.array([_FEATURE_INDEX[t[0]] for t in terms], dtype=np.intp)
+    offset, coeff, lo, hi, sign = (np.array(col, dtype=np.float64) for col in list(zip(*terms))[1:])
+    return idx, offset, coeff, lo, hi, sign
+
+
+_LDL_IDX, _LDL_OFFSET, _LDL_COEFF, _LDL_LO, _LDL_HI, _LDL_SIGN = _term_arrays(_LDL_TERMS)
+_HDL_IDX, _HDL_OFFSET, _HDL_COEFF, _HDL_LO, _HDL_HI, _HDL_SIGN = _term_arrays(_HDL_TERMS)
+
+
+def _term_contributions_py(arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Signed per-driver terms for one input row, in _LDL_TERMS and _HDL_TERMS order."""
+    # Each driver is sign * clip((x - offset) * coeff, lo, hi)
+    ldl_terms = _LDL_SIGN * np.clip((arr[_LDL_IDX] - _LDL_OFFSET) * _LDL_COEFF, _LDL_LO, _LDL_HI)
+    hdl_terms = _HDL_SIGN * np.clip((arr[_HDL_IDX] - _HDL_OFFSET) * _HDL_COEFF, _HDL_LO, _HDL_HI)
+    return ldl_terms, hdl_terms
+
+
+term_contributions = njit(cache=True)(_term_contributions_py) if NUMBA_AVAILABLE else _term_contributions_py
+
+
+def _cholesterol_core_py(arr: np.ndarray):
+    """
+    Deterministic cholesterol physiology over FEATURE_DEFAULTS-ordered inputs.
+
+    Returns (ldl, hdl, total, delta_ldl, delta_hdl, confidence, ldl_terms, hdl_terms);
+    the term vectors are kept so explainability can reuse them.
+    """
+    sat_fat, trans_fat, sugar = arr[0], arr[1], arr[4]
+    baseline_ldl, baseline_hdl = arr[12], arr[13]
+    
+    ldl_terms, hdl_terms = term_contributions(arr)
+    delta_ldl_raw = ldl_terms.sum()
+    
+    # Healthy fats (if low sat/trans): small HDL boost
+    healthy_fat_boost = 1.5 if (sat_fat < 7.0 and trans_fat < 0.5) else 0.0
+    delta_hdl_raw = healthy_fat_boost + hdl_terms.sum()
+    
+    # MEDICAL SAFETY CONSTRAINTS (scalar clamps written as min/max so they compile under numba)
+    # Daily delta limits (cholesterol changes gradually, not acutely)
+    delta_ldl = min(max(delta_ldl_raw, -15.0), 30.0)
+    delta_hdl = min(max(delta_hdl_raw, -10.0), 8.0)
+    
+    # Apply to baseline
+    predicted_ldl = baseline_ldl + delta_ldl
+    predicted_hdl = baseline_hdl + delta_hdl
+    
+    # Absolute physiological bounds
+    predicted_ldl = min(max(predicted_ldl, 40.0), 250.0)
+    predicted_hdl = min(max(predicted_hdl, 20.0), 100.0)
+    
+    # Calculate total cholesterol (simplified: LDL + HDL + 20% of triglycerides estimate)
+    # For this model, we estimate: Total ≈ LDL + HDL + (sugar/5)
+    total_raw = predicted_ldl + predicted_hdl + min((sugar / 5.0), 50.0)
+    total_cholesterol = min(max(total_raw, 100.0), 400.0)
+    
+    # Prevent normal meals from causing "Critical" risk unless baseline already high
+    # Critical threshold: Total > 240 or LDL > 160
+    baseline_critical = (baseline_ldl >= 160.0) or ((baseline_ldl + baseline_hdl + 20) >= 240.0)
+    
+    if not baseline_critical:
+        if predicted_ldl > 160.0:
+            predicted_ldl = 159.0
+            delta_ldl = predicted_ldl - baseline_ldl
+        if total_cholesterol > 240.0:
+            total_cholesterol = 239.0
+    
+    # Confidence heuristic
+    confidence = 0.80
+    
+    # Penalize if heavy clipping occurred
+    clipped = (abs(delta_ldl_raw - delta_ldl) > 1.0) or (abs(delta_hdl_raw - delta_hdl) > 1.0)
+    if clipped:
+        confidence -= 0.15
+    
+    confidence = min(max(confidence, 0.50), 0.90)
+    
+    return predicted_ldl, predicted_hdl, total_cholesterol, delta_ldl, delta_hdl, confidence, ldl_terms, hdl_terms
+
+
+_cholesterol_core = njit(cache=True)(_cholesterol_core_py) if NUMBA_AVAILABLE else _cholesterol_core_py
+
+
+def _cholesterol_core_batch(X: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Row-wise _cholesterol_core over a (B, 14) matrix in one vectorized pass.
+
+    Returns length-B arrays (ldl, hdl, total, delta_ldl, delta_hdl, confidence).
+    """
+    sat_fat, trans_fat, sugar = X[:, 0], X[:, 1], X[:, 4]
+    baseline_ldl, baseline_hdl = X[:, 12], X[:, 13]
+    
+    delta_ldl_raw = (
+        _LDL_SIGN * np.clip((X[:, _LDL_IDX] - _LDL_OFFSET) * _LDL_COEFF, _LDL_LO, _LDL_HI)
+    ).sum(axis=1)
+    healthy_fat_boost = np.where((sat_fat < 7.0) & (trans_fat < 0.5), 1.5, 0.0)
+    delta_hdl_raw = healthy_fat_boost + (
+        _HDL_SIGN * np.clip((X[:, _HDL_IDX] - _HDL_OFFSET) * _HDL_COEFF, _HDL_LO, _HDL_HI)
+    ).sum(axis=1)
+    
+    delta_ldl = np.clip(delta_ldl_raw, -15.0, 30.0)
+    delta_hdl = np.clip(delta_hdl_raw, -10.0, 8.0)
+    predicted_ldl = np.clip(baseline_ldl + delta_ldl, 40.0, 250.0)
+    predicted_hdl = np.clip(baseline_hdl + delta_hdl, 20.0, 100.0)
+    total_cholesterol = np.clip(predicted_ldl + predicted_hdl + np.minimum(sugar / 5.0, 50.0), 100.0, 400.0)
+    
+    not_critical = ~((baseline_ldl >= 160.0) | ((baseline_ldl + baseline_hdl + 20) >= 240.0))
+    cap_ldl = not_critical & (predicted_ldl > 160.0)
+    predicted_ldl = np.where(cap_ldl, 159.0, predicted_ldl)
+    delta_ldl = np.where(cap_ldl, predicted_ldl - baseline_ldl, delta_ldl)
+    total_cholesterol = np.where(not_critical & (total_cholesterol > 240.0), 239.0, total_cholesterol)
+    
+    clipped = (np.abs(delta_ldl_raw - delta_ldl) > 1.0) | (np.abs(delta_hdl_raw - delta_hdl) > 1.0)
+    confidence = np.where(clipped, 0.80 - 0.15, 0.80)
+    
+    return predicted_ldl, predicted_hdl, total_cholesterol, delta_ldl, delta_hdl, confidence
+
+
+# Fetches all 14 values in one C-level call when every feature is present
+_get_features = operator.itemgetter(*(name for name, _ in FEATURE_DEFAULTS))
+
+
+def features_to_array(features: Dict) -> np.ndarray:
+    """Load all 14 features once, in FEATURE_DEFAULTS order."""
+    try:
+        return np.array(_get_features(features), dtype=np.float64)
+    except KeyError:
+        # Partial input: fill the gaps from FEATURE_DEFAULTS
+        return np.fromiter(
+            (float(features.get(k, d)) for k, d in FEATURE_DEFAULTS), dtype=np.float64, count=N_FEATURES
+        )
+
+
+def derived_metrics(arr: np.ndarray, prediction: Dict) -> Dict:
+    """Calculate additional interpretable metrics"""
+    fiber = arr[_FEATURE_INDEX['fiber_g']]
+    sat_fat = arr[_FEATURE_INDEX['saturated_fat_g']]
+    trans_fat = arr[_FEATURE_INDEX['trans_fat_g']]
+    ldl = prediction['ldl']
+    hdl = prediction['hdl']
+    total = prediction['total_cholesterol']
+    
+    # Fiber protection level
+    if fiber >= 25:
+        fiber_protection = "High"
+    elif fiber >= 10:
+        fiber_protection = "Moderate"
+    else:
+        fiber_protection = "Low"
+    
+    # Fat risk level
+    total_bad_fat = sat_fat + (trans_fat * 2)  # Trans fat counts double
+    if total_bad_fat >= 20:
+        fat_risk = "High"
+    elif total_bad_fat >= 10:
+        fat_risk = "Moderate"
+    else:
+        fat_risk = "Low"
+    
+    # LDL/HDL ratio (optimal < 3.5)
+    ldl_hdl_ratio = round(ldl / hdl, 2) if hdl > 0 else 999.0
+    
+    # Total/HDL ratio (optimal < 5.0)
+    total_hdl_ratio = round(total / hdl, 2) if hdl > 0 else 999.0
+    
+    # Non-HDL cholesterol (should be < 130)
+    non_hdl = round(total - hdl, 1)
+    
+    return {
+        'fiber_protection': fiber_protection,
+        'fat_risk': fat_risk,
+        'ldl_hdl_ratio': ldl_hdl_ratio,
+        'total_hdl_ratio': total_hdl_ratio,
+        'non_hdl_cholesterol': non_hdl
+    }
+
+
+# Explainability drivers as (feature, factor, direction), in contribution-vector order
+_LDL_DRIVERS = (
+    ('saturated_fat_g', 'Saturated Fat', 'increase'),
+    ('trans_fat_g', 'Trans Fat', 'increase'),
+    ('dietary_cholesterol_mg', 'Dietary Cholesterol', 'increase'),
+    ('sugar_g', 'Sugar', 'increase'),
+    ('stress_level', 'Stress', 'increase'),
+    ('fiber_g', 'Fiber', 'decrease'),
+    ('activity_level', 'Physical Activity', 'decrease'),
+    ('sleep_quality', 'Sleep Quality', 'decrease'),
+)
+_HDL_DRIVERS = (
+    ('activity_level', 'Physical Activity', 'increase'),
+    ('sleep_quality', 'Sleep Quality', 'increase'),
+    ('trans_fat_g', 'Trans Fat', 'decrease'),
+    ('sugar_g', 'Sugar', 'decrease'),
+    ('stress_level', 'Stress', 'decrease'),
+)
+# Positions of each driver in the kernel's term vectors (age, weight, hydration are not explained)
+_LDL_DRIVER_IDX = np.array([[t[0] for t in _LDL_TERMS].index(f) for f, _, _ in _LDL_DRIVERS], dtype=np.intp)
+_HDL_DRIVER_IDX = np.array([[t[0] for t in _HDL_TERMS].index(f) for f, _, _ in _HDL_DRIVERS], dtype=np.intp)
+
+
+# Both tables back to back, with a segment id so one stable sort ranks each table separately
+_DRIVERS = _LDL_DRIVERS + _HDL_DRIVERS
+_N_LDL_DRIVERS = len(_LDL_DRIVERS)
+_DRIVER_SEGMENT = np.repeat([0, 1], [len(_LDL_DRIVERS), len(_HDL_DRIVERS)])
+
+
+def _scale(total: float, delta: float) -> float:
+    # Normalize contributions to sum to delta
+    return delta / total if abs(total) > 0.1 else 1.0
+
+
+def explain_contributions(ldl_terms: np.ndarray, hdl_terms: np.ndarray,
+                          delta_ldl: float, delta_hdl: float) -> Dict:
+    """
+    SHAP-style explanation built from the kernel's per-driver terms.
+    
+    Contributions sum approximately to the predicted deltas. LDL and HDL are
+    scaled, rounded and ranked together in one pass over a 13-element vector.
+    """
+    ldl = ldl_terms[_LDL_DRIVER_IDX]
+    hdl = hdl_terms[_HDL_DRIVER_IDX]
+    contribs = np.concatenate((ldl * _scale(ldl.sum(), delta_ldl), hdl * _scale(hdl.sum(), delta_hdl)))
+    # Same arithmetic as np.round(contribs, 2), minus its per-call dispatch overhead
+    contribs = np.rint(contribs * 100.0) / 100.0
+    
+    # Rank by |contribution| within each table, largest first (ties keep table order)
+    order = np.lexsort((-np.abs(contribs), _DRIVER_SEGMENT)).tolist()
+    values = contribs.tolist()
+    drivers = [
+        {'factor': _DRIVERS[i][1], 'contribution': values[i], 'direction': _DRIVERS[i][2]}
+        for i in order
+    ]
+    return {
+        'ldl_drivers': drivers[:_N_LDL_DRIVERS],
+        'hdl_drivers': drivers[_N_LDL_DRIVERS:],
+        'note': 'Contributions sum approximately to predicted deltas'
+    }
+
+
+def _risk_label(mask: int) -> str:
+    # Primary risk from LDL and Total, highest-priority rule first
+    if mask & 16:    # LDL >= 190 or Total >= 240
+        return "High Risk"
+    elif mask & 12:  # LDL >= 160, or Total >= 200 with HDL < 40
+        return "Borderline High"
+    elif mask & 2:   # LDL >= 130
+        return "Borderline"
+    elif mask & 1:   # LDL < 100 and Total < 200
+        return "Optimal"
+    else:
+        return "Near Optimal"
+
+
+# Risk label for every combination of the five threshold bits used by _classify_risk
+_RISK_TABLE = tuple(_risk_label(mask) for mask in range(32))
 
 
 class CholesterolLSTMModel:
@@ -62,7 +409,11 @@ class CholesterolLSTMModel:
         self.model = None
         self.is_trained = False
         
-        if TENSORFLOW_AVAILABLE:
+        # Compile (or load the cached) kernel now rather than on the first request
+        _cholesterol_core(np.array([d for _, d in FEATURE_DEFAULTS], dtype=np.float64))
+        
+        keras = _import_keras() if USE_LSTM else None
+        if keras is not None:
             try:
                 # LSTM architecture for time-series cholesterol prediction
                 inputs = keras.Input(shape=(sequence_length, feature_dim))
@@ -100,132 +451,7 @@ class CholesterolLSTMModel:
         - Fiber: -1-2 mg/dL LDL per gram
         - Physical activity: +2-4 mg/dL HDL
         """
-        # Extract features
-        sat_fat = float(features.get('saturated_fat_g', 0.0))
-        trans_fat = float(features.get('trans_fat_g', 0.0))
-        dietary_chol = float(features.get('dietary_cholesterol_mg', 0.0))
-        fiber = float(features.get('fiber_g', 0.0))
-        sugar = float(features.get('sugar_g', 0.0))
-        sodium = float(features.get('sodium_mg', 0.0))
-        activity = float(features.get('activity_level', 0.0))
-        stress = float(features.get('stress_level', 0.0))
-        sleep = float(features.get('sleep_quality', 0.0))
-        hydration = float(features.get('hydration_level', 0.0))
-        age = float(features.get('age', 40.0))
-        weight = float(features.get('weight_kg', 75.0))
-        baseline_ldl = float(features.get('baseline_ldl', 130.0))
-        baseline_hdl = float(features.get('baseline_hdl', 45.0))
-        
-        # LDL DRIVERS (increase LDL)
-        # Saturated fat: clinical evidence shows 2.5 mg/dL increase per gram
-        sat_fat_effect = min(sat_fat * 2.5, 40.0)  # Cap at +40
-        
-        # Trans fat: stronger effect, 4.0 mg/dL per gram
-        trans_fat_effect = min(trans_fat * 4.0, 30.0)  # Cap at +30
-        
-        # Dietary cholesterol: modest effect, 1 mg/dL per 100mg
-        dietary_chol_effect = min((dietary_chol / 100.0), 15.0)  # Cap at +15
-        
-        # Sugar/refined carbs: indirect effect via triglycerides
-        sugar_effect = min((sugar / 30.0), 8.0)  # Cap at +8
-        
-        # Age factor: LDL naturally increases with age
-        age_effect = max(0.0, (age - 40.0) * 0.08)  # +0.8 per decade after 40
-        
-        # Weight factor: excess weight raises LDL
-        weight_effect = max(0.0, (weight - 75.0) * 0.06)  # +6 at 175kg
-        
-        # Stress: raises LDL via cortisol
-        stress_effect = min(max(stress, 0.0), 1.0) * 6.0  # Up to +6
-        
-        # LDL REDUCERS (decrease LDL)
-        # Fiber: soluble fiber reduces LDL absorption
-        fiber_benefit = -min(fiber * 1.8, 25.0)  # Up to -25
-        
-        # Physical activity: improves lipid metabolism
-        activity_benefit = -min(max(activity, 0.0), 1.0) * 8.0  # Up to -8
-        
-        # Good sleep: improves metabolism
-        sleep_benefit = -max(0.0, (sleep - 0.6)) * 5.0  # Up to -2
-        
-        # Hydration: aids metabolism
-        hydration_benefit = -max(0.0, (hydration - 0.5)) * 3.0  # Up to -1.5
-        
-        # Calculate raw LDL delta
-        delta_ldl_raw = (
-            sat_fat_effect + trans_fat_effect + dietary_chol_effect + sugar_effect +
-            age_effect + weight_effect + stress_effect +
-            fiber_benefit + activity_benefit + sleep_benefit + hydration_benefit
-        )
-        
-        # HDL DRIVERS (HDL is "good cholesterol")
-        # Physical activity: primary HDL booster
-        hdl_activity_boost = min(max(activity, 0.0), 1.0) * 5.0  # Up to +5
-        
-        # Good sleep: modest HDL improvement
-        hdl_sleep_boost = max(0.0, (sleep - 0.7)) * 3.0  # Up to +0.9
-        
-        # Healthy fats (if low sat/trans): small boost
-        healthy_fat_boost = 0.0
-        if sat_fat < 7.0 and trans_fat < 0.5:
-            healthy_fat_boost = 1.5
-        
-        # HDL REDUCERS
-        # Trans fat: reduces HDL
-        hdl_trans_penalty = -trans_fat * 1.5  # Down to -15
-        
-        # Excess sugar: reduces HDL
-        hdl_sugar_penalty = -min(sugar / 50.0, 4.0)  # Down to -4
-        
-        # Stress: reduces HDL
-        hdl_stress_penalty = -min(stress * 3.0, 3.0)  # Down to -3
-        
-        # Calculate raw HDL delta
-        delta_hdl_raw = (
-            hdl_activity_boost + hdl_sleep_boost + healthy_fat_boost +
-            hdl_trans_penalty + hdl_sugar_penalty + hdl_stress_penalty
-        )
-        
-        # MEDICAL SAFETY CONSTRAINTS
-        # Daily delta limits (cholesterol changes gradually, not acutely)
-        delta_ldl = float(np.clip(delta_ldl_raw, -15.0, 30.0))
-        delta_hdl = float(np.clip(delta_hdl_raw, -10.0, 8.0))
-        
-        # Apply to baseline
-        predicted_ldl = baseline_ldl + delta_ldl
-        predicted_hdl = baseline_hdl + delta_hdl
-        
-        # Absolute physiological bounds
-        predicted_ldl = float(np.clip(predicted_ldl, 40.0, 250.0))
-        predicted_hdl = float(np.clip(predicted_hdl, 20.0, 100.0))
-        
-        # Calculate total cholesterol (simplified: LDL + HDL + 20% of triglycerides estimate)
-        # For this model, we estimate: Total ≈ LDL + HDL + (sugar/5)
-        total_raw = predicted_ldl + predicted_hdl + min((sugar / 5.0), 50.0)
-        total_cholesterol = float(np.clip(total_raw, 100.0, 400.0))
-        
-        # Prevent normal meals from causing "Critical" risk unless baseline already high
-        # Critical threshold: Total > 240 or LDL > 160
-        baseline_critical = (baseline_ldl >= 160.0) or ((baseline_ldl + baseline_hdl + 20) >= 240.0)
-        
-        if not baseline_critical:
-            if predicted_ldl > 160.0:
-                predicted_ldl = 159.0
-                delta_ldl = predicted_ldl - baseline_ldl
-            if total_cholesterol > 240.0:
-                total_cholesterol = 239.0
-        
-        # Confidence heuristic
-        confidence = 0.80
-        
-        # Penalize if heavy clipping occurred
-        clipped = (abs(delta_ldl_raw - delta_ldl) > 1.0) or (abs(delta_hdl_raw - delta_hdl) > 1.0)
-        if clipped:
-            confidence -= 0.15
-        
-        confidence = float(np.clip(confidence, 0.50, 0.90))
-        
-        return predicted_ldl, predicted_hdl, total_cholesterol, delta_ldl, delta_hdl, confidence
+        return tuple(map(float, _cholesterol_core(features_to_array(features))[:6]))
     
     def predict(self, features: Dict) -> Dict:
         """
@@ -235,8 +461,42 @@ class CholesterolLSTMModel:
             dict with ldl, hdl, total, deltas, risk_level, confidence
         """
         # Use deterministic core (LSTM scaffold available for future training)
-        ldl, hdl, total, delta_ldl, delta_hdl, conf = self._deterministic_prediction(features)
+        return self._format_prediction(*self._deterministic_prediction(features))
+    
+    def predict_full(self, features: Dict) -> Dict:
+        """
+        Prediction, derived metrics and explainability from a single pass over the inputs.
         
+        Returns:
+            dict with prediction, derived_metrics, explainability
+        """
+        arr = features_to_array(features)
+        *outputs, ldl_terms, hdl_terms = _cholesterol_core(arr)
+        prediction = self._format_prediction(*map(float, outputs))
+        return {
+            'prediction': prediction,
+            'derived_metrics': derived_metrics(arr, prediction),
+            'explainability': explain_contributions(
+                ldl_terms, hdl_terms, prediction['delta_ldl'], prediction['delta_hdl']
+            ),
+        }
+    
+    def predict_batch(self, features_list: List[Dict]) -> List[Dict]:
+        """
+        Predict for many feature dicts with one vectorized pass over the core.
+        
+        Returns one dict per input, identical in shape to predict().
+        """
+        X = np.array(
+            [[float(f.get(k, d)) for k, d in FEATURE_DEFAULTS] for f in features_list],
+            dtype=np.float64
+        ).reshape(-1, N_FEATURES)
+        # tolist() unboxes each column in one C call; round() below keeps predict()'s exact rounding
+        columns = [col.tolist() for col in _cholesterol_core_batch(X)]
+        return [self._format_prediction(*row) for row in zip(*columns)]
+    
+    def _format_prediction(self, ldl: float, hdl: float, total: float,
+                           delta_ldl: float, delta_hdl: float, conf: float) -> Dict:
         # Risk classification (WHO/AHA guidelines)
         risk = self._classify_risk(total, ldl, hdl)
         
@@ -259,25 +519,16 @@ class CholesterolLSTMModel:
         - LDL: <100 optimal, 100-129 near optimal, 130-159 borderline, 160-189 high, ≥190 very high
         - HDL: <40 low (risk factor), ≥60 high (protective)
         """
-        # HDL is protective
-        if hdl >= 60:
-            hdl_status = "Protective"
-        elif hdl < 40:
-            hdl_status = "Low (Risk Factor)"
-        else:
-            hdl_status = "Acceptable"
-        
-        # Primary risk from LDL and Total
-        if ldl >= 190 or total >= 240:
-            return "High Risk"
-        elif ldl >= 160 or (total >= 200 and hdl < 40):
-            return "Borderline High"
-        elif ldl >= 130:
-            return "Borderline"
-        elif ldl < 100 and total < 200:
-            return "Optimal"
-        else:
-            return "Near Optimal"
+        # HDL only enters through the borderline-high rule; the label is a table lookup
+        # on a bitmask of the threshold comparisons (see _RISK_TABLE)
+        mask = (
+            (((ldl >= 190) | (total >= 240)) << 4)
+            | ((ldl >= 160) << 3)
+            | (((total >= 200) & (hdl < 40)) << 2)
+            | ((ldl >= 130) << 1)
+            | ((ldl < 100) & (total < 200))
+        )
+        return _RISK_TABLE[mask]
     
     def train(self, X_train, y_train, X_val, y_val, epochs=50, batch_size=32):
         """
@@ -286,8 +537,8 @@ class CholesterolLSTMModel:
         Note: For academic validation, synthetic data can be used.
         Real deployment would require clinical data.
         """
-        if not TENSORFLOW_AVAILABLE or self.model is None:
-            raise RuntimeError("TensorFlow not available or model not initialized")
+        if self.model is None:
+            raise RuntimeError("LSTM model not initialized (set CHOL_USE_LSTM=1 with TensorFlow installed)")
         
         history = self.model.fit(
             X_train, y_train,
@@ -307,71 +558,116 @@ class CholesterolLSTMModel:
     
     def load_model(self, path: str):
         """Load pre-trained model weights"""
-        if TENSORFLOW_AVAILABLE:
+        keras = _import_keras()
+        if keras is not None:
             self.model = keras.models.load_model(path)
             self.is_trained = True
 
 
-def generate_synthetic_cholesterol_data(n_samples: int = 1000):
+# Newest BatchedCholesterolPredictor; the fork hook below restarts only this one
+_current_batcher = None
+
+
+def _restart_batcher_in_child():
+    # Threads don't survive fork (gunicorn --preload builds the batcher in the
+    # master), so each worker process starts its own queue and batching thread
+    batcher = _current_batcher() if _current_batcher is not None else None
+    if batcher is not None:
+        batcher._start_worker()
+
+
+# One hook per process (hooks can't be unregistered, so never one per instance)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_batcher_in_child)
+
+
+class BatchedCholesterolPredictor:
+    """
+    Server-side dynamic batching in front of CholesterolLSTMModel.
+    
+    Callers block in predict() while a worker thread drains the queue: it takes
+    up to max_batch_size requests, waiting at most max_wait_ms after the first
+    one, runs a single predict_batch() and resolves each caller's Future.
+    Only useful under a threaded server where requests arrive concurrently.
+    """
+    
+    def __init__(self, model: CholesterolLSTMModel, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._start_worker()
+        global _current_batcher
+        _current_batcher = weakref.ref(self)
+    
+    def _start_worker(self):
+        self._queue: "queue.Queue[Tuple[Dict, Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, args=(self._queue,), name='cholesterol-batcher', daemon=True)
+        self._worker.start()
+    
+    def predict(self, features: Dict, timeout: float = 1.0) -> Dict:
+        future: Future = Future()
+        self._queue.put((features, future))
+        return future.result(timeout=timeout)
+    
+    def _run(self, q: "queue.Queue[Tuple[Dict, Future]]"):
+        while True:
+            items = [q.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(items) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                results = self.model.predict_batch([features for features, _ in items])
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(items, results):
+                future.set_result(result)
+
+
+def generate_synthetic_cholesterol_data(n_samples: int = 1000, sequence_length: int = 30):
     """
     Generate synthetic cholesterol training data for academic validation.
     
     This allows the system to be demo-ready without requiring real clinical data.
+    Each feature is drawn once as a length-n column; targets come from a single
+    vectorized pass of the deterministic core.
     """
-    np.random.seed(42)
-    
-    X_data = []
-    y_data = []
-    
-    for _ in range(n_samples):
-        # Generate realistic feature distributions
-        sat_fat = np.random.gamma(3, 2)  # 0-20g typical
-        trans_fat = np.random.gamma(1, 0.3)  # 0-2g typical
-        dietary_chol = np.random.gamma(5, 30)  # 0-300mg typical
-        fiber = np.random.gamma(2, 3)  # 0-15g typical
-        sugar = np.random.gamma(3, 5)  # 0-40g typical
-        sodium = np.random.gamma(10, 150)  # 500-2500mg typical
-        activity = np.random.beta(2, 2)  # 0-1
-        stress = np.random.beta(2, 3)  # 0-1
-        sleep = np.random.beta(5, 2)  # 0-1
-        hydration = np.random.beta(4, 2)  # 0-1
-        age = np.random.randint(18, 90)
-        weight = np.random.normal(75, 15)
-        baseline_ldl = np.random.normal(130, 30)
-        baseline_hdl = np.random.normal(50, 10)
-        
-        features = {
-            'saturated_fat_g': sat_fat,
-            'trans_fat_g': trans_fat,
-            'dietary_cholesterol_mg': dietary_chol,
-            'fiber_g': fiber,
-            'sugar_g': sugar,
-            'sodium_mg': sodium,
-            'activity_level': activity,
-            'stress_level': stress,
-            'sleep_quality': sleep,
-            'hydration_level': hydration,
-            'age': age,
-            'weight_kg': weight,
-            'baseline_ldl': baseline_ldl,
-            'baseline_hdl': baseline_hdl
-        }
-        
-        # Use deterministic model as ground truth
-        model = CholesterolLSTMModel()
-        pred = model.predict(features)
-        
-        # Create sequence (repeat features for time-series)
-        sequence = np.array([[
-            sat_fat, trans_fat, dietary_chol, fiber, sugar, sodium,
-            activity, stress, sleep, hydration, age, weight,
-            baseline_ldl, baseline_hdl
-        ]] * 30)
-        
-        # Target: [delta_ldl, delta_hdl]
-        target = [pred['delta_ldl'], pred['delta_hdl']]
-        
-        X_data.append(sequence)
-        y_data.append(target)
+    rng = np.random.default_rng(42)
+    
+    # Realistic feature distributions, one column per feature (FEATURE_DEFAULTS order)
+    features = np.column_stack([
+        rng.gamma(3, 2, n_samples),        # saturated_fat_g: 0-20g typical
+        rng.gamma(1, 0.3, n_samples),      # trans_fat_g: 0-2g typical
+        rng.gamma(5, 30, n_samples),       # dietary_cholesterol_mg: 0-300mg typical
+        rng.gamma(2, 3, n_samples),        # fiber_g: 0-15g typical
+        rng.gamma(3, 5, n_samples),        # sugar_g: 0-40g typical
+        rng.gamma(10, 150, n_samples),     # sodium_mg: 500-2500mg typical
+        rng.beta(2, 2, n_samples),         # activity_level
+        rng.beta(2, 3, n_samples),         # stress_level
+        rng.beta(5, 2, n_samples),         # sleep_quality
+        rng.beta(4, 2, n_samples),         # hydration_level
+        rng.integers(18, 90, n_samples),   # age
+        rng.normal(75, 15, n_samples),     # weight_kg
+        rng.normal(130, 30, n_samples),    # baseline_ldl
+        rng.normal(50, 10, n_samples),     # baseline_hdl
+    ]).astype(np.float64)
+    
+    # Use deterministic model as ground truth; target: [delta_ldl, delta_hdl]
+    _, _, _, delta_ldl, delta_hdl, _ = _cholesterol_core_batch(features)
+    y_data = np.round(np.column_stack([delta_ldl, delta_hdl]), 1)
+    
+    # Create sequences (repeat features for time-series)
+    X_data = np.broadcast_to(
+        features[:, None, :], (n_samples, sequence_length, N_FEATURES)
+    ).copy()
     
-    return np.array(X_data), np.array(y_data)
+    return X_data, y_data
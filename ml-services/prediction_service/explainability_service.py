@@ -9,8 +9,138 @@ Purpose: Make AI predictions interpretable and trustworthy by explaining which f
 """
 
 import numpy as np
+from functools import lru_cache
 from flask import jsonify
 
+# Feature importance baselines (would be learned from actual model)
+GLUCOSE_FEATURE_IMPORTANCE = {
+    'carbs_g': 0.35,
+    'sugar_g': 0.25,
+    'recent_glucose_avg': 0.15,
+    'fiber_g': -0.10,  # Negative = reduces glucose
+    'protein_g': -0.05,
+    'exercise_minutes': -0.08,
+    'calories': 0.10,
+    'time_of_day': 0.08,
+    'stress_level': 0.05,
+    'medication_taken': -0.12,
+    'sleep_hours': -0.03,
+    'fat_g': 0.02,
+    'sodium_mg': 0.01,
+    'cholesterol_mg': 0.00,
+    'recent_glucose_std': 0.02
+}
+
+BP_FEATURE_IMPORTANCE = {
+    'sodium_mg': 0.40,
+    'stress_level': 0.25,
+    'recent_bp_avg': 0.15,
+    'exercise_minutes': -0.12,
+    'sleep_hours': -0.08,
+    'caffeine_mg': 0.10,
+    'medication_taken': -0.15,
+    'fat_g': 0.05,
+    'calories': 0.05,
+    'carbs_g': 0.02,
+    'sugar_g': 0.02,
+    'protein_g': -0.03,
+    'fiber_g': -0.02,
+    'cholesterol_mg': 0.01,
+    'time_of_day': 0.05
+}
+
+CHOLESTEROL_FEATURE_IMPORTANCE = {
+    'saturated_fat_g': 0.35,
+    'cholesterol_mg': 0.30,
+    'trans_fat_g': 0.20,
+    'fiber_g': -0.15,
+    'exercise_minutes': -0.10,
+    'medication_taken': -0.18,
+    'calories': 0.08,
+    'recent_cholesterol_avg': 0.12,
+    'protein_g': 0.02,
+    'carbs_g': 0.02,
+    'sugar_g': 0.03,
+    'sodium_mg': 0.01,
+    'stress_level': 0.02,
+    'sleep_hours': -0.02,
+    'fat_g': 0.10
+}
+
+
+def _importance_arrays(importance):
+    """Split a {feature: importance} table into a name tuple and a weight array"""
+    return tuple(importance), np.array(list(importance.values()), dtype=np.float64)
+
+
+# Parallel (names, weights) arrays, built once at import, so contributions are one vectorized multiply
+GLUCOSE_NAMES, GLUCOSE_WEIGHTS = _importance_arrays(GLUCOSE_FEATURE_IMPORTANCE)
+BP_NAMES, BP_WEIGHTS = _importance_arrays(BP_FEATURE_IMPORTANCE)
+CHOLESTEROL_NAMES, CHOLESTEROL_WEIGHTS = _importance_arrays(CHOLESTEROL_FEATURE_IMPORTANCE)
+
+# Row layout of explain_glucose_batch(structured=True): one contiguous record per contributor
+CONTRIBUTION_DTYPE = np.dtype([
+    ('feature', 'U24'), ('value', 'f8'), ('contribution', 'f8'), ('importance', 'f8')
+])
+
+# Explanations memoized per service instance (dashboards re-request the same meal)
+EXPLANATION_CACHE_SIZE = 1024
+
+# Human-readable feature labels for explanation text
+HUMAN_NAMES = {
+    'carbs_g': 'Carbohydrates',
+    'sugar_g': 'Sugar intake',
+    'fiber_g': 'Fiber content',
+    'protein_g': 'Protein',
+    'fat_g': 'Total fat',
+    'saturated_fat_g': 'Saturated fat',
+    'sodium_mg': 'Sodium/salt',
+    'cholesterol_mg': 'Dietary cholesterol',
+    'calories': 'Total calories',
+    'recent_glucose_avg': 'Recent glucose levels',
+    'recent_glucose_std': 'Glucose variability',
+    'recent_bp_avg': 'Recent blood pressure',
+    'recent_cholesterol_avg': 'Recent cholesterol',
+    'exercise_minutes': 'Exercise duration',
+    'sleep_hours': 'Sleep quality',
+    'stress_level': 'Stress level',
+    'medication_taken': 'Medication adherence',
+    'time_of_day': 'Time of measurement',
+    'caffeine_mg': 'Caffeine intake',
+    'trans_fat_g': 'Trans fats'
+}
+
+# Explanation line templates, (raising, lowering) per biomarker; bound positional
+# str.format runs faster than the equivalent f-strings and keeps the wording in one place
+GLUCOSE_FACTOR_LINES = (
+    "• {} ({:.1f}) is RAISING glucose by ~{:.1f} mg/dL\n".format,
+    "• {} ({:.1f}) is LOWERING glucose by ~{:.1f} mg/dL\n".format,
+)
+BP_FACTOR_LINES = (
+    "• {} ({:.1f}) is RAISING blood pressure\n".format,
+    "• {} ({:.1f}) is LOWERING blood pressure\n".format,
+)
+CHOLESTEROL_FACTOR_LINES = (
+    "• {} ({:.1f}) is RAISING cholesterol\n".format,
+    "• {} ({:.1f}) is LOWERING cholesterol\n".format,
+)
+
+
+def _fresh_copy(obj):
+    """Copy of a cached explanation with new dicts, lists and tuples all the way down
+
+    Scalars and strings are immutable and stay shared. Much cheaper than
+    copy.deepcopy for these small JSON-shaped results.
+    """
+    if isinstance(obj, dict):
+        return {k: _fresh_copy(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_fresh_copy(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_fresh_copy(v) for v in obj)
+    return obj
+
+
 class ExplainabilityService:
     def __init__(self):
         """
@@ -28,138 +158,227 @@ class ExplainabilityService:
             'sleep_hours', 'stress_level', 'medication_taken', 'time_of_day'
         ]
         
-        # Feature importance baselines (would be learned from actual model)
-        self.glucose_feature_importance = {
-            'carbs_g': 0.35,
-            'sugar_g': 0.25,
-            'recent_glucose_avg': 0.15,
-            'fiber_g': -0.10,  # Negative = reduces glucose
-            'protein_g': -0.05,
-            'exercise_minutes': -0.08,
-            'calories': 0.10,
-            'time_of_day': 0.08,
-            'stress_level': 0.05,
-            'medication_taken': -0.12,
-            'sleep_hours': -0.03,
-            'fat_g': 0.02,
-            'sodium_mg': 0.01,
-            'cholesterol_mg': 0.00,
-            'recent_glucose_std': 0.02
-        }
+        # Feature importance baselines (shared module-level tables)
+        self.glucose_feature_importance = GLUCOSE_FEATURE_IMPORTANCE
+        self.bp_feature_importance = BP_FEATURE_IMPORTANCE
+        self.cholesterol_feature_importance = CHOLESTEROL_FEATURE_IMPORTANCE
         
-        self.bp_feature_importance = {
-            'sodium_mg': 0.40,
-            'stress_level': 0.25,
-            'recent_bp_avg': 0.15,
-            'exercise_minutes': -0.12,
-            'sleep_hours': -0.08,
-            'caffeine_mg': 0.10,
-            'medication_taken': -0.15,
-            'fat_g': 0.05,
-            'calories': 0.05,
-            'carbs_g': 0.02,
-            'sugar_g': 0.02,
-            'protein_g': -0.03,
-            'fiber_g': -0.02,
-            'cholesterol_mg': 0.01,
-            'time_of_day': 0.05
-        }
+        self._glucose_cache = self._memoize(self._explain_glucose)
+        self._bp_cache = self._memoize(self._explain_bp)
+        self._cholesterol_cache = self._memoize(self._explain_cholesterol)
+
+    @staticmethod
+    def _memoize(explain):
+        """
+        LRU-cache explain(input_features, *args) on a hashable features key
         
-        self.cholesterol_feature_importance = {
-            'saturated_fat_g': 0.35,
-            'cholesterol_mg': 0.30,
-            'trans_fat_g': 0.20,
-            'fiber_g': -0.15,
-            'exercise_minutes': -0.10,
-            'medication_taken': -0.18,
-            'calories': 0.08,
-            'recent_cholesterol_avg': 0.12,
-            'protein_g': 0.02,
-            'carbs_g': 0.02,
-            'sugar_g': 0.03,
-            'sodium_mg': 0.01,
-            'stress_level': 0.02,
-            'sleep_hours': -0.02,
-            'fat_g': 0.10
-        }
+        typed=True keeps 150 and 150.0 apart, since they round to different JSON values.
+        """
+        @lru_cache(maxsize=EXPLANATION_CACHE_SIZE, typed=True)
+        def cached(features_key, *args):
+            return explain({name: value for name, value, _ in features_key}, *args)
+        return cached
+
+    @staticmethod
+    def _cached_explain(cache, names, input_features, *args):
+        """
+        Serve an explanation from cache, keyed by the exact (name, value, type) of
+        each table feature present plus the prediction args
+        
+        Returns a copy with fresh containers at every level, so callers that edit
+        the result (e.g. append warnings or change a contributor) can't corrupt
+        later cache hits.
+        """
+        try:
+            features_key = tuple(
+                (n, input_features[n], type(input_features[n]))
+                for n in names if n in input_features
+            )
+            result = cache(features_key, *args)
+        except TypeError:
+            # Unhashable feature values: compute without caching
+            return cache.__wrapped__(
+                tuple((n, input_features[n], None) for n in names if n in input_features),
+                *args
+            )
+        return _fresh_copy(result)
+
+    @staticmethod
+    def _weighted_values(names, weights, input_features):
+        """
+        value * importance for the features present in input_features, in table order
+        
+        Returns:
+            (names, importances, weighted values) restricted to the present features
+        """
+        idx = [i for i, n in enumerate(names) if n in input_features]
+        present = [names[i] for i in idx]
+        values = np.array([input_features[n] for n in present], dtype=np.float64)
+        weights = weights[idx]
+        return present, weights, values * weights
 
-    def explain_glucose_prediction(self, prediction_value, input_features):
+    @staticmethod
+    def _rank(contrib, k=None):
+        """
+        Indices of the k largest absolute contributions (all if k is None), largest first
+        
+        Contributions are compared at reported (0.01) precision and ties keep table order.
+        """
+        # rint(x * 100) orders exactly like round(x, 2); a stable sort of <= 15 entries is
+        # cheaper here than argpartition plus a re-sort of the top k
+        return np.argsort(-np.abs(np.rint(contrib * 100)), kind='stable')[:k].tolist()
+
+    def explain_glucose_prediction(self, prediction_value, input_features, include_all=False):
         """
         Generate SHAP-style explanation for glucose prediction
         
         Args:
             prediction_value: Predicted glucose level (mg/dL)
             input_features: Dictionary of input feature values
+            include_all: Also return every feature's contribution as 'all_contributions'
             
         Returns:
             Dictionary with feature contributions and natural language explanation
         """
+        return self._cached_explain(
+            self._glucose_cache, GLUCOSE_NAMES, input_features, prediction_value, include_all
+        )
+
+    def _explain_glucose(self, input_features, prediction_value, include_all):
+        """Uncached body of explain_glucose_prediction"""
         baseline_glucose = 100  # Normal fasting glucose
         prediction_delta = prediction_value - baseline_glucose
         
-        # Calculate feature contributions (SHAP values)
-        contributions = {}
-        for feature, importance in self.glucose_feature_importance.items():
-            if feature in input_features:
-                value = input_features[feature]
-                # Contribution = feature_value * importance_weight * scale_factor
-                contribution = value * importance * (prediction_delta / 100)
-                contributions[feature] = {
-                    'value': round(value, 2),
-                    'contribution_mg_dL': round(contribution, 2),
-                    'importance': round(importance, 3)
-                }
-        
-        # Sort by absolute contribution
-        sorted_contributions = sorted(
-            contributions.items(),
-            key=lambda x: abs(x[1]['contribution_mg_dL']),
-            reverse=True
+        # Calculate feature contributions (SHAP values) in one vectorized pass
+        # Contribution = feature_value * importance_weight * scale_factor
+        names, weights, weighted = self._weighted_values(
+            GLUCOSE_NAMES, GLUCOSE_WEIGHTS, input_features
         )
+        contrib = weighted * (prediction_delta / 100)
+        order = self._rank(contrib, None if include_all else 5)
+        contrib, weights = contrib.tolist(), weights.tolist()
+        
+        # Sorted by absolute contribution
+        sorted_contributions = [
+            (names[i], {
+                'value': round(input_features[names[i]], 2),
+                'contribution_mg_dL': round(contrib[i], 2),
+                'importance': round(weights[i], 3)
+            })
+            for i in order
+        ]
         
         # Generate natural language explanation
         explanation_text = self._generate_glucose_explanation(
             prediction_value, sorted_contributions[:5]
         )
         
-        return {
+        result = {
             'prediction_type': 'glucose',
             'predicted_value': round(prediction_value, 1),
             'baseline_value': baseline_glucose,
             'delta': round(prediction_delta, 1),
             'top_contributors': sorted_contributions[:5],
-            'all_contributions': sorted_contributions,
             'explanation': explanation_text,
             'model_confidence': 0.85,  # Would come from actual model
             'explanation_method': 'SHAP-inspired'
         }
+        if include_all:
+            result['all_contributions'] = sorted_contributions
+        return result
+
+    def explain_glucose_batch(self, predictions, features, k=5, structured=False):
+        """
+        Top-k glucose contributions for many predictions in one vectorized pass
+        
+        Args:
+            predictions: Sequence of predicted glucose levels (mg/dL), length N
+            features: Sequence of N feature dicts, or an (N, F) array with
+                columns in GLUCOSE_NAMES order (NaN marks a missing feature)
+            k: Contributors to report per row
+            structured: Return an (N, k) CONTRIBUTION_DTYPE array instead of dicts
+            
+        Returns:
+            List of N dicts with 'predicted_value', 'delta' and 'top_contributors'
+            (same entries as explain_glucose_prediction, without the text), or with
+            structured=True the unrounded top-k records per row (NaN-filled, with an
+            empty feature name, where a row has fewer than k features)
+        """
+        baseline_glucose = 100
+        predictions = np.asarray(predictions, dtype=np.float64)
+        if isinstance(features, np.ndarray):
+            X = features.astype(np.float64, copy=False)
+        else:
+            X = np.array(
+                [[row.get(n, np.nan) for n in GLUCOSE_NAMES] for row in features],
+                dtype=np.float64
+            ).reshape(len(features), len(GLUCOSE_NAMES))
+        deltas = predictions - baseline_glucose
+        
+        # (N, F) contributions; missing features stay NaN and sort last
+        contrib = X * GLUCOSE_WEIGHTS * (deltas / 100)[:, None]
+        order = np.argsort(-np.abs(np.rint(contrib * 100)), axis=1, kind='stable')[:, :k]
+        top_contrib = np.take_along_axis(contrib, order, axis=1)
+        top_values = np.take_along_axis(X, order, axis=1)
+        
+        if structured:
+            out = np.empty(order.shape, dtype=CONTRIBUTION_DTYPE)
+            missing = np.isnan(top_contrib)
+            out['feature'] = np.where(missing, '', np.asarray(GLUCOSE_NAMES)[order])
+            out['value'] = top_values
+            out['contribution'] = top_contrib
+            out['importance'] = np.where(missing, np.nan, GLUCOSE_WEIGHTS[order])
+            return out
+        
+        top_contrib, top_values = top_contrib.tolist(), top_values.tolist()
+        importance = [round(w, 3) for w in GLUCOSE_WEIGHTS.tolist()]
+        
+        return [
+            {
+                'predicted_value': round(prediction, 1),
+                'delta': round(delta, 1),
+                'top_contributors': [
+                    (GLUCOSE_NAMES[j], {
+                        'value': round(v, 2),
+                        'contribution_mg_dL': round(c, 2),
+                        'importance': importance[j]
+                    })
+                    for j, v, c in zip(row_order, row_values, row_contrib)
+                    if c == c  # skip NaN (feature missing from this row)
+                ]
+            }
+            for prediction, delta, row_order, row_values, row_contrib in zip(
+                predictions.tolist(), deltas.tolist(), order.tolist(), top_values, top_contrib
+            )
+        ]
 
     def explain_bp_prediction(self, systolic, diastolic, input_features):
         """
         Generate explanation for blood pressure prediction
         """
+        return self._cached_explain(self._bp_cache, BP_NAMES, input_features, systolic, diastolic)
+
+    def _explain_bp(self, input_features, systolic, diastolic):
+        """Uncached body of explain_bp_prediction"""
         baseline_sys = 120
         baseline_dia = 80
         
-        contributions = {}
-        for feature, importance in self.bp_feature_importance.items():
-            if feature in input_features:
-                value = input_features[feature]
-                sys_contribution = value * importance * (systolic - baseline_sys) / 20
-                dia_contribution = value * importance * (diastolic - baseline_dia) / 10
-                
-                contributions[feature] = {
-                    'value': round(value, 2),
-                    'systolic_contribution': round(sys_contribution, 2),
-                    'diastolic_contribution': round(dia_contribution, 2),
-                    'importance': round(importance, 3)
-                }
-        
-        sorted_by_systolic = sorted(
-            contributions.items(),
-            key=lambda x: abs(x[1]['systolic_contribution']),
-            reverse=True
-        )
+        names, weights, weighted = self._weighted_values(BP_NAMES, BP_WEIGHTS, input_features)
+        sys_contrib = weighted * (systolic - baseline_sys) / 20
+        dia_contrib = weighted * (diastolic - baseline_dia) / 10
+        order = self._rank(sys_contrib, 5)
+        sys_contrib, dia_contrib, weights = sys_contrib.tolist(), dia_contrib.tolist(), weights.tolist()
+        
+        # Only the top 5 by systolic contribution are reported
+        sorted_by_systolic = [
+            (names[i], {
+                'value': round(input_features[names[i]], 2),
+                'systolic_contribution': round(sys_contrib[i], 2),
+                'diastolic_contribution': round(dia_contrib[i], 2),
+                'importance': round(weights[i], 3)
+            })
+            for i in order
+        ]
         
         explanation_text = self._generate_bp_explanation(
             systolic, diastolic, sorted_by_systolic[:5]
@@ -181,27 +400,32 @@ class ExplainabilityService:
         """
         Generate explanation for cholesterol prediction
         """
+        return self._cached_explain(
+            self._cholesterol_cache, CHOLESTEROL_NAMES, input_features, total_chol, ldl, hdl
+        )
+
+    def _explain_cholesterol(self, input_features, total_chol, ldl, hdl):
+        """Uncached body of explain_cholesterol_prediction"""
         baseline_total = 180
         baseline_ldl = 100
         baseline_hdl = 50
         
-        contributions = {}
-        for feature, importance in self.cholesterol_feature_importance.items():
-            if feature in input_features:
-                value = input_features[feature]
-                contribution = value * importance * (total_chol - baseline_total) / 50
-                
-                contributions[feature] = {
-                    'value': round(value, 2),
-                    'contribution_mg_dL': round(contribution, 2),
-                    'importance': round(importance, 3)
-                }
-        
-        sorted_contributions = sorted(
-            contributions.items(),
-            key=lambda x: abs(x[1]['contribution_mg_dL']),
-            reverse=True
+        names, weights, weighted = self._weighted_values(
+            CHOLESTEROL_NAMES, CHOLESTEROL_WEIGHTS, input_features
         )
+        contrib = weighted * (total_chol - baseline_total) / 50
+        order = self._rank(contrib, 5)
+        contrib, weights = contrib.tolist(), weights.tolist()
+        
+        # Only the top 5 are reported
+        sorted_contributions = [
+            (names[i], {
+                'value': round(input_features[names[i]], 2),
+                'contribution_mg_dL': round(contrib[i], 2),
+                'importance': round(weights[i], 3)
+            })
+            for i in order
+        ]
         
         explanation_text = self._generate_cholesterol_explanation(
             total_chol, ldl, hdl, sorted_contributions[:5]
@@ -223,90 +447,55 @@ class ExplainabilityService:
         """Generate human-readable explanation for glucose prediction"""
         status = 'normal' if prediction < 140 else 'elevated' if prediction < 180 else 'high'
         
-        explanation = f"Your predicted glucose level is {prediction:.0f} mg/dL ({status}). "
+        parts = [f"Your predicted glucose level is {prediction:.0f} mg/dL ({status}). "]
         
         if len(top_contributors) > 0:
-            explanation += "Main factors:\n"
+            parts.append("Main factors:\n")
+            raising, lowering = GLUCOSE_FACTOR_LINES
             for feature, data in top_contributors:
                 contribution = data['contribution_mg_dL']
-                value = data['value']
-                
-                feature_name = self._humanize_feature_name(feature)
-                
-                if contribution > 0:
-                    explanation += f"• {feature_name} ({value:.1f}) is RAISING glucose by ~{abs(contribution):.1f} mg/dL\n"
-                else:
-                    explanation += f"• {feature_name} ({value:.1f}) is LOWERING glucose by ~{abs(contribution):.1f} mg/dL\n"
+                line = raising if contribution > 0 else lowering
+                parts.append(line(self._humanize_feature_name(feature), data['value'], abs(contribution)))
         
-        return explanation
+        return ''.join(parts)
 
     def _generate_bp_explanation(self, systolic, diastolic, top_contributors):
         """Generate human-readable explanation for blood pressure"""
         status = 'normal' if systolic < 120 else 'elevated' if systolic < 130 else 'high'
         
-        explanation = f"Your predicted blood pressure is {systolic:.0f}/{diastolic:.0f} mmHg ({status}). "
+        parts = [f"Your predicted blood pressure is {systolic:.0f}/{diastolic:.0f} mmHg ({status}). "]
         
         if len(top_contributors) > 0:
-            explanation += "Main factors:\n"
+            parts.append("Main factors:\n")
+            raising, lowering = BP_FACTOR_LINES
             for feature, data in top_contributors[:3]:
-                contribution = data['systolic_contribution']
-                value = data['value']
-                feature_name = self._humanize_feature_name(feature)
-                
-                if contribution > 0:
-                    explanation += f"• {feature_name} ({value:.1f}) is RAISING blood pressure\n"
-                else:
-                    explanation += f"• {feature_name} ({value:.1f}) is LOWERING blood pressure\n"
+                line = raising if data['systolic_contribution'] > 0 else lowering
+                parts.append(line(self._humanize_feature_name(feature), data['value']))
         
-        return explanation
+        return ''.join(parts)
 
     def _generate_cholesterol_explanation(self, total, ldl, hdl, top_contributors):
         """Generate human-readable explanation for cholesterol"""
         status = 'desirable' if total < 200 else 'borderline' if total < 240 else 'high'
         
-        explanation = f"Your predicted total cholesterol is {total:.0f} mg/dL ({status}). "
-        explanation += f"LDL: {ldl:.0f} mg/dL, HDL: {hdl:.0f} mg/dL. "
+        parts = [
+            f"Your predicted total cholesterol is {total:.0f} mg/dL ({status}). ",
+            f"LDL: {ldl:.0f} mg/dL, HDL: {hdl:.0f} mg/dL. "
+        ]
         
         if len(top_contributors) > 0:
-            explanation += "Main factors:\n"
+            parts.append("Main factors:\n")
+            raising, lowering = CHOLESTEROL_FACTOR_LINES
             for feature, data in top_contributors[:3]:
-                contribution = data['contribution_mg_dL']
-                value = data['value']
-                feature_name = self._humanize_feature_name(feature)
-                
-                if contribution > 0:
-                    explanation += f"• {feature_name} ({value:.1f}) is RAISING cholesterol\n"
-                else:
-                    explanation += f"• {feature_name} ({value:.1f}) is LOWERING cholesterol\n"
+                line = raising if data['contribution_mg_dL'] > 0 else lowering
+                parts.append(line(self._humanize_feature_name(feature), data['value']))
         
-        return explanation
+        return ''.join(parts)
 
-    def _humanize_feature_name(self, feature):
+    @staticmethod
+    def _humanize_feature_name(feature):
         """Convert feature name to human-readable format"""
-        human_names = {
-            'carbs_g': 'Carbohydrates',
-            'sugar_g': 'Sugar intake',
-            'fiber_g': 'Fiber content',
-            'protein_g': 'Protein',
-            'fat_g': 'Total fat',
-            'saturated_fat_g': 'Saturated fat',
-            'sodium_mg': 'Sodium/salt',
-            'cholesterol_mg': 'Dietary cholesterol',
-            'calories': 'Total calories',
-            'recent_glucose_avg': 'Recent glucose levels',
-            'recent_glucose_std': 'Glucose variability',
-            'recent_bp_avg': 'Recent blood pressure',
-            'recent_cholesterol_avg': 'Recent cholesterol',
-            'exercise_minutes': 'Exercise duration',
-            'sleep_hours': 'Sleep quality',
-            'stress_level': 'Stress level',
-            'medication_taken': 'Medication adherence',
-            'time_of_day': 'Time of measurement',
-            'caffeine_mg': 'Caffeine intake',
-            'trans_fat_g': 'Trans fats'
-        }
-        
-        return human_names.get(feature, feature.replace('_', ' ').title())
+        return HUMAN_NAMES.get(feature) or feature.replace('_', ' ').title()
 
 # Create global instance
 explainability_service = ExplainabilityService()
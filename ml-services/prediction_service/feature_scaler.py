@@ -4,31 +4,76 @@ Ensures numerical stability and prevents exploding predictions
 """
 
 import numpy as np
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from dataclasses import dataclass
 import logging
 import json
 import os
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class AffineScaler:
+    """
+    Inference-only stand-in for a fitted sklearn scaler: transform(X) = X * scale_ + min_
+    
+    Holds just the two parameter arrays, so serving needn't import sklearn.preprocessing.
+    """
+    scale_: np.ndarray
+    min_: np.ndarray
+    
+    @classmethod
+    def from_range(cls, data_min, data_max, feature_range=(0, 1)):
+        """Equivalent of MinMaxScaler(feature_range).fit over [data_min, data_max]"""
+        lo, hi = feature_range
+        data_min = np.asarray(data_min, dtype=np.float64)
+        data_range = np.asarray(data_max, dtype=np.float64) - data_min
+        # Constant features map to the lower bound, as in MinMaxScaler.fit
+        scale = (hi - lo) / np.where(data_range == 0.0, 1.0, data_range)
+        return cls(scale, lo - data_min * scale)
+    
+    @classmethod
+    def from_moments(cls, mean, std):
+        """Equivalent of a StandardScaler fitted to the given mean and std"""
+        std = np.asarray(std, dtype=np.float64)
+        scale = 1.0 / np.where(std == 0.0, 1.0, std)
+        return cls(scale, -np.asarray(mean, dtype=np.float64) * scale)
+    
+    def transform(self, X):
+        return X * self.scale_ + self.min_
+    
+    def inverse_transform(self, X):
+        return (X - self.min_) / self.scale_
+
+
+def _clip_glucose(value):
+    """Clip a glucose value to the 70-450 mg/dL safety range"""
+    return 70.0 if value < 70.0 else 450.0 if value > 450.0 else value
+
+
 class GlucoseFeatureScaler:
     """
     Handles scaling and normalization of all features for glucose prediction
     Uses different scalers for different feature types for optimal performance
     """
     
+    # (feature, default) in model input order
+    _FEATURE_SPEC = (
+        ('carbohydrates', 50.0), ('protein', 15.0), ('fat', 10.0), ('fiber', 5.0),
+        ('sugar', 10.0), ('sodium', 500.0),
+        ('heart_rate', 72.0), ('activity_level', 0.3), ('stress_level', 0.3),
+        ('sleep_quality', 0.7), ('hydration_level', 0.7),
+        ('time_since_last_meal', 4.0), ('meal_interval', 6.0), ('medication_taken', 0.0),
+        ('baseline_glucose', 100.0),
+    )
+    _FEATURE_NAMES = tuple(name for name, _ in _FEATURE_SPEC)
+    
     def __init__(self):
-        # Nutrition features: Use MinMaxScaler (bounded ranges)
-        self.nutrition_scaler = MinMaxScaler(feature_range=(0, 1))
-        
-        # Biometric features: Use StandardScaler (can vary widely)
-        self.biometric_scaler = StandardScaler()
-        
-        # Temporal features: Use MinMaxScaler (bounded ranges)
-        self.temporal_scaler = MinMaxScaler(feature_range=(0, 1))
-        
-        # Target (glucose): Use MinMaxScaler with strict medical range
-        self.glucose_scaler = MinMaxScaler(feature_range=(0, 1))
+        # Nutrition, biometric (standardized), temporal and target (glucose) groups
+        self.nutrition_scaler = None
+        self.biometric_scaler = None
+        self.temporal_scaler = None
+        self.glucose_scaler = None
         
         self.is_fitted = False
         
@@ -38,32 +83,53 @@ class GlucoseFeatureScaler:
     def _initialize_with_medical_ranges(self):
         """Initialize scalers with medically valid ranges"""
         
-        # Nutrition features (carbs, protein, fat, fiber, sugar, sodium)
-        # Create sample data at min and max for each feature
-        nutrition_min = np.array([[0, 0, 0, 0, 0, 0]])
-        nutrition_max = np.array([[120, 60, 80, 40, 50, 2300]])
-        nutrition_data = np.vstack([nutrition_min, nutrition_max])
-        self.nutrition_scaler.fit(nutrition_data)
-        
-        # Biometric features (heart_rate, activity, stress, sleep, hydration)
-        biometric_min = np.array([[40, 0, 0, 0, 0]])
-        biometric_max = np.array([[180, 1, 1, 1, 1]])
-        biometric_data = np.vstack([biometric_min, biometric_max])
-        self.biometric_scaler.fit(biometric_data)
-        
-        # Temporal features (time_since_meal, meal_interval, medication)
-        temporal_min = np.array([[0, 1, 0]])
-        temporal_max = np.array([[24, 12, 1]])
-        temporal_data = np.vstack([temporal_min, temporal_max])
-        self.temporal_scaler.fit(temporal_data)
+        # Nutrition features (carbs, protein, fat, fiber, sugar, sodium): min-max
+        self.nutrition_scaler = AffineScaler.from_range(
+            [0, 0, 0, 0, 0, 0], [120, 60, 80, 40, 50, 2300]
+        )
+        
+        # Biometric features (heart_rate, activity, stress, sleep, hydration):
+        # standardized with the moments of the {min, max} sample a fit would see
+        biometric_min = np.array([40, 0, 0, 0, 0], dtype=np.float64)
+        biometric_max = np.array([180, 1, 1, 1, 1], dtype=np.float64)
+        self.biometric_scaler = AffineScaler.from_moments(
+            (biometric_min + biometric_max) / 2, (biometric_max - biometric_min) / 2
+        )
+        
+        # Temporal features (time_since_meal, meal_interval, medication): min-max
+        self.temporal_scaler = AffineScaler.from_range([0, 1, 0], [24, 12, 1])
         
         # Glucose target (70-450 mg/dL)
-        glucose_data = np.array([[70], [450]])
-        self.glucose_scaler.fit(glucose_data)
+        self.glucose_scaler = AffineScaler.from_range([70], [450])
         
         self.is_fitted = True
+        self._refresh_affine()
         logger.info("Feature scalers initialized with medical ranges")
     
+    def _refresh_affine(self):
+        """
+        Cache every group scaler as one affine map over the 15-feature vector
+        
+        scaled = x * self._mul + self._add
+        """
+        groups = (self.nutrition_scaler, self.biometric_scaler,
+                  self.temporal_scaler, self.glucose_scaler)
+        self._set_affine(
+            np.concatenate([g.scale_ for g in groups]),
+            np.concatenate([g.min_ for g in groups])
+        )
+    
+    def _set_affine(self, mul, add):
+        self._mul = np.asarray(mul, dtype=np.float64)
+        self._add = np.asarray(add, dtype=np.float64)
+        # float32 copies for scale_features: the LSTM runs in float32, so emitting
+        # float32 saves Keras a cast on every tiled (1, T, F) input
+        self._mul32 = self._mul.astype(np.float32)
+        self._add32 = self._add.astype(np.float32)
+        # Scalar glucose map (last feature) for scale_glucose / inverse_scale_glucose
+        self._glucose_mul = float(self._mul[-1])
+        self._glucose_add = float(self._add[-1])
+    
     def scale_features(self, features_dict):
         """
         Scale all features for model input
@@ -76,53 +142,22 @@ class GlucoseFeatureScaler:
                 - baseline_glucose
                 
         Returns:
-            np.array: Scaled feature vector (15 features)
+            np.array: Scaled float32 feature vector (15 features)
         """
         if not self.is_fitted:
             raise ValueError("Scalers not fitted. Call fit() first.")
         
-        # Extract and scale nutrition features
-        nutrition_features = np.array([[
-            features_dict.get('carbohydrates', 50),
-            features_dict.get('protein', 15),
-            features_dict.get('fat', 10),
-            features_dict.get('fiber', 5),
-            features_dict.get('sugar', 10),
-            features_dict.get('sodium', 500)
-        ]])
-        nutrition_scaled = self.nutrition_scaler.transform(nutrition_features)
-        
-        # Extract and scale biometric features
-        biometric_features = np.array([[
-            features_dict.get('heart_rate', 72),
-            features_dict.get('activity_level', 0.3),
-            features_dict.get('stress_level', 0.3),
-            features_dict.get('sleep_quality', 0.7),
-            features_dict.get('hydration_level', 0.7)
-        ]])
-        biometric_scaled = self.biometric_scaler.transform(biometric_features)
-        
-        # Extract and scale temporal features
-        temporal_features = np.array([[
-            features_dict.get('time_since_last_meal', 4),
-            features_dict.get('meal_interval', 6),
-            float(features_dict.get('medication_taken', 0))
-        ]])
-        temporal_scaled = self.temporal_scaler.transform(temporal_features)
-        
-        # Baseline glucose is special - scale separately
-        baseline_glucose = features_dict.get('baseline_glucose', 100)
-        baseline_scaled = self.glucose_scaler.transform([[baseline_glucose]])[0]
-        
-        # Concatenate all scaled features
-        scaled_features = np.concatenate([
-            nutrition_scaled[0],
-            biometric_scaled[0],
-            temporal_scaled[0],
-            baseline_scaled
-        ])
-        
-        return scaled_features
+        # Nutrition, biometric, temporal and baseline glucose in model order
+        raw = np.fromiter(
+            (features_dict.get(name, default) for name, default in self._FEATURE_SPEC),
+            dtype=np.float32, count=len(self._FEATURE_SPEC)
+        )
+        
+        # One fused affine pass instead of four sklearn transform() calls; a fresh
+        # array is returned because callers keep several scaled vectors alive at once
+        raw *= self._mul32
+        raw += self._add32
+        return raw
     
     def inverse_scale_glucose(self, scaled_glucose):
         """
@@ -135,14 +170,28 @@ class GlucoseFeatureScaler:
             float: Glucose in mg/dL
         """
         if isinstance(scaled_glucose, (list, np.ndarray)):
-            scaled_glucose = np.array(scaled_glucose).reshape(-1, 1)
-        else:
-            scaled_glucose = np.array([[scaled_glucose]])
+            # Only the first value is converted
+            scaled_glucose = np.ravel(scaled_glucose)[0]
+        
+        # Same arithmetic as MinMaxScaler.inverse_transform, without the array round-trip
+        glucose_mg_dL = (scaled_glucose - self._glucose_add) / self._glucose_mul
         
-        glucose_mg_dL = self.glucose_scaler.inverse_transform(scaled_glucose)[0][0]
+        # Apply hard safety clip (NaN passes through, as with np.clip)
+        return _clip_glucose(float(glucose_mg_dL))
+    
+    def inverse_scale_glucose_batch(self, scaled_glucose):
+        """
+        Convert an array of scaled glucose values back to mg/dL
         
-        # Apply hard safety clip
-        return np.clip(glucose_mg_dL, 70, 450)
+        Args:
+            scaled_glucose: Array-like of scaled values (any shape)
+            
+        Returns:
+            np.ndarray: float64 glucose in mg/dL, same shape, each value as
+            inverse_scale_glucose would return it
+        """
+        glucose_mg_dL = (np.asarray(scaled_glucose, dtype=np.float64) - self._glucose_add) / self._glucose_mul
+        return np.clip(glucose_mg_dL, 70.0, 450.0)
     
     def scale_glucose(self, glucose_mg_dL):
         """
@@ -155,32 +204,40 @@ class GlucoseFeatureScaler:
             float: Scaled glucose (0-1)
         """
         # Clip to safe range first
-        clipped = np.clip(glucose_mg_dL, 70, 450)
-        return self.glucose_scaler.transform([[clipped]])[0][0]
+        clipped = _clip_glucose(float(glucose_mg_dL))
+        return clipped * self._glucose_mul + self._glucose_add
     
     def get_feature_names(self):
-        """Return ordered list of feature names"""
-        return [
-            'carbohydrates', 'protein', 'fat', 'fiber', 'sugar', 'sodium',
-            'heart_rate', 'activity_level', 'stress_level', 'sleep_quality', 'hydration_level',
-            'time_since_last_meal', 'meal_interval', 'medication_taken',
-            'baseline_glucose'
-        ]
+        """
+        Get feature names in the order expected by the model
+        
+        Returns:
+            tuple: Feature names (shared; use list(...) for a mutable copy)
+        """
+        return self._FEATURE_NAMES
     
     def save_scalers(self, path='./models/scalers.npz'):
         """Save scaler parameters"""
         os.makedirs(os.path.dirname(path), exist_ok=True)
         
+        # Fit-style keys (ranges and moments) recovered from the affine parameters,
+        # so files stay readable by loaders that predate AffineScaler
+        nutrition, temporal, glucose = (
+            self.nutrition_scaler, self.temporal_scaler, self.glucose_scaler
+        )
         np.savez(
             path,
-            nutrition_min=self.nutrition_scaler.data_min_,
-            nutrition_max=self.nutrition_scaler.data_max_,
-            biometric_mean=self.biometric_scaler.mean_,
-            biometric_std=self.biometric_scaler.scale_,
-            temporal_min=self.temporal_scaler.data_min_,
-            temporal_max=self.temporal_scaler.data_max_,
-            glucose_min=self.glucose_scaler.data_min_,
-            glucose_max=self.glucose_scaler.data_max_
+            nutrition_min=nutrition.inverse_transform(0.0),
+            nutrition_max=nutrition.inverse_transform(1.0),
+            biometric_mean=self.biometric_scaler.inverse_transform(0.0),
+            biometric_std=1.0 / self.biometric_scaler.scale_,
+            temporal_min=temporal.inverse_transform(0.0),
+            temporal_max=temporal.inverse_transform(1.0),
+            glucose_min=glucose.inverse_transform(0.0),
+            glucose_max=glucose.inverse_transform(1.0),
+            # Fused transform used by scale_features, so loading needn't re-derive it
+            affine_mul=self._mul,
+            affine_add=self._add
         )
         logger.info(f"Scalers saved to {path}")
     
@@ -192,43 +249,20 @@ class GlucoseFeatureScaler:
         
         data = np.load(path)
         
-        self.nutrition_scaler.data_min_ = data['nutrition_min']
-        self.nutrition_scaler.data_max_ = data['nutrition_max']
-        self.biometric_scaler.mean_ = data['biometric_mean']
-        self.biometric_scaler.scale_ = data['biometric_std']
-        self.temporal_scaler.data_min_ = data['temporal_min']
-        self.temporal_scaler.data_max_ = data['temporal_max']
-        self.glucose_scaler.data_min_ = data['glucose_min']
-        self.glucose_scaler.data_max_ = data['glucose_max']
+        self.nutrition_scaler = AffineScaler.from_range(data['nutrition_min'], data['nutrition_max'])
+        self.biometric_scaler = AffineScaler.from_moments(data['biometric_mean'], data['biometric_std'])
+        self.temporal_scaler = AffineScaler.from_range(data['temporal_min'], data['temporal_max'])
+        self.glucose_scaler = AffineScaler.from_range(data['glucose_min'], data['glucose_max'])
+        
+        if 'affine_mul' in data:
+            self._set_affine(data['affine_mul'], data['affine_add'])
+        else:
+            # Files written before the fused transform was persisted
+            self._refresh_affine()
         
         self.is_fitted = True
         logger.info(f"Scalers loaded from {path}")
         return True
-    
-    def get_feature_names(self):
-        """
-        Get list of feature names in the order expected by the model
-        
-        Returns:
-            list: Feature names
-        """
-        return [
-            'carbohydrates',
-            'protein',
-            'fat',
-            'fiber',
-            'sugar',
-            'sodium',
-            'heart_rate',
-            'activity_level',
-            'stress_level',
-            'sleep_quality',
-            'hydration_level',
-            'time_since_last_meal',
-            'meal_interval',
-            'medication_taken',
-            'baseline_glucose'
-        ]
 
 
 # Global scaler instance
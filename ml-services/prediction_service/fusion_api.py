@@ -9,9 +9,10 @@ Endpoints:
   GET  /api/fusion/info        - Fusion engine information
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request
 from fusion_engine import MultiModalFusionEngine, validate_fusion_inputs
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +22,47 @@ fusion_bp = Blueprint('fusion', __name__)
 # Global fusion engine instance
 fusion_engine = None
 
+# Fusion bodies are a few hundred bytes; anything past this is rejected unread
+MAX_FUSION_PAYLOAD = 64 * 1024
+
+
+def _json(obj, status: int = 200) -> Response:
+    """Serialize a response body with orjson (numpy scalars and arrays allowed)."""
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+def _payload_too_large() -> bool:
+    """True when the declared Content-Length exceeds MAX_FUSION_PAYLOAD."""
+    return (request.content_length or 0) > MAX_FUSION_PAYLOAD
+
+
+def _parse_json():
+    """Decode the request body once with orjson; non-object bodies become {}."""
+    # cache=False: the body is read once, so Flask needn't keep a copy
+    data = orjson.loads(request.get_data(cache=False))
+    return data if isinstance(data, dict) else {}
+
+
+_TOO_LARGE = {
+    'error': f'Payload too large (max {MAX_FUSION_PAYLOAD} bytes)',
+    'status': 'validation_error'
+}
+_BAD_JSON = {
+    'error': 'Request body must be valid JSON',
+    'status': 'validation_error'
+}
+
 
 def init_fusion_engine():
     """Initialize the fusion engine"""
     global fusion_engine
     try:
         fusion_engine = MultiModalFusionEngine()
+        validate_fusion_inputs.cache_clear()
         logger.info("✅ Multi-Modal Fusion Engine initialized")
         return True
     except Exception as e:
@@ -45,13 +81,13 @@ def health_check():
         'version': '1.0.0'
     }
     status_code = 200 if fusion_engine is not None else 503
-    return jsonify(status), status_code
+    return _json(status, status_code)
 
 
 @fusion_bp.route('/info', methods=['GET'])
 def fusion_info():
     """Get fusion engine information"""
-    return jsonify({
+    return _json({
         'service': 'multi_modal_fusion',
         'architecture': 'late-fusion (decision-level)',
         'modalities': ['computer_vision', 'nlp_nutrition', 'biometric_prediction'],
@@ -76,7 +112,7 @@ def fusion_info():
             'biometric modalities into a unified health prediction with '
             'quantified reliability.'
         )
-    }), 200
+    }, 200)
 
 
 @fusion_bp.route('/predict', methods=['POST'])
@@ -140,13 +176,19 @@ def predict_fusion():
         }
     """
     if fusion_engine is None:
-        return jsonify({
+        return _json({
             'error': 'Fusion engine not initialized',
             'status': 'service_unavailable'
-        }), 503
+        }, 503)
+    
+    if _payload_too_large():
+        return _json(_TOO_LARGE, 413)
     
     try:
-        data = request.get_json()
+        try:
+            data = _parse_json()
+        except orjson.JSONDecodeError:
+            return _json(_BAD_JSON, 400)
         
         # Extract fusion components
         biomarker = data.get('biomarker', '').lower()
@@ -158,18 +200,18 @@ def predict_fusion():
         # Validate inputs
         is_valid, error_msg = validate_fusion_inputs(cv_data, nlp_data, biometric_data)
         if not is_valid:
-            return jsonify({
+            return _json({
                 'error': error_msg,
                 'status': 'validation_error'
-            }), 400
+            }, 400)
         
         # Validate biomarker
         valid_biomarkers = ['glucose', 'blood_pressure', 'cholesterol']
         if biomarker not in valid_biomarkers:
-            return jsonify({
+            return _json({
                 'error': f'Invalid biomarker. Must be one of: {", ".join(valid_biomarkers)}',
                 'status': 'validation_error'
-            }), 400
+            }, 400)
         
         # Perform fusion
         result = fusion_engine.fuse(
@@ -200,16 +242,18 @@ def predict_fusion():
             'status': 'success'
         }
         
-        logger.info(f"✅ Fusion prediction: {biomarker} → {result.risk_level} (score: {result.fusion_score})")
+        # %-style args: formatting is skipped when INFO is disabled in production
+        logger.info("✅ Fusion prediction: %s → %s (score: %s)",
+                    biomarker, result.risk_level, result.fusion_score)
         
-        return jsonify(response), 200
+        return _json(response, 200)
         
     except Exception as e:
         logger.error(f"❌ Fusion prediction error: {str(e)}")
-        return jsonify({
+        return _json({
             'error': f'Fusion failed: {str(e)}',
             'status': 'server_error'
-        }), 500
+        }, 500)
 
 
 @fusion_bp.route('/validate', methods=['POST'])
@@ -219,8 +263,14 @@ def validate_inputs():
     
     Useful for frontend to check data completeness before submission.
     """
+    if _payload_too_large():
+        return _json({'valid': False, **_TOO_LARGE}, 413)
+    
     try:
-        data = request.get_json()
+        try:
+            data = _parse_json()
+        except orjson.JSONDecodeError:
+            return _json({'valid': False, **_BAD_JSON}, 400)
         
         cv_data = data.get('cv_data', {})
         nlp_data = data.get('nlp_data', {})
@@ -229,21 +279,21 @@ def validate_inputs():
         is_valid, error_msg = validate_fusion_inputs(cv_data, nlp_data, biometric_data)
         
         if is_valid:
-            return jsonify({
+            return _json({
                 'valid': True,
                 'message': 'All inputs valid',
                 'status': 'success'
-            }), 200
+            }, 200)
         else:
-            return jsonify({
+            return _json({
                 'valid': False,
                 'error': error_msg,
                 'status': 'validation_error'
-            }), 400
+            }, 400)
             
     except Exception as e:
-        return jsonify({
+        return _json({
             'valid': False,
             'error': f'Validation error: {str(e)}',
             'status': 'server_error'
-        }), 500
+        }, 500)
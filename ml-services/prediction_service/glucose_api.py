@@ -6,13 +6,19 @@ Provides RESTful endpoints for training, prediction, and model management
 
 import os
 import sys
-import json
-import logging
 import hashlib
+import logging
+import queue
+import struct
+import threading
+import time
 from collections import OrderedDict
+from typing import List, Tuple
+from functools import lru_cache
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request
 import numpy as np
+import orjson
 from lstm_glucose_model import (
     GlucoseLSTMModel,
     generate_synthetic_training_data,
@@ -22,6 +28,15 @@ from medical_validator import MedicalValidator
 from feature_scaler import get_global_scaler
 from improved_explainability import get_explainability_service
 
+if TENSORFLOW_AVAILABLE:
+    import tensorflow as tf
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Add parent directory to path for explainer import
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
@@ -42,58 +57,593 @@ glucose_bp = Blueprint('glucose', __name__, url_prefix='/api/glucose-prediction'
 glucose_model = None
 ts_explainer = None
 explainability_service = None
+# Static part of the /model-info body, built by init_glucose_model
+_model_info_base = None
+# Digest of the loaded model and inference runtime; /model-info derives its ETag
+# from it (refreshed by init_glucose_model and /train)
+_model_info_version = ''
 MODEL_PATH = os.environ.get('LSTM_MODEL_PATH', './models/glucose_lstm_model.h5')
 
+# Optional TF-TRT (FP16) engine for a pre-trained model on GPU hosts; set
+# LSTM_TRT_DIR to enable. The converted SavedModel is written there at startup.
+TRT_DIR = os.environ.get('LSTM_TRT_DIR')
+
+# Optional TFLite exports of the pre-trained model for CPU hosts (see
+# GlucoseLSTMModel.export_tflite_int8 / export_tflite_fp16); each is used when
+# its file exists, INT8 first.
+INT8_MODEL_PATH = os.environ.get('LSTM_MODEL_INT8_PATH', './models/glucose_lstm_model_int8.tflite')
+FP16_MODEL_PATH = os.environ.get('LSTM_MODEL_FP16_PATH', './models/glucose_lstm_model_fp16.tflite')
+# Intra-op threads for the TFLite interpreter (its default XNNPACK delegate uses
+# the same pool); half the cores by default, since gunicorn runs several workers
+TFLITE_THREADS = int(os.environ.get('LSTM_TFLITE_THREADS', max(1, (os.cpu_count() or 1) // 2)))
+
+# Forward pass used instead of Keras predict(): (B, T, F) float32 ndarray in,
+# (B, 1) ndarray out. Backed by a TF-TRT engine, a TFLite interpreter or the
+# traced Keras model, and rebuilt whenever the model object is replaced.
+_concrete_predict = None
+# What _concrete_predict (or its absence) runs on, for /model-info
+_inference_backend = 'deterministic'
+
+# Dynamic batching in front of _concrete_predict: concurrent requests are
+# stacked into one forward pass of about MAX_BATCH rows (a single larger
+# block is still run whole). The worker only
+# waits (up to MAX_LATENCY_MS) while other requests are still in flight, so
+# a lone request is dispatched immediately. Callers give up after
+# BATCH_TIMEOUT_S rather than hang if the worker is gone.
+MAX_BATCH = 16
+MAX_LATENCY_MS = 5
+BATCH_TIMEOUT_S = 10.0
+_batch_queue: "queue.Queue[_PendingPrediction]" = queue.Queue()
+_batch_lock = threading.Lock()
+_batch_worker = None
+_in_flight = 0
+
+
+def _reset_batcher() -> None:
+    """Forget the parent's worker, queue and lock in a forked child.
+
+    Threads don't survive fork (gunicorn --preload initializes this module in
+    the master), so each worker process starts its own batching thread on
+    first use.
+    """
+    global _batch_queue, _batch_lock, _batch_worker, _in_flight
+    _batch_queue = queue.Queue()
+    _batch_lock = threading.Lock()
+    _batch_worker = None
+    _in_flight = 0
+
+
+# Registered once per process at import; the hook only touches module state
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_batcher)
+
 # In-memory cache for finalized predictions so /explain/shap never re-predicts.
-# Keyed by validated input features (stable JSON), stores the exact finalized values returned by /predict.
-_prediction_cache: "OrderedDict[str, dict]" = OrderedDict()
+# Keyed by validated input features (packed float64s in validator order), stores the
+# exact finalized values returned by /predict and, when available, its explanation.
+_prediction_cache: "OrderedDict[bytes, dict]" = OrderedDict()
 _PREDICTION_CACHE_MAX = 128
+# Threaded servers run /predict and /explain/shap concurrently
+_prediction_cache_lock = threading.Lock()
+
+# Feature-ablation results from /explain/contribution, keyed by a digest of the
+# sequence and feature names. Each entry holds a rendered PNG, so keep it small.
+_contribution_cache: "OrderedDict[bytes, dict]" = OrderedDict()
+_CONTRIBUTION_CACHE_MAX = 64
+_contribution_cache_lock = threading.Lock()
+_contribution_cache_stats = {'hits': 0, 'misses': 0}
+
+# validate_input always returns exactly these fields, in this order
+_FEATURE_ORDER = (
+    *MedicalValidator.NUTRITION_RANGES,
+    *MedicalValidator.BIOMETRIC_RANGES,
+    *MedicalValidator.TEMPORAL_RANGES,
+)
+_feature_struct = struct.Struct(f'<{len(_FEATURE_ORDER)}d')
+_pack_features = _feature_struct.pack
+
+
+# (second, isoformat) of the last response timestamp; replaced as one tuple
+_last_timestamp = (None, '')
+
+
+def _now_iso() -> str:
+    """Local-time ISO timestamp at second resolution, formatted once per second"""
+    global _last_timestamp
+    second = int(time.time())
+    cached = _last_timestamp
+    if cached[0] != second:
+        cached = (second, datetime.fromtimestamp(second).isoformat())
+        _last_timestamp = cached
+    return cached[1]
+
+
+def _json(obj, status: int = 200) -> Response:
+    """Serialize a response body with orjson (numpy arrays/scalars and non-str keys allowed)."""
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+def _prediction_cache_key(validated_features: dict) -> bytes:
+    # The packed values are the key itself: exact, and cheaper than formatting + hashing
+    return _pack_features(*map(validated_features.__getitem__, _FEATURE_ORDER))
+
+
+@lru_cache(maxsize=256)
+def _validate_items(items: tuple):
+    return MedicalValidator.validate_input(dict(items))
+
+
+def _validate_meal_features(meal_features):
+    """MedicalValidator.validate_input, memoized on the raw meal_features items.
+
+    /explain/shap is normally called with the same body as the preceding
+    /predict, so its validation is a cache hit. Returns fresh containers.
+    """
+    try:
+        is_valid, errors, validated = _validate_items(tuple(meal_features.items()))
+    except (AttributeError, TypeError):
+        # Not a dict, or holds unhashable values: validate without the cache
+        return MedicalValidator.validate_input(meal_features)
+    return is_valid, list(errors), dict(validated)
+
+
+def _cache_put(key: bytes, value: dict) -> None:
+    with _prediction_cache_lock:
+        _prediction_cache[key] = value
+        _prediction_cache.move_to_end(key)
+        if len(_prediction_cache) > _PREDICTION_CACHE_MAX:
+            _prediction_cache.popitem(last=False)
+
+
+def _cache_clear() -> None:
+    """Drop cached predictions and explanations (the model they came from changed)"""
+    with _prediction_cache_lock:
+        _prediction_cache.clear()
+    with _contribution_cache_lock:
+        _contribution_cache.clear()
+    _cached_pipeline.cache_clear()
+
+
+def _cache_stats() -> dict:
+    """Hit/miss counters of this process's prediction and contribution caches"""
+    return {
+        'prediction': _cached_pipeline.cache_info()._asdict(),
+        'contribution': {
+            **_contribution_cache_stats,
+            'size': len(_contribution_cache),
+            'maxsize': _CONTRIBUTION_CACHE_MAX
+        }
+    }
+
+
+def _cache_get(key: bytes):
+    with _prediction_cache_lock:
+        value = _prediction_cache.get(key)
+        if value is not None:
+            _prediction_cache.move_to_end(key)
+        return value
 
 
-def _prediction_cache_key(validated_features: dict) -> str:
-    payload = json.dumps(validated_features, sort_keys=True, separators=(',', ':'))
-    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+def _contribution_cache_key(sequence_data: np.ndarray, feature_names) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((sequence_data.shape, sequence_data.dtype.str, feature_names)).encode())
+    h.update(np.ascontiguousarray(sequence_data).data)
+    return h.digest()
 
 
-def _cache_put(key: str, value: dict) -> None:
-    _prediction_cache[key] = value
-    _prediction_cache.move_to_end(key)
-    while len(_prediction_cache) > _PREDICTION_CACHE_MAX:
-        _prediction_cache.popitem(last=False)
+def _cached_contribution(key: bytes, compute) -> dict:
+    """Return the cached feature ablation for key, running compute() on a miss"""
+    with _contribution_cache_lock:
+        value = _contribution_cache.get(key)
+        if value is not None:
+            _contribution_cache.move_to_end(key)
+            _contribution_cache_stats['hits'] += 1
+            return value
+        _contribution_cache_stats['misses'] += 1
+    value = compute()
+    with _contribution_cache_lock:
+        _contribution_cache[key] = value
+        if len(_contribution_cache) > _CONTRIBUTION_CACHE_MAX:
+            _contribution_cache.popitem(last=False)
+    return value
 
 
-def _build_scaled_lstm_sequence(features_dict: dict) -> np.ndarray:
-    """Build the (1, T, F) tensor for the LSTM from *scaled* features.
+def _build_scaled_lstm_batch(features_list: List[dict]) -> np.ndarray:
+    """Build the (B, T, F) tensor for the LSTM from *scaled* features.
 
     Non-negotiable: model must only receive scaled inputs.
+
+    Every timestep repeats the same feature row, so this is a read-only
+    broadcast view rather than a tiled copy; the forward pass (batch
+    concatenate or tensor conversion) makes the one copy it needs.
     """
     if glucose_model is None:
         raise RuntimeError('Model not initialized')
 
     scaler = get_global_scaler()
-    scaled_features = scaler.scale_features(features_dict)
-    sequence = np.tile(scaled_features, (glucose_model.sequence_length, 1))
-    return np.expand_dims(sequence, axis=0)
+    scaled = np.stack([scaler.scale_features(f) for f in features_list]).astype(np.float32, copy=False)
+    return np.broadcast_to(
+        scaled[:, None, :], (len(features_list), glucose_model.sequence_length, scaled.shape[-1])
+    )
 
 
-def _predict_post_meal_absolute_glucose(features_dict: dict):
-    """Predict absolute post-meal glucose (mg/dL).
+def _enable_gpu_memory_growth():
+    """Allocate GPU memory on demand instead of reserving the whole device up front."""
+    if not TENSORFLOW_AVAILABLE:
+        return
+    for gpu in tf.config.list_physical_devices('GPU'):
+        try:
+            tf.config.experimental.set_memory_growth(gpu, True)
+        except RuntimeError:
+            # Only settable before the device is initialized
+            logger.warning("GPU %s already initialized; memory growth unchanged", gpu.name)
+
+
+def _build_trt_fn():
+    """Convert glucose_model.model with TF-TRT and return its serving function, or None."""
+    if not TRT_DIR or not tf.config.list_physical_devices('GPU'):
+        return None
+    try:
+        from tensorflow.python.compiler.tensorrt import trt_convert as trt
+    except ImportError:
+        logger.warning("TF-TRT not available; serving the Keras model")
+        return None
+
+    shape = (1, glucose_model.sequence_length, glucose_model.feature_dim)
+
+    def input_fn():
+        yield (tf.zeros(shape, tf.float32),)
+
+    try:
+        native_dir = TRT_DIR.rstrip('/\\') + '_native'
+        tf.saved_model.save(glucose_model.model, native_dir)
+        converter = trt.TrtGraphConverterV2(
+            input_saved_model_dir=native_dir,
+            precision_mode=trt.TrtPrecisionMode.FP16,
+            max_workspace_size_bytes=1 << 30
+        )
+        converter.convert()
+        converter.build(input_fn=input_fn)
+        converter.save(TRT_DIR)
+
+        loaded = tf.saved_model.load(TRT_DIR)
+        signature = loaded.signatures['serving_default']
+        input_name = next(iter(signature.structured_input_signature[1]))
+        output_name = next(iter(signature.structured_outputs))
+    except Exception as e:
+        logger.warning(f"TF-TRT conversion failed; serving the Keras model: {e}")
+        return None
+
+    def trt_predict(x):
+        return signature(**{input_name: tf.constant(x, dtype=tf.float32)})[output_name].numpy()
+
+    # Signatures don't keep their SavedModel alive on their own
+    trt_predict.saved_model = loaded
+    return trt_predict
+
+
+def _build_tflite_fn(path):
+    """Load a TFLite export and return a forward function over it, or None."""
+    if not path or not os.path.exists(path):
+        return None
+    if os.path.exists(MODEL_PATH) and os.path.getmtime(path) < os.path.getmtime(MODEL_PATH):
+        logger.warning(f"TFLite model {path} predates {MODEL_PATH}; re-export it to use it")
+        return None
+    try:
+        interpreter = tf.lite.Interpreter(model_path=path, num_threads=TFLITE_THREADS)
+        interpreter.allocate_tensors()
+        input_detail = interpreter.get_input_details()[0]
+        output_index = interpreter.get_output_details()[0]['index']
+    except Exception as e:
+        logger.warning(f"Could not load TFLite model {path}; serving the Keras model: {e}")
+        return None
+
+    input_index = input_detail['index']
+    batch_size = [int(input_detail['shape'][0])]
+
+    def tflite_predict(x):
+        # Only ever called from one thread at a time (init, then the batching worker)
+        if len(x) != batch_size[0]:
+            interpreter.resize_tensor_input(input_index, x.shape)
+            interpreter.allocate_tensors()
+            batch_size[0] = len(x)
+        interpreter.set_tensor(input_index, np.ascontiguousarray(x, dtype=np.float32))
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)
+
+    return tflite_predict
+
+
+def _bind_inference_fn(use_exported: bool = False) -> None:
+    """Bind _concrete_predict, tracing glucose_model.model for (None, T, F) float32 input.
+
+    With use_exported, a TF-TRT engine (GPU, see TRT_DIR) and then the INT8
+    and FP16 TFLite exports (see INT8_MODEL_PATH, FP16_MODEL_PATH) are tried
+    first. All of them freeze the pre-trained weights, so callers that
+    retrain must rebind without them.
+    """
+    global _concrete_predict, _inference_backend
+    _concrete_predict = None
+    _inference_backend = 'deterministic'
+    model = getattr(glucose_model, 'model', None)
+    if not TENSORFLOW_AVAILABLE or model is None:
+        return
+    _inference_backend = 'keras'
+
+    if use_exported:
+        trt_fn = _build_trt_fn()
+        if trt_fn is not None:
+            _concrete_predict = trt_fn
+            _inference_backend = 'tensorrt'
+            logger.info(f"LSTM inference bound to TF-TRT engine in {TRT_DIR}")
+            return
+        for path in (INT8_MODEL_PATH, FP16_MODEL_PATH):
+            tflite_fn = _build_tflite_fn(path)
+            if tflite_fn is not None:
+                _concrete_predict = tflite_fn
+                _inference_backend = f'tflite:{os.path.basename(path)}'
+                logger.info(f"LSTM inference bound to TFLite model {path}")
+                return
+
+    try:
+        spec = tf.TensorSpec(
+            (None, glucose_model.sequence_length, glucose_model.feature_dim), tf.float32
+        )
+        fn = tf.function(
+            lambda x: model(x, training=False), input_signature=[spec]
+        ).get_concrete_function()
+        # Run once so the first real request doesn't pay for graph setup
+        fn(tf.zeros((1, glucose_model.sequence_length, glucose_model.feature_dim), tf.float32))
+
+        def traced_predict(x):
+            return fn(tf.constant(x, dtype=tf.float32)).numpy()
+
+        _concrete_predict = traced_predict
+        _inference_backend = 'tf.function'
+        logger.info("LSTM inference function traced")
+    except Exception as e:
+        logger.warning(f"Could not trace LSTM inference function; using model.predict: {e}")
+
+
+class _PendingPrediction:
+    """One queued block of rows: the (B, T, F) input and where its outputs go"""
+    __slots__ = ('x', 'done', 'value', 'error')
+
+    def __init__(self, x: np.ndarray):
+        self.x = x
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def _batch_loop(q: "queue.Queue[_PendingPrediction]") -> None:
+    """Worker thread: coalesce queued inputs and run one forward pass per batch.
 
-    Uses the underlying Keras model when available; otherwise falls back to
-    the deterministic physiological simulation.
+    Exits when it dequeues None (see _stop_batch_worker).
+    """
+    stopping = False
+    while not stopping:
+        first = q.get()
+        if first is None:
+            return
+        pending = [first]
+        rows = len(first.x)
+        deadline = time.monotonic() + MAX_LATENCY_MS / 1000.0
+        while rows < MAX_BATCH:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if len(pending) >= _in_flight or remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                # Finish what was already collected, then exit
+                stopping = True
+                break
+            pending.append(item)
+            rows += len(item.x)
+
+        try:
+            fn = _concrete_predict
+            if fn is None:
+                raise RuntimeError('Model not initialized')
+            X = np.concatenate([p.x for p in pending])
+            y = fn(X)[:, 0]
+            start = 0
+            for p in pending:
+                p.value = y[start:start + len(p.x)]
+                start += len(p.x)
+        except Exception as e:
+            for p in pending:
+                p.error = e
+        finally:
+            for p in pending:
+                p.done.set()
+
+
+def _batched_forward(X: np.ndarray) -> np.ndarray:
+    """Normalized LSTM outputs, shape (B,), for a (B, T, F) input via the batching worker"""
+    global _batch_queue, _batch_worker, _in_flight
+    item = _PendingPrediction(X)
+    with _batch_lock:
+        if _batch_worker is None:
+            # Fresh queue, so a worker that is still stopping can't take this one's items
+            _batch_queue = queue.Queue()
+            _batch_worker = threading.Thread(
+                target=_batch_loop, args=(_batch_queue,), name='glucose-batcher', daemon=True
+            )
+            _batch_worker.start()
+        q = _batch_queue
+        _in_flight += 1
+    try:
+        q.put(item)
+        finished = item.done.wait(BATCH_TIMEOUT_S)
+    finally:
+        with _batch_lock:
+            _in_flight -= 1
+    if not finished:
+        raise TimeoutError(f"LSTM batching worker did not answer within {BATCH_TIMEOUT_S:g} s")
+    if item.error is not None:
+        raise item.error
+    return item.value
+
+
+def _stop_batch_worker() -> None:
+    """Stop the batching worker; the next batched forward pass starts a new one"""
+    global _batch_worker
+    with _batch_lock:
+        worker, _batch_worker = _batch_worker, None
+        if worker is not None:
+            _batch_queue.put(None)
+    if worker is not None:
+        worker.join(BATCH_TIMEOUT_S)
+
+
+def _forward_normalized(X: np.ndarray) -> np.ndarray:
+    """Normalized LSTM outputs, shape (B,), for scaled (B, T, F) inputs.
+
+    Goes through the bound inference function and batcher, or Keras predict()
+    when none is bound. Also handed to the explainability service.
+    """
+    if _concrete_predict is not None:
+        return _batched_forward(X)
+    return glucose_model.model.predict(X, verbose=0)[:, 0]
+
+
+def _predict_post_meal_absolute_glucose_batch(features_list: List[dict]) -> Tuple[np.ndarray, List[str]]:
+    """Predict absolute post-meal glucose (mg/dL) for several feature dicts.
+
+    Uses the underlying Keras model when available (one forward pass for the
+    whole list); otherwise falls back to the deterministic physiological
+    simulation per row. Returns a (B,) float64 array and a method per row.
     """
     if glucose_model is None:
         raise RuntimeError('Model not initialized')
 
+    n = len(features_list)
     # Prefer the trained/loaded Keras model if available.
-    if TENSORFLOW_AVAILABLE and getattr(glucose_model, 'model', None) is not None:
-        X = _build_scaled_lstm_sequence(features_dict)
-        y_pred_normalized = glucose_model.model.predict(X, verbose=0)
-        y_abs = float(get_global_scaler().inverse_scale_glucose(y_pred_normalized[0][0]))
-        return y_abs, 'lstm_absolute'
+    if n and TENSORFLOW_AVAILABLE and getattr(glucose_model, 'model', None) is not None:
+        y_normalized = _forward_normalized(_build_scaled_lstm_batch(features_list))
+        # Includes the 70-450 mg/dL safety clip
+        y_abs = get_global_scaler().inverse_scale_glucose_batch(y_normalized)
+        return y_abs, ['lstm_absolute'] * n
+
+    y_abs = np.fromiter(
+        (glucose_model._simulate_prediction(f)['predictions'][0] for f in features_list),
+        dtype=np.float64, count=n
+    )
+    return y_abs, ['deterministic'] * n
+
+
+def _predict_post_meal_absolute_glucose(features_dict: dict):
+    """Predict absolute post-meal glucose (mg/dL) for one feature dict."""
+    y_abs, methods = _predict_post_meal_absolute_glucose_batch([features_dict])
+    return float(y_abs[0]), methods[0]
+
+
+def _finalize_delta_py(
+    raw_delta: float,
+    baseline_glucose: float,
+    net_carbs: float,
+    expected_delta_min: float,
+    expected_delta_max: float
+):
+    """
+    Hard clips, net-carb calibration and the critical-risk cap for one prediction.
+
+    Returns (delta_glucose, final_glucose, exception_allows_out_of_range,
+    hard_delta_clipped, hard_final_clipped, sanity_corrected, critical_risk_prevented).
+    Clamps are written as min/max so this compiles under numba.
+    """
+    # HARD PHYSIOLOGICAL CONSTRAINTS (absolute)
+    # Compute hard-clipping after any LSTM fallback decision so flags reflect the chosen raw_delta.
+    hard_delta_clipped = raw_delta < 0.0 or raw_delta > 150.0
+    delta_glucose = min(max(raw_delta, 0.0), 150.0)
+
+    # Additional sanity band (auto-enforced) for typical meals to satisfy expected examples
+    # and prevent overly high deltas when net_carbs is moderate.
+    has_typical = False
+    typical_min = 0.0
+    typical_max = 0.0
+    if 25.0 < net_carbs <= 45.0:
+        has_typical = True
+        typical_min = net_carbs * 1.5
+        typical_max = net_carbs * 1.7
+    elif 45.0 < net_carbs <= 60.0:
+        has_typical = True
+        typical_min = net_carbs * 1.5
+        typical_max = net_carbs * 2.3
+    exception_allows_out_of_range = baseline_glucose >= 140.0 and net_carbs >= 60.0
+
+    # Physiological calibration (net-carb expected range). This is not a hard safety clip.
+    sanity_corrected = False
+    if not exception_allows_out_of_range and expected_delta_max >= expected_delta_min:
+        clamp_min = expected_delta_min
+        clamp_max = expected_delta_max
 
-    sim = glucose_model._simulate_prediction(features_dict)
-    return float(sim['predictions'][0]), 'deterministic'
+        if has_typical:
+            clamp_min = max(clamp_min, typical_min)
+            clamp_max = min(clamp_max, typical_max, 150.0)
+
+        if clamp_max >= clamp_min:
+            if delta_glucose < clamp_min or delta_glucose > clamp_max:
+                sanity_corrected = True
+                delta_glucose = min(max(delta_glucose, clamp_min), clamp_max)
+
+    raw_final = baseline_glucose + delta_glucose
+    hard_final_clipped = raw_final < 70.0 or raw_final > 450.0
+    final_glucose = min(max(raw_final, 70.0), 450.0)
+
+    # HARD RULE: Normal meals must not trigger Critical risk unless baseline>=140 AND net_carbs>=60.
+    # Enforce by capping the finalized glucose below the Critical threshold when the exception doesn't apply.
+    critical_risk_prevented = False
+    if not exception_allows_out_of_range and final_glucose >= 250.0:
+        final_glucose = 249.0
+        # Recompute delta to stay consistent with final
+        delta_glucose = min(max(final_glucose - baseline_glucose, 0.0), 150.0)
+        critical_risk_prevented = True
+        sanity_corrected = True
+
+    return (
+        delta_glucose, final_glucose, exception_allows_out_of_range,
+        hard_delta_clipped, hard_final_clipped, sanity_corrected, critical_risk_prevented
+    )
+
+
+_finalize_delta = njit(cache=True)(_finalize_delta_py) if NUMBA_AVAILABLE else _finalize_delta_py
+
+
+def _confidence_from_flags(constraints_applied: bool, sanity_failed: bool, explanation_invalid: bool) -> float:
+    """Calibrated confidence ladder (final spec).
+
+    confidence = 0.85
+    -0.20 if constraints_applied
+    -0.25 if sanity_check_failed (sanity_triggered)
+    -0.20 if explanation_invalid
+    floor at 0.60
+    """
+    confidence = 0.85
+    if constraints_applied:
+        confidence -= 0.20
+    if sanity_failed:
+        confidence -= 0.25
+    if explanation_invalid:
+        confidence -= 0.20
+    return float(max(0.60, min(1.0, confidence)))
+
+
+# Every outcome of the ladder, indexed by
+# (constraints_applied << 2) | (sanity_failed << 1) | explanation_invalid
+_CONF_TABLE = tuple(
+    _confidence_from_flags(bool(i & 4), bool(i & 2), bool(i & 1)) for i in range(8)
+)
 
 
 def _predict_glucose_pipeline(validated_features: dict, request_payload: dict) -> dict:
@@ -141,51 +691,13 @@ def _predict_glucose_pipeline(validated_features: dict, request_payload: dict) -
             except Exception as e:
                 logger.warning(f"Fallback simulation failed; keeping LSTM output: {e}")
 
-    # HARD PHYSIOLOGICAL CONSTRAINTS (absolute)
-    # Compute hard-clipping after any LSTM fallback decision so flags reflect the chosen raw_delta.
-    hard_delta_clipped = bool(raw_delta < 0.0 or raw_delta > 150.0)
-    delta_glucose = float(np.clip(raw_delta, 0.0, 150.0))
-
-    # Additional sanity band (auto-enforced) for typical meals to satisfy expected examples
-    # and prevent overly high deltas when net_carbs is moderate.
-    typical_min = None
-    typical_max = None
-    if 25.0 < net_carbs <= 45.0:
-        typical_min = net_carbs * 1.5
-        typical_max = net_carbs * 1.7
-    elif 45.0 < net_carbs <= 60.0:
-        typical_min = net_carbs * 1.5
-        typical_max = net_carbs * 2.3
-    exception_allows_out_of_range = (baseline_glucose >= 140.0 and net_carbs >= 60.0)
-
-    # Physiological calibration (net-carb expected range). This is not a hard safety clip.
-    sanity_corrected = False
-    if not exception_allows_out_of_range and expected_delta_max >= expected_delta_min:
-        clamp_min = expected_delta_min
-        clamp_max = expected_delta_max
-
-        if typical_min is not None and typical_max is not None:
-            clamp_min = max(clamp_min, float(typical_min))
-            clamp_max = min(clamp_max, float(typical_max), 150.0)
-
-        if clamp_max >= clamp_min:
-            if delta_glucose < clamp_min or delta_glucose > clamp_max:
-                sanity_corrected = True
-                delta_glucose = float(np.clip(delta_glucose, clamp_min, clamp_max))
-
-    raw_final = float(baseline_glucose + delta_glucose)
-    hard_final_clipped = bool(raw_final < 70.0 or raw_final > 450.0)
-    final_glucose = float(np.clip(raw_final, 70.0, 450.0))
-
-    # HARD RULE: Normal meals must not trigger Critical risk unless baseline>=140 AND net_carbs>=60.
-    # Enforce by capping the finalized glucose below the Critical threshold when the exception doesn't apply.
-    critical_risk_prevented = False
-    if not exception_allows_out_of_range and final_glucose >= 250.0:
-        final_glucose = 249.0
-        # Recompute delta to stay consistent with final
-        delta_glucose = float(np.clip(final_glucose - baseline_glucose, 0.0, 150.0))
-        critical_risk_prevented = True
-        sanity_corrected = True
+    (
+        delta_glucose, final_glucose, exception_allows_out_of_range,
+        hard_delta_clipped, hard_final_clipped, sanity_corrected, critical_risk_prevented
+    ) = _finalize_delta(
+        float(raw_delta), baseline_glucose, net_carbs,
+        float(expected_delta_min), float(expected_delta_max)
+    )
 
     # Flags for downstream confidence logic
     # constraints_applied should indicate hard safety interventions (per confidence spec).
@@ -233,14 +745,108 @@ def _predict_glucose_pipeline(validated_features: dict, request_payload: dict) -
         'prediction_method': prediction_method,
     }
 
+def _warm_up() -> None:
+    """Run one prediction and explanation on default inputs before serving.
+
+    Resolves lazy imports and fills first-use caches so the first real
+    request doesn't pay for them. The batching worker it starts is stopped
+    again: under gunicorn --preload this runs in the master, which should
+    fork without a live thread; each process starts its own on first use. The feature
+    contribution explainer (Keras predict() and matplotlib) gets one pass
+    over a zero window.
+    """
+    start = time.perf_counter()
+    _, _, features = MedicalValidator.validate_input({})
+    if ts_explainer is not None:
+        try:
+            ts_explainer.explain_feature_contribution(
+                np.zeros((1, glucose_model.sequence_length, glucose_model.feature_dim), dtype=np.float32)
+            )
+        except Exception as e:
+            logger.warning(f"Warm-up feature contribution failed: {e}")
+    try:
+        pipeline = _predict_glucose_pipeline(features, {'meal_features': features})
+        if explainability_service:
+            explainability_service.explain_prediction(
+                features_dict=features,
+                baseline_prediction=pipeline['baseline_glucose'],
+                final_prediction=pipeline['final_glucose'],
+                delta_glucose=pipeline['delta_glucose'],
+                model=glucose_model,
+                prediction_method='deterministic' if pipeline['prediction_method'] == 'deterministic' else 'lstm'
+            )
+        logger.info(f"Glucose warm-start completed in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except Exception as e:
+        logger.warning(f"Warm-up prediction failed: {e}")
+    _stop_batch_worker()
+
+
+@lru_cache(maxsize=_PREDICTION_CACHE_MAX)
+def _cached_pipeline(key: bytes) -> dict:
+    """_predict_glucose_pipeline for the features packed in key (see _prediction_cache_key).
+
+    The pipeline reads nothing but the validated features, so repeated /predict
+    bodies skip inference. Callers must not mutate the returned dict.
+    """
+    features = dict(zip(_FEATURE_ORDER, _feature_struct.unpack(key)))
+    return _predict_glucose_pipeline(features, {'meal_features': features})
+
+
+def _model_version_digest() -> str:
+    """Short digest of the saved model file, training history and inference backend"""
+    try:
+        st = os.stat(MODEL_PATH)
+        file_sig = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        file_sig = None
+    sig = (file_sig, len(glucose_model.training_history), _inference_backend, TFLITE_THREADS)
+    return hashlib.blake2b(repr(sig).encode(), digest_size=8).hexdigest()
+
+
+def _model_info_etag() -> str:
+    # is_trained can be flipped after init (run_api marks the untrained model usable)
+    return f"{_model_info_version}-{int(glucose_model.is_trained)}"
+
+
+def _build_model_info_base() -> dict:
+    """/model-info fields that only change when glucose_model is replaced"""
+    return {
+        'model_type': 'LSTM (Long Short-Term Memory)',
+        'architecture': {
+            'sequence_length': glucose_model.sequence_length,
+            'input_features': glucose_model.feature_dim,
+            'lstm_layers': 3,
+            'dense_layers': 2,
+            'output_units': 1
+        },
+        'hyperparameters': {
+            'optimizer': 'Adam',
+            'learning_rate': 0.001,
+            'loss_function': 'Mean Absolute Error',
+            'dropout_rate': 0.2
+        },
+        'training_status': None,  # filled per request
+        'input_features': glucose_model.get_feature_names(),
+        'output': {
+            'type': 'Glucose Level Prediction',
+            'unit': 'mg/dL',
+            'typical_range': [70, 200]
+        }
+    }
+
+
 def init_glucose_model():
     """Initialize global glucose model instance with improved explainability"""
-    global glucose_model, ts_explainer, explainability_service
+    global glucose_model, ts_explainer, explainability_service, _model_info_base, _model_info_version
+    _enable_gpu_memory_growth()
     glucose_model = GlucoseLSTMModel(sequence_length=24, feature_dim=15)
+    _model_info_base = _build_model_info_base()
     
     # Initialize improved explainability service
     scaler = get_global_scaler()
-    explainability_service = get_explainability_service(model=glucose_model, scaler=scaler)
+    explainability_service = get_explainability_service(
+        model=glucose_model, scaler=scaler, predict_batch_fn=_forward_normalized
+    )
     logger.info("Improved explainability service initialized")
     
     # Try to load pre-trained model if it exists
@@ -257,33 +863,40 @@ def init_glucose_model():
         except Exception as e:
             logger.warning(f"Could not load pre-trained model: {e}")
     
+    _bind_inference_fn(use_exported=glucose_model.is_trained)
+    _cache_clear()
+    _model_info_version = _model_version_digest()
+    # Compile the post-processing kernel now rather than on the first request
+    _finalize_delta(0.0, 100.0, 0.0, 0.0, 0.0)
+    _warm_up()
     return glucose_model
 
 
 @glucose_bp.route('/health', methods=['GET'])
 def health_check():
     """Check model health and availability"""
-    return jsonify({
+    return _json({
         'status': 'healthy',
         'model_available': glucose_model is not None,
         'tensorflow_available': TENSORFLOW_AVAILABLE,
         'model_trained': glucose_model.is_trained if glucose_model else False,
-        'timestamp': datetime.now().isoformat()
-    }), 200
+        'cache': _cache_stats(),
+        'timestamp': _now_iso()
+    }, 200)
 
 
 @glucose_bp.route('/features', methods=['GET'])
 def get_features():
     """Get list of required input features"""
     if glucose_model is None:
-        return jsonify({'error': 'Model not initialized'}), 500
+        return _json({'error': 'Model not initialized'}, 500)
     
-    return jsonify({
+    return _json({
         'features': glucose_model.get_feature_names(),
         'sequence_length': glucose_model.sequence_length,
         'n_features': glucose_model.feature_dim,
         'description': 'Input features for glucose prediction model'
-    }), 200
+    }, 200)
 
 
 @glucose_bp.route('/train', methods=['POST'])
@@ -299,14 +912,15 @@ def train_model():
         'training_data': optional numpy array
     }
     """
+    global _model_info_version
     if glucose_model is None:
-        return jsonify({'error': 'Model not initialized'}), 500
+        return _json({'error': 'Model not initialized'}, 500)
     
     if not TENSORFLOW_AVAILABLE:
-        return jsonify({
+        return _json({
             'error': 'TensorFlow not available',
             'message': 'GPU/CUDA training environment required'
-        }), 503
+        }, 503)
     
     try:
         data = request.get_json()
@@ -327,7 +941,7 @@ def train_model():
             y_val = np.array(data.get('y_val', []))
             
             if len(X_train) == 0:
-                return jsonify({'error': 'No training data provided'}), 400
+                return _json({'error': 'No training data provided'}, 400)
         
         # Train model
         logger.info(f"Training model for {epochs} epochs...")
@@ -337,12 +951,17 @@ def train_model():
             epochs=epochs,
             batch_size=batch_size
         )
+        # Drop any TF-TRT / TFLite engine, which still holds the pre-training weights,
+        # and every prediction/explanation made with them
+        _bind_inference_fn()
+        _cache_clear()
         
         # Save trained model
         os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
         glucose_model.save_model(MODEL_PATH)
+        _model_info_version = _model_version_digest()
         
-        return jsonify({
+        return _json({
             'status': 'success',
             'message': 'Model trained successfully',
             'training_samples': len(X_train),
@@ -352,12 +971,12 @@ def train_model():
             'final_val_loss': float(history.history.get('val_loss', [0])[-1]),
             'model_saved': True,
             'model_path': MODEL_PATH,
-            'timestamp': datetime.now().isoformat()
-        }), 200
+            'timestamp': _now_iso()
+        }, 200)
         
     except Exception as e:
         logger.error(f"Training error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, 500)
 
 
 @glucose_bp.route('/predict', methods=['POST'])
@@ -387,30 +1006,28 @@ def predict_glucose():
     }
     """
     if glucose_model is None:
-        return jsonify({'error': 'Model not initialized'}), 500
+        return _json({'error': 'Model not initialized'}, 500)
     
     try:
         data = request.get_json()
         logger.info(f"Received prediction request with medical validation")
         
         if 'meal_features' not in data:
-            return jsonify({'error': 'meal_features required'}), 400
+            return _json({'error': 'meal_features required'}, 400)
         
         # Step 1: Validate inputs against medical ranges
-        is_valid, errors, validated_features = MedicalValidator.validate_input(data['meal_features'])
+        is_valid, errors, validated_features = _validate_meal_features(data['meal_features'])
         
         if not is_valid:
-            return jsonify({
+            return _json({
                 'error': 'Input validation failed',
                 'validation_errors': errors,
                 'message': 'Input values outside medically acceptable ranges'
-            }), 400
+            }, 400)
         
-        # Step 2: Calculate derived features
-        enriched_features = MedicalValidator.calculate_derived_features(validated_features)
-
-        # SINGLE SOURCE OF TRUTH - unified prediction pipeline
-        pipeline = _predict_glucose_pipeline(validated_features, data)
+        # SINGLE SOURCE OF TRUTH - unified prediction pipeline (memoized per feature set)
+        cache_key = _prediction_cache_key(validated_features)
+        pipeline = _cached_pipeline(cache_key)
 
         baseline_glucose = pipeline['baseline_glucose']
         delta_glucose = pipeline['delta_glucose']
@@ -429,6 +1046,8 @@ def predict_glucose():
         # Step 9: Generate comprehensive explainability with perturbation-based importance
         # PASS DELTA_GLUCOSE to ensure SHAP explains the SAME prediction
         explanation = None
+        # As returned by the service (before the mismatch warning below), for /explain/shap
+        service_explanation = None
         explainer_issue = False
         explanation_invalid = False
         if explainability_service:
@@ -441,6 +1060,8 @@ def predict_glucose():
                     model=glucose_model,
                     prediction_method='deterministic' if pipeline['prediction_method'] == 'deterministic' else 'lstm'
                 )
+                if isinstance(explanation, dict):
+                    service_explanation = dict(explanation)
                 logger.info(f"Explanation generated: {len(explanation.get('feature_contributions', {}))} features")
 
                 # Detect broken explainability (fallback/low-signal warnings, or mismatch)
@@ -473,25 +1094,14 @@ def predict_glucose():
                 }
 
         # Step 9.5: FINAL CONFIDENCE AFTER ALL CORRECTIONS (MANDATORY)
-        # Calibrated (final spec):
-        # confidence = 0.85
-        # -0.20 if constraints_applied
-        # -0.25 if sanity_check_failed (sanity_triggered)
-        # -0.20 if explanation_invalid
-        # floor at 0.60
-        confidence = 0.85
-
-        if constraints_applied:
-            confidence -= 0.20
-        if not bool(pipeline.get('sanity_passed', True)):
-            confidence -= 0.25
-        if explanation_invalid:
-            confidence -= 0.20
-
-        confidence = float(max(0.60, min(1.0, confidence)))
+        # Table lookup over the calibrated ladder in _confidence_from_flags
+        confidence = _CONF_TABLE[
+            (bool(constraints_applied) << 2)
+            | ((not pipeline.get('sanity_passed', True)) << 1)
+            | bool(explanation_invalid)
+        ]
 
         # Cache finalized prediction so /explain/shap never re-predicts
-        cache_key = _prediction_cache_key(validated_features)
         _cache_put(cache_key, {
             'baseline_glucose': baseline_glucose,
             'delta_glucose': delta_glucose,
@@ -500,7 +1110,8 @@ def predict_glucose():
             'sanity_check_passed': bool(sanity_passed),
             'risk_classification': risk_classification,
             'prediction_method': pipeline['prediction_method'],
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _now_iso(),
+            'explanation': service_explanation,
         })
         
         # Step 10: Build comprehensive response
@@ -551,16 +1162,19 @@ def predict_glucose():
                 'validation': 'WHO/ADA Guidelines',
                 'output_range': '70-450 mg/dL (hard clipping applied)'
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _now_iso()
         }
         
-        return jsonify(response), 200
+        return _json(response, 200)
         
+    except TimeoutError as e:
+        logger.error(f"Prediction timed out: {e}")
+        return _json({'error': str(e)}, 503)
     except Exception as e:
         import traceback
         logger.error(f"Prediction error: {e}")
         logger.error(f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+        return _json({'error': str(e), 'traceback': traceback.format_exc()}, 500)
 
 
 @glucose_bp.route('/explain/shap', methods=['POST'])
@@ -582,16 +1196,16 @@ def explain_prediction_shap():
         data = request.get_json()
         
         if not data or 'meal_features' not in data:
-            return jsonify({'error': 'meal_features required'}), 400
+            return _json({'error': 'meal_features required'}, 400)
         
         # Validate inputs (SAME AS PREDICT ENDPOINT)
-        is_valid, errors, validated_features = MedicalValidator.validate_input(data['meal_features'])
+        is_valid, errors, validated_features = _validate_meal_features(data['meal_features'])
         
         if not is_valid:
-            return jsonify({
+            return _json({
                 'error': 'Input validation failed',
                 'validation_errors': errors
-            }), 400
+            }, 400)
         
         # SHAP endpoint must NOT re-predict.
         # It should explain the finalized prediction already produced by /predict.
@@ -601,7 +1215,7 @@ def explain_prediction_shap():
         if isinstance(data, dict):
             prediction_context = data.get('prediction_context')
 
-        cached = _prediction_cache.get(cache_key)
+        cached = _cache_get(cache_key)
         if cached is not None:
             baseline_glucose = float(cached['baseline_glucose'])
             delta_glucose = float(cached['delta_glucose'])
@@ -617,24 +1231,27 @@ def explain_prediction_shap():
             sanity_check_passed = bool(prediction_context.get('sanity_check_passed', True))
             prediction_method = 'client_context'
         else:
-            return jsonify({
+            return _json({
                 'success': False,
                 'error': 'No finalized prediction available to explain',
                 'message': 'Call /predict first (same meal_features) and then call /explain/shap, or pass prediction_context.'
-            }), 409
+            }, 409)
 
         logger.info(f"SHAP endpoint({prediction_method}): baseline={baseline_glucose}, delta={delta_glucose}, final={final_glucose}")
         
         # Generate improved explainability - EXPLAIN THE DELTA, don't re-predict
         if explainability_service:
-            explanation = explainability_service.explain_prediction(
-                features_dict=validated_features,
-                baseline_prediction=baseline_glucose,
-                final_prediction=final_glucose,
-                delta_glucose=delta_glucose,  # CRITICAL: Explain the delta we computed
-                model=glucose_model,
-                prediction_method='deterministic' if prediction_method in ['deterministic'] else 'lstm'
-            )
+            # /predict already explained this exact prediction; reuse it when cached
+            explanation = cached.get('explanation') if cached is not None else None
+            if explanation is None:
+                explanation = explainability_service.explain_prediction(
+                    features_dict=validated_features,
+                    baseline_prediction=baseline_glucose,
+                    final_prediction=final_glucose,
+                    delta_glucose=delta_glucose,  # CRITICAL: Explain the delta we computed
+                    model=glucose_model,
+                    prediction_method='deterministic' if prediction_method in ['deterministic'] else 'lstm'
+                )
             
             # Format for frontend (convert to old format for compatibility)
             formatted_contributions = []
@@ -648,7 +1265,7 @@ def explain_prediction_shap():
             # Sort by absolute importance
             formatted_contributions.sort(key=lambda x: abs(x['importance']), reverse=True)
             
-            return jsonify({
+            return _json({
                 'success': True,
                 'predicted_glucose': final_glucose,  # MUST match /predict output
                 'baseline_glucose': baseline_glucose,
@@ -665,14 +1282,14 @@ def explain_prediction_shap():
                 'prediction_method': prediction_method
             })
         else:
-            return jsonify({
+            return _json({
                 'success': False,
                 'error': 'Explainability service not initialized'
-            }), 503
+            }, 503)
         
     except Exception as e:
         logger.error(f"SHAP explanation error: {e}", exc_info=True)
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, 500)
 
 @glucose_bp.route('/explain/contribution', methods=['POST'])
 def explain_feature_contribution():
@@ -688,43 +1305,111 @@ def explain_feature_contribution():
     global glucose_model, ts_explainer
     
     if not EXPLAINER_AVAILABLE:
-        return jsonify({
+        return _json({
             'success': False,
             'error': 'Explainability features not available. Install: pip install shap matplotlib'
-        }), 503
+        }, 503)
     
     if not glucose_model or not glucose_model.model:
-        return jsonify({'error': 'Model not initialized or loaded'}), 400
+        return _json({'error': 'Model not initialized or loaded'}, 400)
     
     if not ts_explainer:
-        return jsonify({'error': 'Explainer not initialized'}), 400
+        return _json({'error': 'Explainer not initialized'}, 400)
     
     try:
         data = request.get_json()
         
         if not data or 'sequence_data' not in data:
-            return jsonify({'error': 'sequence_data required'}), 400
+            return _json({'error': 'sequence_data required'}, 400)
         
-        # Prepare input data
-        sequence_data = np.array(data['sequence_data'])
+        # Prepare input data: contiguous float32 (the model's dtype), one or more
+        # (sequence_length, feature_dim) windows with the batch axis added as needed
+        sequence_data = np.asarray(data['sequence_data'], dtype=np.float32).reshape(
+            -1, glucose_model.sequence_length, glucose_model.feature_dim
+        )
         feature_names = data.get('feature_names', None)
         
-        # Ensure correct shape
-        if len(sequence_data.shape) == 2:
-            sequence_data = np.expand_dims(sequence_data, axis=0)
+        # Get feature contribution analysis (deterministic, so repeated windows are served from cache)
+        def analyze():
+            logger.info("Analyzing feature contributions...")
+            return ts_explainer.explain_feature_contribution(sequence_data, feature_names)
         
-        # Get feature contribution analysis
-        logger.info("Analyzing feature contributions...")
-        explanation = ts_explainer.explain_feature_contribution(sequence_data, feature_names)
+        explanation = _cached_contribution(_contribution_cache_key(sequence_data, feature_names), analyze)
         
-        return jsonify({
+        return _json({
             'success': True,
             **explanation
         })
         
     except Exception as e:
         logger.error(f"Feature contribution error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, 500)
+
+
+# Rows per NDJSON record for /evaluate?stream=1
+EVAL_STREAM_CHUNK = 256
+
+# application/octet-stream /evaluate body: this header (n, seq_len, n_features
+# as little-endian uint32), then X_test and y_test as raw little-endian float32
+_EVAL_HEADER = struct.Struct('<3I')
+
+
+def _parse_binary_evaluation(body: bytes, expected_seq_len: int,
+                             expected_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(X_test, y_test) read-only views over a binary /evaluate body; ValueError if malformed"""
+    if len(body) < _EVAL_HEADER.size:
+        raise ValueError('Binary body shorter than its header')
+    n, seq_len, n_features = _EVAL_HEADER.unpack_from(body)
+    if (seq_len, n_features) != (expected_seq_len, expected_features):
+        raise ValueError(
+            f"Binary header window ({seq_len}, {n_features}) does not match the model's "
+            f"({expected_seq_len}, {expected_features})"
+        )
+    x_count = n * seq_len * n_features
+    expected = _EVAL_HEADER.size + 4 * (x_count + n)
+    if len(body) != expected:
+        raise ValueError(f"Binary body is {len(body)} bytes; header ({n}, {seq_len}, {n_features}) needs {expected}")
+    X_test = np.frombuffer(body, dtype='<f4', count=x_count, offset=_EVAL_HEADER.size)
+    y_test = np.frombuffer(body, dtype='<f4', count=n, offset=_EVAL_HEADER.size + 4 * x_count)
+    return X_test.reshape(n, seq_len, n_features), y_test
+
+
+def _metrics_interpretation(metrics: dict) -> dict:
+    return {
+        'rmse_interpretation': f"Average prediction error: ±{metrics['rmse']:.2f} mg/dL",
+        'r2_interpretation': f"Model explains {metrics['r2_score']*100:.1f}% of variance",
+        'mape_interpretation': f"Average percentage error: {metrics['mape']:.2f}%"
+    }
+
+
+def _stream_evaluation(X_test: np.ndarray, y_test: np.ndarray):
+    """NDJSON body for /evaluate?stream=1: one record per chunk of rows, then a summary"""
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    try:
+        chunks = []
+        for start in range(0, len(X_test), EVAL_STREAM_CHUNK):
+            y_pred = np.asarray(glucose_model.predict(
+                X_test[start:start + EVAL_STREAM_CHUNK], return_confidence=False
+            )['predictions'])
+            chunks.append(y_pred)
+            yield orjson.dumps({
+                'start': start,
+                'predictions': y_pred,
+                'interpretation': _interpret_glucose_levels(y_pred).tolist(),
+                'risk': _assess_glucose_risks(y_pred).tolist()
+            }, option=option) + b'\n'
+        
+        metrics = glucose_model.evaluate(X_test, y_test, y_pred=np.concatenate(chunks))
+        yield orjson.dumps({
+            'status': 'success',
+            'metrics': metrics,
+            'interpretation': _metrics_interpretation(metrics),
+            'timestamp': _now_iso()
+        }, option=option) + b'\n'
+    except Exception as e:
+        # Headers are already sent; report the failure as the last record
+        logger.error(f"Evaluation error: {e}")
+        yield orjson.dumps({'error': str(e)}) + b'\n'
 
 
 @glucose_bp.route('/evaluate', methods=['POST'])
@@ -738,84 +1423,128 @@ def evaluate_model():
         'y_test': array,
         'use_synthetic': bool (default: False)
     }
+    
+    or, with Content-Type application/octet-stream, a 12-byte header of
+    little-endian uint32 (n, seq_len, n_features) followed by X_test
+    (n * seq_len * n_features) and y_test (n) as little-endian float32.
+    
+    With ?stream=1 the response is NDJSON: one record per EVAL_STREAM_CHUNK
+    rows ({start, predictions, interpretation, risk}), then the metrics summary.
     """
     if glucose_model is None:
-        return jsonify({'error': 'Model not initialized'}), 500
+        return _json({'error': 'Model not initialized'}, 500)
     
     if not glucose_model.is_trained:
-        return jsonify({'error': 'Model not trained'}), 400
+        return _json({'error': 'Model not trained'}, 400)
     
     try:
-        data = request.get_json()
-        
-        # Use synthetic test data if requested
-        if data.get('use_synthetic', False):
-            _, X_test = generate_synthetic_training_data(n_samples=200)
-            _, y_test = generate_synthetic_training_data(n_samples=200)
-            # Get second return value
-            X_test, _ = generate_synthetic_training_data(n_samples=200)
-            _, y_test = generate_synthetic_training_data(n_samples=200)
+        if request.mimetype == 'application/octet-stream':
+            try:
+                X_test, y_test = _parse_binary_evaluation(
+                    request.get_data(cache=False), glucose_model.sequence_length, glucose_model.feature_dim
+                )
+            except ValueError as e:
+                return _json({'error': str(e)}, 400)
+            if len(X_test) == 0:
+                return _json({'error': 'No test data provided'}, 400)
         else:
-            X_test = np.array(data.get('X_test', []))
-            y_test = np.array(data.get('y_test', []))
+            data = request.get_json()
             
-            if len(X_test) == 0 or len(y_test) == 0:
-                return jsonify({'error': 'No test data provided'}), 400
+            # Use synthetic test data if requested
+            if data.get('use_synthetic', False):
+                # The generator is seeded, so one call yields the matching (X, y) pair
+                X_test, y_test = generate_synthetic_training_data(n_samples=200)
+            else:
+                X_test = np.array(data.get('X_test', []))
+                y_test = np.array(data.get('y_test', []))
+                
+                if len(X_test) == 0 or len(y_test) == 0:
+                    return _json({'error': 'No test data provided'}, 400)
+        
+        # Caught here, before a streamed response has sent its 200 and first records
+        if X_test.ndim != 3 or len(y_test) != len(X_test):
+            return _json({
+                'error': f"X_test must be (n, seq_len, n_features) with one y_test value per sequence; "
+                         f"got X_test {X_test.shape} and {len(y_test)} targets"
+            }, 400)
+        
+        if request.args.get('stream') == '1':
+            return Response(
+                _stream_evaluation(X_test, y_test),
+                mimetype='application/x-ndjson',
+                direct_passthrough=True
+            )
         
         # Evaluate
-        metrics = glucose_model.evaluate(X_test, y_test)
+        y_pred = np.asarray(glucose_model.predict(X_test, return_confidence=False)['predictions'])
+        metrics = glucose_model.evaluate(X_test, y_test, y_pred=y_pred)
         
-        return jsonify({
+        return _json({
             'status': 'success',
             'metrics': metrics,
-            'interpretation': {
-                'rmse_interpretation': f"Average prediction error: ±{metrics['rmse']:.2f} mg/dL",
-                'r2_interpretation': f"Model explains {metrics['r2_score']*100:.1f}% of variance",
-                'mape_interpretation': f"Average percentage error: {metrics['mape']:.2f}%"
-            },
-            'timestamp': datetime.now().isoformat()
-        }), 200
+            'per_sample_interpretation': _interpret_glucose_levels(y_pred).tolist(),
+            'per_sample_risk': _assess_glucose_risks(y_pred).tolist(),
+            'interpretation': _metrics_interpretation(metrics),
+            'timestamp': _now_iso()
+        }, 200)
         
     except Exception as e:
         logger.error(f"Evaluation error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, 500)
+
+
+def _model_info_body() -> dict:
+    """Full /model-info body; only built when the client's ETag is stale"""
+    info = _model_info_base.copy()
+    info['training_status'] = {
+        'is_trained': glucose_model.is_trained,
+        'training_history_length': len(glucose_model.training_history),
+        'model_path': MODEL_PATH
+    }
+    info['runtime'] = {
+        'backend': _inference_backend,
+        'tflite_threads': TFLITE_THREADS
+    }
+    return info
 
 
 @glucose_bp.route('/model-info', methods=['GET'])
 def get_model_info():
     """Get detailed model information and configuration"""
     if glucose_model is None:
-        return jsonify({'error': 'Model not initialized'}), 500
+        return _json({'error': 'Model not initialized'}, 500)
     
-    info = {
-        'model_type': 'LSTM (Long Short-Term Memory)',
-        'architecture': {
-            'sequence_length': glucose_model.sequence_length,
-            'input_features': glucose_model.feature_dim,
-            'lstm_layers': 3,
-            'dense_layers': 2,
-            'output_units': 1
-        },
-        'hyperparameters': {
-            'optimizer': 'Adam',
-            'learning_rate': 0.001,
-            'loss_function': 'Mean Absolute Error',
-            'dropout_rate': 0.2
-        },
-        'training_status': {
-            'is_trained': glucose_model.is_trained,
-            'training_history_length': len(glucose_model.training_history),
-            'model_path': MODEL_PATH
-        },
-        'input_features': glucose_model.get_feature_names(),
-        'output': {
-            'type': 'Glucose Level Prediction',
-            'unit': 'mg/dL',
-            'typical_range': [70, 200]
-        }
-    }
-    
-    return jsonify(info), 200
+    # Pollers revalidate with If-None-Match and get an empty 304 while the model is
+    # unchanged, before any of the body is built. The ETag follows the model only,
+    # so it is stable across requests and across workers serving the same file.
+    etag = _model_info_etag()
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = _json(_model_info_body(), 200)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# Lower bounds of each band after the first, for np.searchsorted(side='right')
+# over many values at once; must agree with the ladders below.
+_INTERP_BINS = np.array([70, 100, 140, 200], dtype=np.float64)
+_INTERP_LABELS = np.array(['Hypoglycemic', 'Normal (Fasting)', 'Elevated', 'High', 'Critical'])
+_RISK_BINS = np.array([54, 70, 100, 140, 180, 250], dtype=np.float64)
+_RISK_LABELS = np.array([
+    'CRITICAL_LOW', 'HIGH_RISK_LOW', 'LOW_RISK', 'NORMAL', 'MODERATE_RISK', 'HIGH_RISK', 'CRITICAL_HIGH'
+])
+
+
+def _interpret_glucose_levels(glucose_values) -> np.ndarray:
+    """_interpret_glucose_level over an array of values"""
+    return _INTERP_LABELS[np.searchsorted(_INTERP_BINS, np.atleast_1d(glucose_values), side='right')]
+
+
+def _assess_glucose_risks(glucose_values) -> np.ndarray:
+    """_assess_glucose_risk over an array of values"""
+    return _RISK_LABELS[np.searchsorted(_RISK_BINS, np.atleast_1d(glucose_values), side='right')]
 
 
 def _interpret_glucose_level(glucose_value: float) -> str:
@@ -35,16 +35,20 @@ class ImprovedExplainabilityService:
         'medication_taken': '--'    # Medication lowers glucose
     }
     
-    def __init__(self, model, scaler):
+    def __init__(self, model, scaler, predict_batch_fn=None):
         """
         Initialize explainability service
         
         Args:
             model: Trained glucose prediction model
             scaler: Feature scaler instance
+            predict_batch_fn: Optional forward pass mapping scaled (B, T, F) inputs to
+                (B,) normalized outputs (e.g. the API's traced/batched function);
+                defaults to model.model.predict
         """
         self.model = model
         self.scaler = scaler
+        self.predict_batch_fn = predict_batch_fn
         self.feature_names = scaler.get_feature_names()
     
     def explain_prediction(
@@ -342,20 +346,28 @@ class ImprovedExplainabilityService:
 
         return out
 
-    def _predict_absolute_glucose_mg_dl(self, features_dict) -> float:
-        """Predict absolute post-meal glucose (mg/dL) using the underlying Keras model.
+    def _predict_absolute_glucose_mg_dl_batch(self, features_list) -> np.ndarray:
+        """Predict absolute post-meal glucose (mg/dL) for several inputs in one forward pass.
 
         This always applies the global feature scaler and never passes raw values into the model.
         """
         if self.model is None or getattr(self.model, 'model', None) is None:
             raise RuntimeError("Model not available for model-faithful explainability")
 
-        scaled = self.scaler.scale_features(features_dict)
-        sequence = np.tile(scaled, (self.model.sequence_length, 1))
-        sequence = np.expand_dims(sequence, axis=0)
+        scaled = np.stack([self.scaler.scale_features(f) for f in features_list])
+        sequences = np.broadcast_to(
+            scaled[:, None, :], (len(features_list), self.model.sequence_length, scaled.shape[-1])
+        )
+
+        if self.predict_batch_fn is not None:
+            y_pred_normalized = self.predict_batch_fn(sequences)
+        else:
+            y_pred_normalized = self.model.model.predict(sequences, verbose=0)[:, 0]
+        return self.scaler.inverse_scale_glucose_batch(y_pred_normalized)
 
-        y_pred_normalized = self.model.model.predict(sequence, verbose=0)
-        return float(self.scaler.inverse_scale_glucose(y_pred_normalized[0][0]))
+    def _predict_absolute_glucose_mg_dl(self, features_dict) -> float:
+        """Predict absolute post-meal glucose (mg/dL) using the underlying Keras model."""
+        return float(self._predict_absolute_glucose_mg_dl_batch([features_dict])[0])
 
     def _calculate_model_faithful_contributions(
         self,
@@ -392,6 +404,8 @@ class ImprovedExplainabilityService:
             # grams
             return max(1.0, abs(value) * 0.1)
 
+        # All +/- perturbations, in feature order, go through one forward pass
+        perturbed = []
         for feature_name in self.feature_names:
             original_value = float(features_dict.get(feature_name, 0.0))
             p = _perturb_amount(feature_name, original_value)
@@ -400,13 +414,18 @@ class ImprovedExplainabilityService:
             neg = dict(features_dict)
             pos[feature_name] = original_value + p
             neg[feature_name] = original_value - p
+            perturbed.append(pos)
+            perturbed.append(neg)
 
-            # Predict absolute glucose, convert to delta vs ORIGINAL baseline.
-            try:
-                pos_abs = self._predict_absolute_glucose_mg_dl(pos)
-                neg_abs = self._predict_absolute_glucose_mg_dl(neg)
-            except Exception as e:
-                logger.warning(f"Perturbation failed for {feature_name}: {e}")
+        try:
+            perturbed_abs = self._predict_absolute_glucose_mg_dl_batch(perturbed).tolist()
+        except Exception as e:
+            logger.warning(f"Perturbation forward pass failed: {e}")
+            perturbed_abs = None
+
+        for i, feature_name in enumerate(self.feature_names):
+            original_value = float(features_dict.get(feature_name, 0.0))
+            if perturbed_abs is None:
                 raw_contrib_values[feature_name] = 0.0
                 base_contribs[feature_name] = {
                     'value': original_value,
@@ -416,6 +435,9 @@ class ImprovedExplainabilityService:
                 }
                 continue
 
+            # Predict absolute glucose, convert to delta vs ORIGINAL baseline.
+            pos_abs = perturbed_abs[2 * i]
+            neg_abs = perturbed_abs[2 * i + 1]
             pos_delta = float(pos_abs - baseline_glucose)
             neg_delta = float(neg_abs - baseline_glucose)
 
@@ -831,9 +853,9 @@ class ImprovedExplainabilityService:
 # Global instance
 _explainability_service = None
 
-def get_explainability_service(model=None, scaler=None):
+def get_explainability_service(model=None, scaler=None, predict_batch_fn=None):
     """Get or create global explainability service"""
     global _explainability_service
     if _explainability_service is None and model is not None and scaler is not None:
-        _explainability_service = ImprovedExplainabilityService(model, scaler)
+        _explainability_service = ImprovedExplainabilityService(model, scaler, predict_batch_fn)
     return _explainability_service
@@ -12,7 +12,6 @@ from datetime import datetime, timedelta
 import json
 import os
 from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
 # Try to import TensorFlow/Keras, with fallback for environments without GPU
 try:
@@ -26,11 +25,59 @@ except ImportError:
     TENSORFLOW_AVAILABLE = False
     logging.warning("TensorFlow not available - using simulated model")
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Import improved feature scaler
 from feature_scaler import get_global_scaler
 
 logger = logging.getLogger(__name__)
 
+
+def _regression_metrics_py(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[float, float, float, float]:
+    """(mse, mae, mape, r2) of two equal-length float64 vectors, errors in one fused loop.
+
+    Matches the sklearn metrics used before, including r2 = 1.0 / 0.0 for
+    a constant y_true and NaN for fewer than two samples. A zero target
+    makes mape inf (NaN if that sample is also predicted exactly), as the
+    numpy expression did; the division is guarded because numba's Python
+    error model would raise ZeroDivisionError instead.
+    """
+    n = y_true.shape[0]
+    mean_true = 0.0
+    for i in range(n):
+        mean_true += y_true[i]
+    mean_true /= n
+    sse = 0.0
+    sae = 0.0
+    sape = 0.0
+    sst = 0.0
+    for i in range(n):
+        err = y_true[i] - y_pred[i]
+        sse += err * err
+        sae += abs(err)
+        if y_true[i] != 0.0:
+            sape += abs(err / y_true[i])
+        elif err != 0.0:
+            sape += np.inf
+        else:
+            sape += np.nan
+        dev = y_true[i] - mean_true
+        sst += dev * dev
+    if n < 2:
+        r2 = np.nan
+    elif sst == 0.0:
+        r2 = 1.0 if sse == 0.0 else 0.0
+    else:
+        r2 = 1.0 - sse / sst
+    return sse / n, sae / n, sape / n * 100.0, r2
+
+
+_regression_metrics = njit(cache=True)(_regression_metrics_py) if NUMBA_AVAILABLE else _regression_metrics_py
+
 class GlucoseLSTMModel:
     """
     LSTM-based model for glucose prediction
@@ -275,13 +322,15 @@ class GlucoseLSTMModel:
     
     def evaluate(self, 
                  X_test: np.ndarray, 
-                 y_test: np.ndarray) -> Dict:
+                 y_test: np.ndarray,
+                 y_pred: np.ndarray = None) -> Dict:
         """
         Evaluate model on test data
         
         Args:
             X_test: Test sequences
             y_test: Test glucose values
+            y_pred: Predictions for X_test if the caller already has them
             
         Returns:
             Dictionary with performance metrics
@@ -291,17 +340,18 @@ class GlucoseLSTMModel:
             return {}
         
         # Make predictions
-        predictions = self.predict(X_test, return_confidence=False)
-        y_pred = np.array(predictions['predictions'])
+        if y_pred is None:
+            predictions = self.predict(X_test, return_confidence=False)
+            y_pred = np.array(predictions['predictions'])
         
-        # Calculate metrics
-        mse = mean_squared_error(y_test, y_pred)
-        mae = mean_absolute_error(y_test, y_pred)
-        rmse = np.sqrt(mse)
-        r2 = r2_score(y_test, y_pred)
+        y_true = np.ascontiguousarray(y_test, dtype=np.float64).ravel()
+        y_hat = np.ascontiguousarray(y_pred, dtype=np.float64).ravel()
+        if y_true.shape != y_hat.shape or len(y_true) == 0:
+            raise ValueError(f"Cannot evaluate {len(y_hat)} predictions against {len(y_true)} targets")
         
-        # MAPE (Mean Absolute Percentage Error)
-        mape = np.mean(np.abs((y_test - y_pred) / y_test)) * 100
+        # MSE, MAE, MAPE (Mean Absolute Percentage Error) and R² in one pass
+        mse, mae, mape, r2 = _regression_metrics(y_true, y_hat)
+        rmse = np.sqrt(mse)
         
         return {
             'mse': float(mse),
@@ -377,7 +427,8 @@ class GlucoseLSTMModel:
             )
             
             # PHYSIOLOGICAL CONSTRAINT: Delta must be in [0, +150] mg/dL (post-meal)
-            delta_glucose = np.clip(delta_glucose, 0, 150)
+            # (scalar min/max: np.clip on a Python float pays for a full ufunc dispatch)
+            delta_glucose = min(max(delta_glucose, 0.0), 150.0)
             
             # Final glucose = baseline + delta
             final_glucose = baseline + delta_glucose
@@ -388,7 +439,7 @@ class GlucoseLSTMModel:
                 delta_glucose = final_glucose - baseline
             
             # CONSTRAINT: Final must be in [70, 450] mg/dL
-            final_glucose = np.clip(final_glucose, 70, 450)
+            final_glucose = min(max(final_glucose, 70.0), 450.0)
             
             # Return both delta and final
             predictions = [final_glucose]
@@ -443,6 +494,74 @@ class GlucoseLSTMModel:
             logger.error(f"Error loading model: {e}")
             return False
     
+    def export_tflite_int8(self, filepath: str, representative_data: np.ndarray = None) -> bool:
+        """
+        Export the model as an INT8-quantized TFLite file for CPU serving
+        
+        Args:
+            filepath: Destination .tflite path (LSTM_MODEL_INT8_PATH in glucose_api)
+            representative_data: Scaled (N, T, F) inputs used to calibrate the
+                activation ranges; defaults to uniform samples over the scaled [0, 1] range
+        """
+        if not TENSORFLOW_AVAILABLE or self.model is None:
+            logger.error("Cannot export - model not available")
+            return False
+        
+        if representative_data is None:
+            rng = np.random.default_rng(0)
+            representative_data = rng.random((200, self.sequence_length, self.feature_dim))
+        samples = np.asarray(representative_data, dtype=np.float32)
+        
+        def representative_dataset():
+            for sample in samples:
+                yield [sample[None, ...]]
+        
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = representative_dataset
+            # INT8 kernels wherever they exist; float input/output so callers pass scaled features as-is
+            converter.target_spec.supported_ops = [
+                tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+                tf.lite.OpsSet.TFLITE_BUILTINS
+            ]
+            tflite_model = converter.convert()
+            
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            with open(filepath, 'wb') as f:
+                f.write(tflite_model)
+            logger.info(f"INT8 model exported to {filepath}")
+            return True
+        except Exception as e:
+            logger.error(f"Error exporting INT8 model: {e}")
+            return False
+    
+    def export_tflite_fp16(self, filepath: str) -> bool:
+        """
+        Export the model as a float16-quantized TFLite file for CPU serving
+        
+        Args:
+            filepath: Destination .tflite path (LSTM_MODEL_FP16_PATH in glucose_api)
+        """
+        if not TENSORFLOW_AVAILABLE or self.model is None:
+            logger.error("Cannot export - model not available")
+            return False
+        
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+            tflite_model = converter.convert()
+            
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            with open(filepath, 'wb') as f:
+                f.write(tflite_model)
+            logger.info(f"FP16 model exported to {filepath}")
+            return True
+        except Exception as e:
+            logger.error(f"Error exporting FP16 model: {e}")
+            return False
+    
     def get_feature_names(self) -> List[str]:
         """Return list of input feature names"""
         return [
@@ -1,6 +1,15 @@
 #!/usr/bin/env python3
 """
 Run the Glucose Prediction Flask API Server
+
+Development:  python run_api.py
+Production:   gunicorn -w 4 -b 0.0.0.0:5001 run_api:app
+ASGI/uvloop:  gunicorn -k uvicorn.workers.UvicornWorker -w 4 -b 0.0.0.0:5001 run_api:asgi_app
+
+Models are built at import time, so each gunicorn worker loads its own. Add
+--preload only when TensorFlow is not installed: the glucose model would
+otherwise initialize TensorFlow in the master, and its CUDA context and
+thread pools don't survive the fork into the workers.
 """
 
 import sys
@@ -33,6 +42,17 @@ try:
     app = Flask(__name__)
     CORS(app)  # Enable CORS for frontend access
 
+    # Compress JSON responses (fusion results carry 2-8 KB of driver analysis);
+    # brotli level 4 costs well under a millisecond at these sizes
+    try:
+        from flask_compress import Compress
+        app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+        app.config['COMPRESS_BR_LEVEL'] = 4
+        app.config['COMPRESS_MIN_SIZE'] = 512
+        Compress(app)
+    except ImportError:
+        logger.info("flask-compress not installed; responses are sent uncompressed")
+
     # Register the glucose prediction blueprint
     app.register_blueprint(glucose_bp, url_prefix='/api/glucose-prediction')
     # Register blood pressure prediction blueprint
@@ -109,6 +129,30 @@ try:
     else:
         logger.error("Failed to initialize model!")
     
+    # ASGI entry point: gunicorn -k uvicorn.workers.UvicornWorker run_api:asgi_app
+    # a2wsgi runs the sync Flask handlers on a per-worker pool of ASGI_THREADS
+    # threads while uvloop handles socket I/O. (asgiref's WsgiToAsgi would put
+    # every request of a worker on one shared thread, serializing them and
+    # leaving the request batchers nothing to coalesce.) The handlers are
+    # CPU-bound with no outbound calls, so async views (or Quart) would add an
+    # event-loop hop per request without freeing anything; scale with -w.
+    try:
+        from a2wsgi import WSGIMiddleware
+        asgi_app = WSGIMiddleware(app, workers=int(os.environ.get('ASGI_THREADS', '8')))
+    except ImportError:
+        asgi_app = None
+
+except Exception as e:
+    logger.error(f"Failed to start API server: {type(e).__name__}: {e}", exc_info=True)
+    sys.exit(1)
+    
+except ImportError as e:
+    logger.error(f"Import error: {e}")
+    logger.error("Make sure all dependencies are installed: pip install -r requirements.txt")
+    sys.exit(1)
+
+
+if __name__ == '__main__':
     logger.info("API available at: http://localhost:5001/api/glucose-prediction/")
     logger.info("Health check at: http://localhost:5001/health")
     logger.info("")
@@ -129,12 +173,3 @@ try:
         debug=False,  # Disable debug mode to prevent reloader issues
         use_reloader=False  # Set to False to avoid TensorFlow re-initialization
     )
-    
-except Exception as e:
-    logger.error(f"Failed to start API server: {type(e).__name__}: {e}", exc_info=True)
-    sys.exit(1)
-    
-except ImportError as e:
-    logger.error(f"Import error: {e}")
-    logger.error("Make sure all dependencies are installed: pip install -r requirements.txt")
-    sys.exit(1)
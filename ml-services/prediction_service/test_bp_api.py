@@ -14,6 +14,9 @@ class BPApiTest(unittest.TestCase):
     def test_health(self):
         r = self.app.get('/api/blood-pressure/health')
         self.assertEqual(r.status_code, 200)
+        data = json.loads(r.data)
+        self.assertTrue(data['model_available'])
+        self.assertIn('timestamp', data)
 
     def test_predict_high_sodium_raises(self):
         payload = {
@@ -61,5 +64,55 @@ class BPApiTest(unittest.TestCase):
         ds2 = float(d2.split('/')[0])
         self.assertLessEqual(ds2, ds1)
 
+    def test_repeated_predict_hits_core_cache(self):
+        from bp_prediction_model import _bp_core_cached
+        payload = {
+            'sodium_mg': 2900, 'stress_level': 0.5, 'activity_level': 0.1,
+            'age': 50, 'weight_kg': 82, 'caffeine_mg': 120, 'sleep_quality': 0.6,
+            'hydration_level': 0.4, 'medication_taken': 0, 'baseline_systolic': 128,
+            'baseline_diastolic': 84, 'time_since_last_meal': 1.5
+        }
+        r1 = self.app.post('/api/blood-pressure/predict', data=json.dumps(payload), content_type='application/json')
+        hits = _bp_core_cached.cache_info().hits
+        r2 = self.app.post('/api/blood-pressure/predict', data=json.dumps(payload), content_type='application/json')
+        self.assertEqual(_bp_core_cached.cache_info().hits, hits + 1)
+        self.assertEqual(json.loads(r1.data)['prediction'], json.loads(r2.data)['prediction'])
+
+    def test_explain_matches_cached_prediction(self):
+        payload = {
+            'sodium_mg': 3500, 'stress_level': 0.7, 'activity_level': 0.1,
+            'age': 60, 'weight_kg': 90, 'caffeine_mg': 200, 'sleep_quality': 0.5,
+            'hydration_level': 0.4, 'medication_taken': 0, 'baseline_systolic': 130,
+            'baseline_diastolic': 85, 'time_since_last_meal': 1.0
+        }
+        r = self.app.post('/api/blood-pressure/predict', data=json.dumps(payload), content_type='application/json')
+        self.assertEqual(r.status_code, 200)
+        r = self.app.post('/api/blood-pressure/explain', data=json.dumps({'features': payload}),
+                          content_type='application/json')
+        self.assertEqual(r.status_code, 200)
+        expl = json.loads(r.data)['explainability']
+        features = [c['feature'] for c in expl['systolic_contributions']]
+        self.assertEqual(set(features), {'sodium_mg', 'stress_level', 'caffeine_mg', 'age'})
+        self.assertAlmostEqual(expl['sum_systolic'], sum(c['impact'] for c in expl['systolic_contributions']), places=1)
+        impacts = [abs(c['impact']) for c in expl['systolic_contributions']]
+        self.assertEqual(impacts, sorted(impacts, reverse=True))
+
+    def test_explain_without_prior_predict_refinalizes(self):
+        import bp_api
+        payload = {
+            'sodium_mg': 1200, 'stress_level': 0.2, 'activity_level': 0.8,
+            'age': 35, 'weight_kg': 70, 'caffeine_mg': 0, 'sleep_quality': 0.9,
+            'hydration_level': 0.8, 'medication_taken': 1, 'baseline_systolic': 135,
+            'baseline_diastolic': 88, 'time_since_last_meal': 3.0
+        }
+        bp_api._bp_prediction_cache.clear()
+        r = self.app.post('/api/blood-pressure/explain', data=json.dumps({'features': payload}),
+                          content_type='application/json')
+        self.assertEqual(r.status_code, 200)
+        explained = json.loads(r.data)
+        r = self.app.post('/api/blood-pressure/predict', data=json.dumps(payload), content_type='application/json')
+        pred = json.loads(r.data)['prediction']
+        self.assertEqual(explained['predicted'], f"{pred['systolic']}/{pred['diastolic']}")
+
 if __name__ == '__main__':
     unittest.main()
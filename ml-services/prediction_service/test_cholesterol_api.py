@@ -307,6 +307,144 @@ def test_explainability_sum_to_delta(cholesterol_model, baseline_features):
     print(f"✅ Explainability validated: LDL sum={ldl_contrib_sum:.2f} (delta={delta_ldl:.2f}), HDL sum={hdl_contrib_sum:.2f} (delta={delta_hdl:.2f})")
 
 
+def test_input_validation(baseline_features):
+    """Test presence and range validation of API inputs"""
+    from cholesterol_api import _validate_cholesterol_inputs
+    
+    assert _validate_cholesterol_inputs(baseline_features) == (True, None)
+    
+    incomplete = {k: v for k, v in baseline_features.items() if k not in ('fiber_g', 'baseline_hdl')}
+    is_valid, error = _validate_cholesterol_inputs(incomplete)
+    assert not is_valid
+    assert error == "Missing required fields: fiber_g, baseline_hdl"
+    
+    out_of_range = dict(baseline_features, age=12)
+    is_valid, error = _validate_cholesterol_inputs(out_of_range)
+    assert not is_valid
+    assert error.startswith("Age must be between")
+    
+    not_numeric = dict(baseline_features, sugar_g='lots')
+    assert _validate_cholesterol_inputs(not_numeric) == (False, "Sugar must be a valid number")
+
+
+def test_predict_batch_matches_single(cholesterol_model, baseline_features):
+    """Test the vectorized batch path agrees with per-request predictions"""
+    rows = [
+        baseline_features,
+        dict(baseline_features, saturated_fat_g=60.0, trans_fat_g=6.0, baseline_ldl=150.0),
+        dict(baseline_features, fiber_g=50.0, activity_level=1.0, sleep_quality=1.0),
+        dict(baseline_features, baseline_ldl=200.0, baseline_hdl=30.0, sugar_g=150.0),
+        dict(baseline_features, saturated_fat_g=3.0, trans_fat_g=0.0),
+    ]
+    assert cholesterol_model.predict_batch(rows) == [cholesterol_model.predict(r) for r in rows]
+
+
+def test_predict_full_matches_separate_calls(cholesterol_model, baseline_features):
+    """Test the fused predict_full agrees with predict + derived metrics + explainability"""
+    from cholesterol_api import _calculate_derived_metrics, _generate_explainability
+    
+    features = dict(baseline_features, saturated_fat_g=25.0, fiber_g=12.0, stress_level=0.6)
+    result = cholesterol_model.predict_full(features)
+    pred = cholesterol_model.predict(features)
+    
+    assert result['prediction'] == pred
+    assert result['derived_metrics'] == _calculate_derived_metrics(features, pred)
+    assert result['explainability'] == _generate_explainability(features, pred)
+
+
+def test_batched_predictor(cholesterol_model, baseline_features):
+    """Test concurrent callers of the dynamic batcher get their own results"""
+    from concurrent.futures import ThreadPoolExecutor
+    from cholesterol_prediction_model import BatchedCholesterolPredictor
+    
+    batcher = BatchedCholesterolPredictor(cholesterol_model, max_batch_size=8, max_wait_ms=20.0)
+    rows = [dict(baseline_features, saturated_fat_g=float(i)) for i in range(20)]
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(pool.map(batcher.predict, rows))
+    assert results == [cholesterol_model.predict(r) for r in rows]
+
+
+def test_synthetic_data_matches_model(cholesterol_model):
+    """Test synthetic targets are the deterministic model's deltas"""
+    from cholesterol_prediction_model import generate_synthetic_cholesterol_data
+    
+    X, y = generate_synthetic_cholesterol_data(n_samples=50)
+    assert X.shape == (50, 30, 14)
+    assert y.shape == (50, 2)
+    names = cholesterol_model.get_feature_names()
+    for i in range(0, 50, 7):
+        pred = cholesterol_model.predict(dict(zip(names, X[i, -1])))
+        assert y[i].tolist() == pytest.approx([pred['delta_ldl'], pred['delta_hdl']], abs=0.11)
+
+
+@pytest.fixture
+def client():
+    """Flask test client with the cholesterol blueprint registered"""
+    from flask import Flask
+    from cholesterol_api import cholesterol_bp, init_cholesterol_model
+    
+    init_cholesterol_model()
+    app = Flask(__name__)
+    app.register_blueprint(cholesterol_bp, url_prefix='/api/cholesterol')
+    return app.test_client()
+
+
+def test_static_endpoints(client):
+    """Test /health and /features serve their precomputed bodies"""
+    r = client.get('/api/cholesterol/health')
+    assert r.status_code == 200
+    assert r.get_json()['status'] == 'healthy'
+    
+    r = client.get('/api/cholesterol/features')
+    assert r.status_code == 200
+    assert r.mimetype == 'application/json'
+    body = r.get_json()
+    assert body['feature_count'] == 14
+    assert [f['name'] for f in body['features']] == CholesterolLSTMModel().get_feature_names()
+
+
+def test_predict_and_explain_endpoints(client, baseline_features):
+    """Test /predict and /explain responses and validation errors"""
+    r = client.post('/api/cholesterol/predict', json=baseline_features)
+    assert r.status_code == 200
+    body = r.get_json()
+    assert body['status'] == 'success'
+    assert set(body['prediction']) >= {'ldl', 'hdl', 'total_cholesterol', 'risk_level', 'confidence'}
+    assert len(body['explainability']['ldl_drivers']) == 8
+    
+    r = client.post('/api/cholesterol/explain', json=baseline_features)
+    assert r.status_code == 200
+    assert r.get_json()['prediction_summary']['delta_ldl'] == body['prediction']['delta_ldl']
+    
+    r = client.post('/api/cholesterol/predict', json=dict(baseline_features, fiber_g=-1))
+    assert r.status_code == 400
+    assert r.get_json()['status'] == 'validation_error'
+    
+    for endpoint in ('/api/cholesterol/predict', '/api/cholesterol/explain'):
+        r = client.post(endpoint, data=b'{not json', content_type='application/json')
+        assert r.status_code == 400
+        assert r.get_json()['status'] == 'validation_error'
+
+
+
+def test_batcher_timeout_returns_503(client, baseline_features, monkeypatch):
+    """Test a dynamic batcher that doesn't answer in time gives 503, not 500"""
+    import time
+    import cholesterol_api
+    from cholesterol_prediction_model import BatchedCholesterolPredictor
+    
+    class SlowModel:
+        def predict_batch(self, rows):
+            time.sleep(1.5)
+            return [{} for _ in rows]
+    
+    monkeypatch.setattr(cholesterol_api, 'cholesterol_batcher', BatchedCholesterolPredictor(SlowModel()))
+    for endpoint in ('/api/cholesterol/predict', '/api/cholesterol/explain'):
+        r = client.post(endpoint, json=baseline_features)
+        assert r.status_code == 503
+        assert r.get_json()['status'] == 'service_unavailable'
+
+
 if __name__ == '__main__':
     # Run tests with verbose output
     pytest.main([__file__, '-v', '--tb=short'])
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Route tests for the glucose prediction API (Flask test client)
+"""
+
+import json
+import os
+import signal
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def client():
+    """Flask test client with the glucose blueprint registered"""
+    from flask import Flask
+    from glucose_api import register_glucose_endpoints
+
+    app = Flask(__name__)
+    register_glucose_endpoints(app)
+    return app.test_client()
+
+
+@pytest.fixture
+def evaluating_client(client, monkeypatch):
+    """Client whose model /evaluate accepts (scored by the deterministic predictor)"""
+    import glucose_api
+    import lstm_glucose_model
+
+    monkeypatch.setattr(lstm_glucose_model, 'TENSORFLOW_AVAILABLE', True)
+    monkeypatch.setattr(glucose_api.glucose_model, 'is_trained', True)
+    if glucose_api.glucose_model.model is None:
+        monkeypatch.setattr(glucose_api.glucose_model, 'model', object())
+    return client
+
+
+@pytest.fixture
+def synthetic_set():
+    """Synthetic (X_test, y_test) as little-endian float32"""
+    from lstm_glucose_model import generate_synthetic_training_data
+
+    X, y = generate_synthetic_training_data(n_samples=300)
+    return X.astype('<f4'), y.astype('<f4')
+
+
+def _binary_body(X, y, header=None):
+    from glucose_api import _EVAL_HEADER
+    return _EVAL_HEADER.pack(*(header or X.shape)) + X.tobytes() + y.tobytes()
+
+
+def test_predict_then_explain_shap(client):
+    """Test /predict is repeatable and /explain/shap reuses its finalized values"""
+    payload = {'meal_features': {'carbohydrates': 60, 'fiber': 5, 'sugar': 20}}
+    r1 = client.post('/api/glucose-prediction/predict', json=payload)
+    r2 = client.post('/api/glucose-prediction/predict', json=payload)
+    assert r1.status_code == r2.status_code == 200
+    assert r1.get_json()['prediction'] == r2.get_json()['prediction']
+
+    r = client.post('/api/glucose-prediction/explain/shap', json=payload)
+    assert r.status_code == 200
+
+    r = client.post('/api/glucose-prediction/predict', json={})
+    assert r.status_code == 400
+
+
+def test_confidence_table_matches_ladder():
+    """Test every _CONF_TABLE entry equals the calibrated ladder for its flags"""
+    from glucose_api import _CONF_TABLE, _confidence_from_flags
+
+    for constraints in (False, True):
+        for sanity_failed in (False, True):
+            for invalid in (False, True):
+                idx = (constraints << 2) | (sanity_failed << 1) | invalid
+                assert _CONF_TABLE[idx] == _confidence_from_flags(constraints, sanity_failed, invalid)
+    assert _CONF_TABLE[0] == 0.85
+    assert min(_CONF_TABLE) == 0.60
+
+
+def test_regression_metrics_match_sklearn():
+    """Test the fused metrics kernel against sklearn"""
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+    from lstm_glucose_model import _regression_metrics
+
+    rng = np.random.default_rng(0)
+    y_true = rng.uniform(60, 250, 500)
+    y_pred = y_true + rng.normal(0, 12, 500)
+    mse, mae, mape, r2 = _regression_metrics(y_true, y_pred)
+    assert mse == pytest.approx(mean_squared_error(y_true, y_pred), rel=1e-12)
+    assert mae == pytest.approx(mean_absolute_error(y_true, y_pred), rel=1e-12)
+    assert r2 == pytest.approx(r2_score(y_true, y_pred), rel=1e-12)
+    assert mape == pytest.approx(np.mean(np.abs((y_true - y_pred) / y_true)) * 100, rel=1e-12)
+
+    # A zero target is inf MAPE (as numpy gave), not a ZeroDivisionError
+    y_true[7] = 0.0
+    mse, mae, mape, r2 = _regression_metrics(y_true, y_pred)
+    assert mape == np.inf
+    assert mse == pytest.approx(mean_squared_error(y_true, y_pred), rel=1e-12)
+    assert r2 == pytest.approx(r2_score(y_true, y_pred), rel=1e-12)
+    y_pred[7] = 0.0
+    assert np.isnan(_regression_metrics(y_true, y_pred)[2])
+
+
+def test_evaluate_binary_matches_json(evaluating_client, synthetic_set):
+    """Test a raw float32 /evaluate body scores the same as the JSON body"""
+    X, y = synthetic_set
+    url = '/api/glucose-prediction/evaluate'
+    r_json = evaluating_client.post(url, json={'X_test': X.tolist(), 'y_test': y.tolist()})
+    r_bin = evaluating_client.post(url, data=_binary_body(X, y), content_type='application/octet-stream')
+    assert r_json.status_code == r_bin.status_code == 200
+
+    a, b = r_json.get_json(), r_bin.get_json()
+    assert b['per_sample_risk'] == a['per_sample_risk']
+    assert b['per_sample_interpretation'] == a['per_sample_interpretation']
+    assert b['metrics']['n_test_samples'] == len(X)
+    for key in ('rmse', 'mae', 'mape', 'r2_score'):
+        assert b['metrics'][key] == pytest.approx(a['metrics'][key], rel=1e-6)
+
+
+def test_evaluate_rejects_malformed_binary(evaluating_client, synthetic_set):
+    """Test malformed binary /evaluate bodies are 400s, not 500s"""
+    X, y = synthetic_set
+    url = '/api/glucose-prediction/evaluate'
+    wrong_window = np.ones((3, 24, 10), '<f4')
+    bodies = [
+        b'\x01\x02',                                       # shorter than the header
+        _binary_body(X, y)[:-4],                           # truncated y_test
+        _binary_body(X, y) + b'\x00' * 4,                  # trailing bytes
+        _binary_body(wrong_window, y[:3]),                 # window doesn't match the model
+        _binary_body(X[:0], y[:0]),                        # no rows
+    ]
+    for body in bodies:
+        r = evaluating_client.post(url, data=body, content_type='application/octet-stream')
+        assert r.status_code == 400
+        assert 'error' in r.get_json()
+
+
+def test_evaluate_stream_framing(evaluating_client, synthetic_set, monkeypatch):
+    """Test ?stream=1 writes one NDJSON record per chunk, then the summary"""
+    import glucose_api
+    monkeypatch.setattr(glucose_api, 'EVAL_STREAM_CHUNK', 128)
+
+    X, y = synthetic_set
+    url = '/api/glucose-prediction/evaluate'
+    r = evaluating_client.post(url + '?stream=1', data=_binary_body(X, y), content_type='application/octet-stream')
+    assert r.status_code == 200
+    assert r.mimetype == 'application/x-ndjson'
+    assert r.data.endswith(b'\n')
+
+    records = [json.loads(line) for line in r.data.splitlines()]
+    chunks, summary = records[:-1], records[-1]
+    assert [c['start'] for c in chunks] == [0, 128, 256]
+    assert [len(c['predictions']) for c in chunks] == [128, 128, len(X) - 256]
+    assert all(len(c['risk']) == len(c['interpretation']) == len(c['predictions']) for c in chunks)
+
+    plain = evaluating_client.post(url, data=_binary_body(X, y), content_type='application/octet-stream').get_json()
+    assert summary['status'] == 'success'
+    assert summary['metrics'] == plain['metrics']
+    assert sum((c['risk'] for c in chunks), []) == plain['per_sample_risk']
+
+    # Length mismatches are refused before any record is streamed
+    r = evaluating_client.post(url + '?stream=1', json={'X_test': X[:3].tolist(), 'y_test': y[:2].tolist()})
+    assert r.status_code == 400
+
+
+def test_model_info_etag_round_trip(client, monkeypatch):
+    """Test /model-info answers a matching If-None-Match with an empty 304 until the model changes"""
+    url = '/api/glucose-prediction/model-info'
+    r = client.get(url)
+    assert r.status_code == 200
+    etag = r.headers['ETag']
+    assert r.headers['Cache-Control'] == 'private, no-cache'
+    assert 'runtime' in r.get_json()
+
+    r = client.get(url, headers={'If-None-Match': etag})
+    assert r.status_code == 304
+    assert r.data == b''
+
+    # Predictions only move the cache counters (reported by /health), not the ETag
+    client.post('/api/glucose-prediction/predict', json={'meal_features': {'carbohydrates': 42}})
+    r = client.get(url, headers={'If-None-Match': etag})
+    assert r.status_code == 304
+    assert r.headers['ETag'] == etag
+    assert 'cache' in client.get('/api/glucose-prediction/health').get_json()
+
+    # Marking the model trained changes the body, so the ETag moves with it
+    import glucose_api
+    monkeypatch.setattr(glucose_api.glucose_model, 'is_trained', not glucose_api.glucose_model.is_trained)
+    r = client.get(url, headers={'If-None-Match': etag})
+    assert r.status_code == 200
+    assert r.headers['ETag'] != etag
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_batcher_survives_fork(client, monkeypatch):
+    """Test a forked worker can use the batcher the parent already started"""
+    import glucose_api
+
+    monkeypatch.setattr(glucose_api, '_concrete_predict', lambda X: np.asarray(X)[:, -1, :1] * 2.0)
+    X = np.ones((2, glucose_api.glucose_model.sequence_length, glucose_api.glucose_model.feature_dim), np.float32)
+    assert glucose_api._batched_forward(X).tolist() == [2.0, 2.0]
+    assert glucose_api._batch_worker.is_alive()
+
+    pid = os.fork()
+    if pid == 0:
+        # Child: never return into pytest; a hang is cut short by SIGALRM
+        signal.alarm(5)
+        try:
+            ok = glucose_api._batched_forward(X).tolist() == [2.0, 2.0]
+        except BaseException:
+            ok = False
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    glucose_api._stop_batch_worker()
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    pytest.main([__file__, '-v', '--tb=short'])